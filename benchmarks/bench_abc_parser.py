@@ -0,0 +1,112 @@
+"""
+Compare the fast-path ABC parser against the pyabc adapter.
+
+    python -m benchmarks.bench_abc_parser [--corpus tunes.sqlite3] [--limit N]
+
+Without --corpus a few thesession.org settings are parsed repeatedly. The
+pyabc path is skipped if pyabc is not installed.
+"""
+import argparse
+import time
+from itertools import islice
+from typing import Callable
+
+from parsichord.core.tune import Tune
+from parsichord.data.adapters.abc import ABCTune
+from parsichord.data.thesession import TuneData
+
+SAMPLE_TUNES: list[TuneData] = [
+    {
+        "tune": 1,
+        "setting": 1,
+        "name": "Cooley's",
+        "meter": "4/4",
+        "mode": "Edorian",
+        "abc": "|:D2|EBBA B2 EB|B2 AB dBAG|FDAD BDAD|FDAD dAFD|\r\n"
+        "EBBA B2 EB|B2 AB defg|afec dBAF|DEFD E2:|\r\n"
+        "|:gf|eB B2 efge|eB B2 gedB|A2 FA DAFA|A2 FA defg|\r\n"
+        "eB B2 eBgB|eB B2 defg|afec dBAF|DEFD E2:|",
+    },
+    {
+        "tune": 2,
+        "setting": 2,
+        "name": "The Kesh",
+        "meter": "6/8",
+        "mode": "Gmajor",
+        "abc": '|:"G"GAG GAB|"D"ABA ABd|"G"edd gdd|"C"edB "D"dBA|\r\n'
+        '"G"GAG GAB|"D"ABA ABd|"G"edd gdB|"D"AGF "G"G3:|\r\n'
+        "|:BAB dBd|ege dBA|BAB dBG|ABA AGA|\r\n"
+        "BAB dBd|ege dBd|gfg aga|bgf g3:|",
+    },
+    {
+        "tune": 3,
+        "setting": 3,
+        "name": "The Silver Spear",
+        "meter": "4/4",
+        "mode": "Dmajor",
+        "abc": "|:FA~A2 BAFA|dfed BddB|FA~A2 BAFA|dfed BEE2|\r\n"
+        "FA~A2 BAFA|dfed Bdd2|efed (3Bcd ed|BdAF E2EF:|\r\n"
+        "|:d2fd adfd|d2fd edBA|d2fd adfa|gfed BEE2|\r\n"
+        "d2fd adfd|dfed Bdd2|efed (3Bcd ed|BdAF E2EF:|",
+    },
+]
+
+
+def pyabc_parser() -> Callable[[TuneData], Tune] | None:
+    try:
+        from parsichord.data.adapters.pyabc import PyABCTuneAdapter
+    except ImportError:
+        return None
+    return PyABCTuneAdapter
+
+
+def bench(
+    parse: Callable[[TuneData], Tune], tune_datas: list[TuneData], repeat: int
+) -> float:
+    """Return the best time over repeat runs to parse every tune and build its
+    note array."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for tune_data in tune_datas:
+            tune = parse(tune_data)
+            tune.note_array
+            [note.pitch for note in tune.notes if note is not None]
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def load_tunes(corpus: str | None, limit: int) -> list[TuneData]:
+    if corpus is None:
+        return SAMPLE_TUNES * max(limit // len(SAMPLE_TUNES), 1)
+    from parsichord.data.dump import TuneCorpus
+
+    return list(islice(TuneCorpus(corpus).select(), limit))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="TuneCorpus database to parse")
+    parser.add_argument("--limit", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tune_datas = load_tunes(args.corpus, args.limit)
+    parsers: dict[str, Callable[[TuneData], Tune] | None] = {
+        "abc": ABCTune,
+        "pyabc": pyabc_parser(),
+    }
+    timings = {}
+    for name, parse in parsers.items():
+        if parse is None:
+            print(f"{name:>6}: skipped, not installed")
+            continue
+        timings[name] = bench(parse, tune_datas, args.repeat)
+        per_tune = timings[name] / len(tune_datas) * 1e6
+        print(f"{name:>6}: {timings[name]:.3f}s, {per_tune:.0f}us per tune")
+    if len(timings) == 2:
+        print(f"speedup: {timings['pyabc'] / timings['abc']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
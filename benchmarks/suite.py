@@ -0,0 +1,269 @@
+"""
+Time chord construction, voice-leading search, harmonization, parsing and
+playback scheduling on synthetic tunes.
+
+    python -m benchmarks.suite [--output results.json] [--compare baseline.json]
+
+Results are written as JSON. With --compare, every benchmark is checked
+against a stored baseline and the exit status is 1 if any is slower by more
+than --threshold. Caches are cleared before every run, so timings are cold.
+"""
+import argparse
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from benchmarks.synthetic import generate_setting, tune_types
+from parsichord import cache
+from parsichord.core.chord import Chord, ChordVoicing, Pitch, chords_by_mask, triads
+from parsichord.core.harmony import (
+    CadenceStrategy,
+    CommonTonesStrategy,
+    FirstNoteStrategy,
+    IHarmonisationStrategy,
+    ViterbiStrategy,
+)
+from parsichord.core.schedule import compile_schedule, pattern_for
+from parsichord.core.tune import Tune
+from parsichord.data.adapters.abc import ABCTune
+from parsichord.data.thesession import TuneData
+
+DEFAULT_THRESHOLD = 0.2
+
+strategies: list[type[IHarmonisationStrategy]] = [
+    FirstNoteStrategy,
+    CommonTonesStrategy,
+    ViterbiStrategy,
+    CadenceStrategy,
+]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """Run number times per repeat, after setup."""
+
+    name: str
+    run: Callable[[], object]
+    setup: Callable[[], object] = cache.clear_all
+    number: int = 1
+
+
+@dataclass(frozen=True)
+class Timing:
+    """Seconds per run."""
+
+    best: float
+    median: float
+    repeat: int
+    number: int
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+    threshold: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    @property
+    def regressed(self) -> bool:
+        return self.ratio > 1 + self.threshold
+
+
+def measure(benchmark: Benchmark, repeat: int) -> Timing:
+    samples = []
+    for _ in range(repeat):
+        benchmark.setup()
+        start = time.perf_counter()
+        for _ in range(benchmark.number):
+            benchmark.run()
+        samples.append((time.perf_counter() - start) / benchmark.number)
+    return Timing(min(samples), statistics.median(samples), repeat, benchmark.number)
+
+
+def initial_voicing(tune: Tune) -> ChordVoicing:
+    """The tonic triad in the octave below middle C."""
+    chord = tune.key.triad(0)
+    return ChordVoicing(chord, [Pitch(pc) for pc in chord.pitch_classes])
+
+
+def pyabc_parser() -> Callable[[TuneData], Tune] | None:
+    try:
+        from parsichord.data.adapters.pyabc import PyABCTuneAdapter
+    except ImportError:
+        return None
+    return PyABCTuneAdapter
+
+
+def parse(tune_factory: Callable[[TuneData], Tune], settings: list[TuneData]) -> None:
+    for setting in settings:
+        tune = tune_factory(setting)
+        tune.note_array
+        tune.notes
+
+
+def benchmarks(bars: int, settings_count: int, seed: int = 0) -> list[Benchmark]:
+    """Build the suite over synthetic jigs and reels of bars bars."""
+    pitch_class_sets = [chord.pitch_classes for chord in chords_by_mask.values()]
+    chords = list(chords_by_mask.values())
+    voicings = [
+        ChordVoicing(chord, [Pitch(pc) for pc in chord.pitch_classes])
+        for chord in triads
+    ]
+    suite = [
+        Benchmark(
+            "chord.from_pitch_classes",
+            lambda: [Chord.from_pitch_classes(pcs) for pcs in pitch_class_sets],
+            number=20,
+        ),
+        Benchmark(
+            "chord.parsimonious_chords",
+            lambda: [chord.parsimonious_chords() for chord in chords],
+        ),
+        Benchmark(
+            "voicing.find_closest_voicings",
+            lambda: [voicing.find_closest_voicings() for voicing in voicings],
+        ),
+    ]
+
+    for tune_type, rhythm in tune_types.items():
+        settings = [
+            generate_setting(tune_type, bars, seed=seed + i, tune_id=i)
+            for i in range(settings_count)
+        ]
+        tune = ABCTune(settings[0])
+        voicing = initial_voicing(tune)
+        harmonic_rhythm = rhythm.beat_length
+
+        suite.append(
+            Benchmark(f"parse.abc.{tune_type}", partial(parse, ABCTune, settings))
+        )
+        pyabc = pyabc_parser()
+        if pyabc is not None:
+            suite.append(
+                Benchmark(
+                    f"parse.pyabc.{tune_type}",
+                    partial(parse, pyabc, settings),
+                )
+            )
+
+        for strategy_class in strategies:
+            strategy = strategy_class(harmonic_rhythm=harmonic_rhythm)
+            suite.append(
+                Benchmark(
+                    f"harmonize.{strategy_class.__name__}.{tune_type}",
+                    partial(strategy.harmonize, tune, voicing),
+                )
+            )
+
+        harmonized = ABCTune(settings[0])
+        CommonTonesStrategy(harmonic_rhythm).harmonize(harmonized, voicing)
+        pattern = pattern_for(rhythm.meter)
+        suite.append(
+            Benchmark(
+                f"schedule.{tune_type}",
+                partial(compile_schedule, harmonized, pattern, speed=0.12),
+                setup=lambda: None,
+                number=10,
+            )
+        )
+    return suite
+
+
+def run_suite(
+    suite: list[Benchmark], repeat: int, report: Callable[[str], None] = print
+) -> dict[str, Timing]:
+    timings = {}
+    for benchmark in suite:
+        timings[benchmark.name] = timing = measure(benchmark, repeat)
+        report(f"{benchmark.name:<40} {timing.best * 1e3:10.3f}ms")
+    return timings
+
+
+def to_json(timings: dict[str, Timing], parameters: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "metadata": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            **parameters,
+        },
+        "benchmarks": {
+            name: {
+                "best": timing.best,
+                "median": timing.median,
+                "repeat": timing.repeat,
+                "number": timing.number,
+            }
+            for name, timing in timings.items()
+        },
+    }
+
+
+def compare(
+    baseline: dict[str, Any],
+    results: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Comparison]:
+    """
+    Compare the best times of benchmarks present in both result files.
+
+    Best times are compared because they are the least affected by other load
+    on the machine.
+    """
+    return [
+        Comparison(
+            name, baseline["benchmarks"][name]["best"], timing["best"], threshold
+        )
+        for name, timing in results["benchmarks"].items()
+        if name in baseline["benchmarks"]
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bars", type=int, default=32)
+    parser.add_argument("--settings", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", help="run benchmarks whose names match a regex")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="baseline results to compare")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    suite = benchmarks(args.bars, args.settings, args.seed)
+    if args.only:
+        suite = [b for b in suite if re.search(args.only, b.name)]
+    parameters = {"bars": args.bars, "settings": args.settings, "seed": args.seed}
+    results = to_json(run_suite(suite, args.repeat), parameters)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        comparisons = compare(baseline, results, args.threshold)
+        print()
+        for comparison in comparisons:
+            flag = "REGRESSION" if comparison.regressed else ""
+            print(f"{comparison.name:<40} {comparison.ratio:6.2f}x {flag}")
+        if any(comparison.regressed for comparison in comparisons):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Synthetic tune settings for benchmarks.
+
+Melodies are random walks over the scale of a key within a MIDI range, in
+the rhythms of jigs and reels, written as ABC so that the same setting can
+be parsed by any Tune adapter.
+"""
+import random
+from dataclasses import dataclass
+
+from parsichord.core.chord import Pitch
+from parsichord.data.adapters.abc import parse_key, spell_pitch
+from parsichord.data.thesession import TuneData
+
+
+@dataclass(frozen=True)
+class TuneType:
+    meter: str
+    # eighth notes per bar and per beat
+    bar_length: int
+    beat_length: int
+    # the notes of a beat that is not split into eighths
+    long_beat: tuple[int, ...]
+
+
+tune_types = {
+    "jig": TuneType("6/8", 6, 3, (2, 1)),
+    "reel": TuneType("4/4", 8, 2, (2,)),
+}
+
+DEFAULT_PITCH_RANGE = (62, 83)
+
+
+def generate_setting(
+    tune_type: str = "jig",
+    bars: int = 16,
+    mode: str = "Dmajor",
+    pitch_range: tuple[int, int] = DEFAULT_PITCH_RANGE,
+    seed: int = 0,
+    tune_id: int = 0,
+) -> TuneData:
+    """
+    Generate a setting of bars bars in a key such as "Dmajor" or "Ador",
+    whose MIDI pitches lie within pitch_range inclusive.
+
+    The same arguments always generate the same setting.
+    """
+    rhythm = tune_types[tune_type]
+    key, signature = parse_key(mode)
+    scale = {pitch_class.value for pitch_class in key.scale}
+    low, high = pitch_range
+    pitches = [midi for midi in range(low, high + 1) if midi % 12 in scale]
+    if not pitches:
+        raise ValueError(f"No notes of {mode} in {pitch_range}")
+
+    rng = random.Random(seed)
+    position = len(pitches) // 2
+    abc_bars = []
+    for _ in range(bars):
+        beats = []
+        for _ in range(rhythm.bar_length // rhythm.beat_length):
+            if rng.random() < 0.25:
+                lengths: tuple[int, ...] = rhythm.long_beat
+            else:
+                lengths = (1,) * rhythm.beat_length
+            beat = ""
+            for length in lengths:
+                step = rng.choice((-2, -1, -1, 0, 1, 1, 2))
+                # turn back at the edges of the range rather than stick there
+                if not 0 <= position + step < len(pitches):
+                    step = -step
+                position = min(max(position + step, 0), len(pitches) - 1)
+                beat += spell_pitch(Pitch(pitches[position] - 48), signature)
+                beat += str(length) if length > 1 else ""
+            beats.append(beat)
+        abc_bars.append(" ".join(beats))
+
+    lines = ["|".join(abc_bars[i : i + 4]) + "|" for i in range(0, len(abc_bars), 4)]
+    return {
+        "tune": tune_id,
+        "setting": tune_id,
+        "name": f"Synthetic {tune_type} {seed}",
+        "meter": rhythm.meter,
+        "mode": mode,
+        "abc": "|" + "\r\n".join(lines),
+    }
@@ -0,0 +1,160 @@
+import os
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from parsichord.core.chord import ChordVoicing
+from parsichord.core.harmony import IHarmonisationStrategy
+from parsichord.core.tune import ChordTrack, Tune
+from parsichord.data.thesession import TuneData
+
+StrategyFactory = Callable[[], IHarmonisationStrategy]
+TuneFactory = Callable[[TuneData], Tune]
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass(frozen=True)
+class HarmonizationResult:
+    """The chord track produced for one tune setting, or the error raised."""
+
+    index: int
+    tune: int | None
+    setting: int | None
+    chords: ChordTrack
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def pyabc_tune(tune_data: TuneData) -> Tune:
+    """Parse a setting with PyABCTuneAdapter."""
+    from parsichord.data.adapters.pyabc import PyABCTuneAdapter
+
+    return PyABCTuneAdapter(tune_data)
+
+
+def harmonize_one(
+    index: int,
+    tune_data: TuneData,
+    strategy: IHarmonisationStrategy,
+    chord_voicing: ChordVoicing,
+    tune_factory: TuneFactory = pyabc_tune,
+) -> HarmonizationResult:
+    """Harmonize a single setting, capturing any exception in the result."""
+    tune_id, setting_id = tune_data.get("tune"), tune_data.get("setting")
+    try:
+        tune = tune_factory(tune_data)
+        strategy.harmonize(tune, chord_voicing)
+    except Exception:
+        return HarmonizationResult(
+            index, tune_id, setting_id, ChordTrack(), error=traceback.format_exc()
+        )
+    return HarmonizationResult(index, tune_id, setting_id, tune.chords)
+
+
+def _harmonize_chunk(
+    chunk: list[tuple[int, TuneData]],
+    strategy_factory: StrategyFactory,
+    chord_voicing: ChordVoicing,
+    tune_factory: TuneFactory,
+) -> list[HarmonizationResult]:
+    strategy = strategy_factory()
+    return [
+        harmonize_one(index, tune_data, strategy, chord_voicing, tune_factory)
+        for index, tune_data in chunk
+    ]
+
+
+def _chunked(
+    tune_datas: Iterable[TuneData], chunk_size: int
+) -> Iterator[list[tuple[int, TuneData]]]:
+    items = enumerate(tune_datas)
+    while chunk := list(islice(items, chunk_size)):
+        yield chunk
+
+
+def _chunk_results(
+    future: Future, chunk: list[tuple[int, TuneData]]
+) -> list[HarmonizationResult]:
+    try:
+        return future.result()
+    except Exception:
+        # the worker itself failed, e.g. while unpickling the chunk
+        error = traceback.format_exc()
+        return [
+            HarmonizationResult(
+                index, data.get("tune"), data.get("setting"), ChordTrack(), error
+            )
+            for index, data in chunk
+        ]
+
+
+def harmonize_many(
+    tune_datas: Iterable[TuneData],
+    strategy_factory: StrategyFactory,
+    chord_voicing: ChordVoicing,
+    jobs: int | None = None,
+    chunk_size: int = 16,
+    progress: ProgressCallback | None = None,
+    tune_factory: TuneFactory = pyabc_tune,
+) -> list[HarmonizationResult]:
+    """
+    Harmonize many tune settings over a pool of worker processes.
+
+    Settings are sent to the workers in chunks of chunk_size, at most two
+    chunks per worker at a time, and each chunk builds its own strategy with
+    strategy_factory. tune_datas is consumed lazily, so a large dump is
+    never held in memory at once. strategy_factory and tune_factory must be
+    picklable, e.g. classes or module-level functions.
+    Results are returned in input order. A setting that fails to parse or
+    harmonize gives a result with the formatted traceback in its error field
+    instead of aborting the run. progress, if given, is called with the number
+    of settings done and the number submitted after every chunk. With jobs=1
+    everything runs in the calling process.
+    """
+    chunks = _chunked(tune_datas, chunk_size)
+    results: list[HarmonizationResult] = []
+
+    if jobs == 1:
+        total = 0
+        for chunk in chunks:
+            total += len(chunk)
+            results.extend(
+                _harmonize_chunk(chunk, strategy_factory, chord_voicing, tune_factory)
+            )
+            if progress is not None:
+                progress(len(results), total)
+        return results
+
+    workers = jobs or os.cpu_count() or 1
+    total = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures: dict[Future, list[tuple[int, TuneData]]] = {}
+        while True:
+            # keep at most two chunks per worker in flight, so the input is
+            # read only as fast as it is harmonized
+            for chunk in islice(chunks, 2 * workers - len(futures)):
+                future = executor.submit(
+                    _harmonize_chunk,
+                    chunk,
+                    strategy_factory,
+                    chord_voicing,
+                    tune_factory,
+                )
+                futures[future] = chunk
+                total += len(chunk)
+            if not futures:
+                break
+
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                results.extend(_chunk_results(future, futures.pop(future)))
+                if progress is not None:
+                    progress(len(results), total)
+
+    results.sort(key=lambda result: result.index)
+    return results
@@ -0,0 +1,193 @@
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Hashable, ParamSpec, TypeVar
+
+from . import instrument
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# e.g. PARSICHORD_CACHE_SIZES="voicing_search=100000,closest_voicings=0"
+CACHE_SIZES_ENV = "PARSICHORD_CACHE_SIZES"
+DEFAULT_MAXSIZE = 4096
+
+_missing = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    name: str
+    maxsize: int | None
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """
+    Thread-safe least recently used cache with hit, miss and eviction counts.
+
+    A maxsize of None means unbounded and 0 disables caching.
+    """
+
+    def __init__(self, name: str, maxsize: int | None = DEFAULT_MAXSIZE) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[Hashable, object] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        with self._lock:
+            value = self._data.get(key, _missing)
+            if value is _missing:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: object) -> None:
+        with self._lock:
+            if self.maxsize == 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize: int | None) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self.name,
+                self.maxsize,
+                len(self._data),
+                self.hits,
+                self.misses,
+                self.evictions,
+            )
+
+    def _evict(self) -> None:
+        if self.maxsize is None:
+            return
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+class CacheRegistry:
+    """
+    Named caches whose sizes can be configured at runtime or from the
+    environment.
+
+    Sizes given in sizes override the maxsize a cache is declared with, so
+    caches can be tuned in production without code edits.
+    """
+
+    def __init__(self, sizes: dict[str, int | None] | None = None) -> None:
+        self._sizes = dict(sizes or {})
+        self._caches: dict[str, LRUCache] = {}
+
+    def __getitem__(self, name: str) -> LRUCache:
+        return self._caches[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._caches
+
+    def get_cache(self, name: str, maxsize: int | None = DEFAULT_MAXSIZE) -> LRUCache:
+        if name not in self._caches:
+            self._caches[name] = LRUCache(name, self._sizes.get(name, maxsize))
+        return self._caches[name]
+
+    def configure(self, name: str, maxsize: int | None) -> None:
+        """Set the size of a cache, evicting entries if it shrinks."""
+        self._sizes[name] = maxsize
+        if name in self._caches:
+            self._caches[name].resize(maxsize)
+
+    def clear_all(self) -> None:
+        for cache in self._caches.values():
+            cache.clear()
+
+    def stats(self) -> dict[str, CacheStats]:
+        """Return a snapshot of every cache's counters."""
+        return {name: cache.stats() for name, cache in self._caches.items()}
+
+    def cached(
+        self, name: str, maxsize: int | None = DEFAULT_MAXSIZE
+    ) -> Callable[[Callable[P, R]], Callable[P, R]]:
+        """Memoize a function with hashable arguments in the named cache."""
+        cache = self.get_cache(name, maxsize)
+
+        def decorator(func: Callable[P, R]) -> Callable[P, R]:
+            @wraps(func)
+            def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+                value = cache.get(key, _missing)
+                if instrument.active is not None:
+                    instrument.active.cache_lookup(name, value is not _missing)
+                if value is _missing:
+                    value = func(*args, **kwargs)
+                    cache.put(key, value)
+                return value  # type: ignore[return-value]
+
+            return wrapper
+
+        return decorator
+
+
+def parse_cache_sizes(spec: str) -> dict[str, int | None]:
+    """Parse "name=size,..." where a size of "none" means unbounded."""
+    sizes: dict[str, int | None] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, size = item.partition("=")
+        sizes[name.strip()] = None if size.strip().lower() == "none" else int(size)
+    return sizes
+
+
+def environment_cache_sizes() -> dict[str, int | None]:
+    """Parse the sizes in CACHE_SIZES_ENV, warning and ignoring them if
+    they are malformed so that a bad setting never breaks the import."""
+    spec = os.environ.get(CACHE_SIZES_ENV, "")
+    try:
+        return parse_cache_sizes(spec)
+    except ValueError:
+        warnings.warn(
+            f"Ignoring malformed {CACHE_SIZES_ENV}={spec!r}, expected "
+            '"name=size,..."; using the default cache sizes',
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return {}
+
+
+cache_registry = CacheRegistry(environment_cache_sizes())
+cached = cache_registry.cached
+configure = cache_registry.configure
+clear_all = cache_registry.clear_all
+stats = cache_registry.stats
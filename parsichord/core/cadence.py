@@ -1,9 +1,12 @@
 from dataclasses import dataclass
 
-from parsichord.core.chord import Major, ScaleDegreeChord
-from parsichord.core.constants import Interval
+import numpy as np
 
-cadences: dict[tuple[Interval, Interval, bool], "Cadence"] = dict()
+from parsichord.core.chord import Chord, ScaleDegreeChord
+from parsichord.core.constants import Interval, PitchClass, mode_to_intervals
+from parsichord.core.tune import Key, Tune
+
+CadenceKey = tuple[Interval, Interval, bool]
 
 
 @dataclass(frozen=True)
@@ -14,28 +17,174 @@ class Cadence:
     resolution_chord: ScaleDegreeChord
     strong: bool
 
-    def __post_init__(self) -> None:
-        global cadences
-        cadences[self.approach_note, self.resolution_note, self.strong] = self
 
+@dataclass(frozen=True)
+class CadenceType:
+    """
+    A cadence in terms of zero-based scale degrees, so that it can be
+    realised in any mode.
 
-perfect_cadence = Cadence(
-    approach_note=Interval.MAJOR_SEVENTH,
-    resolution_note=Interval.PERFECT_FIRST,
-    approach_chord=ScaleDegreeChord(Interval.PERFECT_FIFTH, Major),
-    resolution_chord=ScaleDegreeChord(Interval.PERFECT_FIRST, Major),
-    strong=True,
-)
-interupted_cadence = Cadence(
-    approach_note=Interval.MAJOR_SEVENTH,
-    resolution_note=Interval.PERFECT_FIRST,
-    approach_chord=ScaleDegreeChord(Interval.PERFECT_FIFTH, Major),
-    resolution_chord=ScaleDegreeChord(Interval.MAJOR_SIXTH, Major),
-    strong=False,
+    The melody moves from approach_degree to resolution_degree over the
+    chords on approach_chord_degree and resolution_chord_degree.
+    """
+
+    name: str
+    approach_degree: int
+    resolution_degree: int
+    approach_chord_degree: int
+    resolution_chord_degree: int
+    strong: bool
+
+    def in_mode(self, mode: str) -> Cadence:
+        key = Key(PitchClass.C, mode)
+        scale = key.scale
+
+        def chord(degree: int) -> ScaleDegreeChord:
+            return ScaleDegreeChord(
+                Interval(scale[degree].value), key.triad(degree).chord_type
+            )
+
+        return Cadence(
+            approach_note=Interval(scale[self.approach_degree].value),
+            resolution_note=Interval(scale[self.resolution_degree].value),
+            approach_chord=chord(self.approach_chord_degree),
+            resolution_chord=chord(self.resolution_chord_degree),
+            strong=self.strong,
+        )
+
+
+cadence_types = (
+    CadenceType("perfect", 6, 0, 4, 0, strong=True),
+    CadenceType("perfect", 1, 0, 4, 0, strong=True),
+    CadenceType("plagal", 0, 0, 3, 0, strong=True),
+    CadenceType("interrupted", 6, 0, 4, 5, strong=False),
+    CadenceType("imperfect", 2, 1, 0, 4, strong=False),
 )
 
 
+def mode_of(key: Key) -> str:
+    """Return the mode_to_intervals key of a key's mode, treating unknown
+    modes as major."""
+    mode = key.mode[:3].lower()
+    return mode if mode in mode_to_intervals else "maj"
+
+
+def register_cadences(mode: str) -> dict[CadenceKey, Cadence]:
+    """Realise every cadence type in a mode, keyed by approach note,
+    resolution note and strength."""
+    registry: dict[CadenceKey, Cadence] = {}
+    for cadence_type in cadence_types:
+        cadence = cadence_type.in_mode(mode)
+        key = (cadence.approach_note, cadence.resolution_note, cadence.strong)
+        registry.setdefault(key, cadence)
+    return registry
+
+
+cadences: dict[str, dict[CadenceKey, Cadence]] = {
+    mode: register_cadences(mode) for mode in mode_to_intervals
+}
+
+perfect_cadence = cadences["maj"][Interval.MAJOR_SEVENTH, Interval.PERFECT_FIRST, True]
+interupted_cadence = cadences["maj"][
+    Interval.MAJOR_SEVENTH, Interval.PERFECT_FIRST, False
+]
+
+
 def find_cadence(
-    approach_note: Interval, resolution_note: Interval, strong: bool
+    approach_note: Interval, resolution_note: Interval, strong: bool, mode: str = "maj"
 ) -> Cadence | None:
-    return cadences.get((approach_note, resolution_note, strong), None)
+    return cadences[mode].get((approach_note, resolution_note, strong), None)
+
+
+class CadenceTable:
+    """
+    The cadences of one key as lookup arrays.
+
+    approach and resolution are indexed by strength, then approach and
+    resolution pitch class, and hold an index into chords, or -1 where there
+    is no cadence, so any number of phrase endings can be looked up at once.
+    """
+
+    def __init__(self, tonic: PitchClass, mode: str) -> None:
+        self.tonic = tonic
+        self.mode = mode
+        self.chords: list[Chord] = []
+        self.approach = np.full((2, 12, 12), -1, dtype=np.int16)
+        self.resolution = np.full((2, 12, 12), -1, dtype=np.int16)
+        for cadence in cadences[mode].values():
+            index = (
+                int(cadence.strong),
+                (tonic.value + cadence.approach_note.value) % 12,
+                (tonic.value + cadence.resolution_note.value) % 12,
+            )
+            self.approach[index] = self._chord_index(cadence.approach_chord)
+            self.resolution[index] = self._chord_index(cadence.resolution_chord)
+
+    def _chord_index(self, scale_degree_chord: ScaleDegreeChord) -> int:
+        chord = Chord(
+            self.tonic + scale_degree_chord.root, scale_degree_chord.chord_type
+        )
+        if chord not in self.chords:
+            self.chords.append(chord)
+        return self.chords.index(chord)
+
+
+cadence_tables: dict[tuple[PitchClass, str], CadenceTable] = {
+    (tonic, mode): CadenceTable(tonic, mode)
+    for tonic in PitchClass
+    for mode in mode_to_intervals
+}
+
+
+def cadence_table(key: Key) -> CadenceTable:
+    return cadence_tables[key.tonic, mode_of(key)]
+
+
+@dataclass(frozen=True)
+class CadencePoints:
+    """Cadences found at phrase endings, as parallel arrays: the onsets of the
+    approach and resolution notes and the indexes of their chords in the
+    table."""
+
+    approach_onset: np.ndarray
+    resolution_onset: np.ndarray
+    approach_chord: np.ndarray
+    resolution_chord: np.ndarray
+
+
+def scan_cadences(
+    tune: Tune, phrase_ends: np.ndarray, strong: np.ndarray
+) -> CadencePoints:
+    """
+    Look up the cadence at each phrase ending in one vectorized pass.
+
+    phrase_ends holds the playhead after each phrase and strong whether its
+    cadence should be strong. The resolution is the last note struck in the
+    phrase and the approach the note before it.
+    """
+    table = cadence_table(tune.key)
+    notes = tune.note_array
+    ends = np.asarray(phrase_ends, dtype=np.int64)
+    strong = np.asarray(strong, dtype=bool)
+    valid = (ends > 0) & (ends <= notes.length)
+    ends, strong = ends[valid], strong[valid]
+
+    resolution = notes.note_index[ends - 1]
+    # the resolution needs a note before it to approach from
+    found = resolution > 0
+    resolution, approach, strong = (
+        resolution[found],
+        resolution[found] - 1,
+        strong[found],
+    )
+
+    pitch_class = notes.pitch_class.astype(np.int64)
+    index = (strong.astype(np.int64), pitch_class[approach], pitch_class[resolution])
+    approach_chord = table.approach[index]
+    matched = approach_chord >= 0
+    return CadencePoints(
+        notes.onset[approach][matched],
+        notes.onset[resolution][matched],
+        approach_chord[matched],
+        table.resolution[index][matched],
+    )
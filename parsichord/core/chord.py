@@ -1,8 +1,7 @@
-from copy import deepcopy
-from functools import lru_cache
 from itertools import product
-from typing import Collection
+from typing import ClassVar, Collection, Iterable, Sequence
 
+from ..cache import cached
 from .constants import Interval, PitchClass, Triad, triad_to_intervals
 
 
@@ -22,6 +21,9 @@ class Pitch:
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.value}, {self.octave})"
 
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Pitch) and self.abs_value == other.abs_value
+
     def __hash__(self) -> int:
         return hash((self.value, self.octave))
 
@@ -70,21 +72,65 @@ class Pitch:
 
 
 class ChordType:
-    def __init__(
-        self,
+    """
+    Interned chord quality.
+
+    Constructing a ChordType with the same arguments twice returns the same
+    instance, so chord types are immutable and can be compared by identity.
+    Equality and hashing use the 12-bit interval mask.
+    """
+
+    __slots__ = ("name", "base", "seventh", "extensions", "intervals", "mask")
+
+    _interned: ClassVar[dict[tuple, "ChordType"]] = {}
+
+    name: str
+    base: Triad
+    seventh: Interval | None
+    extensions: tuple[Interval, ...] | None
+    intervals: tuple[Interval, ...]
+    mask: int
+
+    def __new__(
+        cls,
         name: str,
         base: Triad,
         seventh: Interval | None = None,
-        extensions: list[Interval] | None = None,
-    ):
-        self.name = name
-        self.base = base
-        self.seventh = seventh
-        self.extensions = extensions
+        extensions: Sequence[Interval] | None = None,
+    ) -> "ChordType":
+        exts = tuple(extensions) if extensions is not None else None
+        key = (name, base, seventh, exts)
+        if (chord_type := cls._interned.get(key)) is not None:
+            return chord_type
+
+        chord_type = super().__new__(cls)
+        chord_type.name = name
+        chord_type.base = base
+        chord_type.seventh = seventh
+        chord_type.extensions = exts
+        chord_type.intervals = (
+            *triad_to_intervals[base],
+            *([seventh] if seventh is not None else []),
+            *(exts or ()),
+        )
+        chord_type.mask = 0
+        for interval in chord_type.intervals:
+            chord_type.mask |= 1 << (interval.value % 12)
+        cls._interned[key] = chord_type
+        return chord_type
+
+    def __reduce__(self) -> tuple:
+        return (self.__class__, (self.name, self.base, self.seventh, self.extensions))
 
     def __str__(self) -> str:
         return self.name
 
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ChordType) and self.mask == other.mask
+
+    def __hash__(self) -> int:
+        return self.mask
+
     @property
     def abbr(self) -> str:
         chord_type_abbr = self.base.value[:3].lower()
@@ -106,14 +152,6 @@ class ChordType:
             chord_type_abbr += f"({extensions})"
         return chord_type_abbr
 
-    @property
-    def intervals(self) -> list[Interval]:
-        basechord = list(triad_to_intervals[self.base])
-        seventh = [self.seventh] if self.seventh else []
-        extensions = self.extensions or []
-        intervals = basechord + seventh + extensions
-        return intervals
-
 
 # Triads
 Augmented = ChordType(name="Augmented", base=Triad.AUGMENTED)
@@ -123,9 +161,39 @@ Minor = ChordType(name="Minor", base=Triad.MINOR)
 
 
 class Chord:
-    def __init__(self, root: PitchClass, chord_type: ChordType):
-        self.root = root
-        self.chord_type = chord_type
+    """
+    Interned chord.
+
+    Chords are flyweights keyed by root and chord type. The pitch classes and
+    their 12-bit mask are computed once, so equality, hashing and membership
+    tests are integer operations on the mask.
+    """
+
+    __slots__ = ("root", "chord_type", "pitch_classes", "mask")
+
+    _interned: ClassVar[dict[tuple[PitchClass, int], "Chord"]] = {}
+
+    root: PitchClass
+    chord_type: ChordType
+    pitch_classes: tuple[PitchClass, ...]
+    mask: int
+
+    def __new__(cls, root: PitchClass, chord_type: ChordType) -> "Chord":
+        # chord types are interned, so their identity is a stable key
+        key = (root, id(chord_type))
+        if (chord := cls._interned.get(key)) is not None:
+            return chord
+
+        chord = super().__new__(cls)
+        chord.root = root
+        chord.chord_type = chord_type
+        chord.pitch_classes = tuple(root + ivl for ivl in chord_type.intervals)
+        chord.mask = pitch_class_mask(chord.pitch_classes)
+        cls._interned[key] = chord
+        return chord
+
+    def __reduce__(self) -> tuple:
+        return (self.__class__, (self.root, self.chord_type))
 
     def __str__(self) -> str:
         return f"{self.root.name}{self.chord_type.abbr}"
@@ -134,12 +202,10 @@ class Chord:
         return f"{self.__class__.__name__}({self.root.name} {self.chord_type.name})"
 
     def __eq__(self, other: object) -> bool:
-        return isinstance(other, Chord) and set(self.pitch_classes) == set(
-            other.pitch_classes
-        )
+        return isinstance(other, Chord) and self.mask == other.mask
 
     def __hash__(self) -> int:
-        return hash(frozenset(self.pitch_classes))
+        return self.mask
 
     def __add__(self, interval: Interval | int) -> "Chord":
         return Chord(root=self.root + interval, chord_type=self.chord_type)
@@ -147,18 +213,24 @@ class Chord:
     def __len__(self) -> int:
         return len(self.pitch_classes)
 
-    def __getitem__(self, interval: Interval) -> PitchClass | None:
-        return (
-            pitch_class
-            if (pitch_class := self.root + interval) in self.pitch_classes
-            else None
+    def __contains__(self, pitch_class: object) -> bool:
+        return isinstance(pitch_class, PitchClass) and bool(
+            self.mask >> pitch_class.value & 1
         )
 
+    def __getitem__(self, interval: Interval) -> PitchClass | None:
+        pitch_class = self.root + interval
+        return pitch_class if self.mask >> pitch_class.value & 1 else None
+
     def is_major(self) -> bool:
-        return self.root + Interval.MAJOR_THIRD in self.pitch_classes
+        return bool(
+            self.mask >> (self.root.value + Interval.MAJOR_THIRD.value) % 12 & 1
+        )
 
     def is_minor(self) -> bool:
-        return self.root + Interval.MINOR_THIRD in self.pitch_classes
+        return bool(
+            self.mask >> (self.root.value + Interval.MINOR_THIRD.value) % 12 & 1
+        )
 
     def is_tertian(self) -> bool:
         intervals = self.chord_type.intervals
@@ -191,22 +263,18 @@ class Chord:
                     chords.add(chord)
         return chords
 
-    @property
-    def pitch_classes(self) -> list[PitchClass]:
-        return [self.root + ivl for ivl in self.chord_type.intervals]
-
     @staticmethod
-    def from_pitch_classes(pitch_classes: Collection) -> "Chord | None":
-        if len(pitch_classes) == 3:
-            chords = triads
-        elif len(pitch_classes) == 4:
-            chords = seventh_chords
-        else:
-            return NotImplemented
-        for chord in chords:
-            if set(chord.pitch_classes) == set(pitch_classes):
-                return chord
-        return None
+    def from_pitch_classes(pitch_classes: Collection[PitchClass]) -> "Chord | None":
+        return chords_by_mask.get(pitch_class_mask(pitch_classes))
+
+
+def pitch_class_mask(pitch_classes: Iterable[PitchClass]) -> int:
+    """Encode a set of pitch classes as a 12-bit integer, bit n set for pitch
+    class n."""
+    mask = 0
+    for pitch_class in pitch_classes:
+        mask |= 1 << pitch_class.value
+    return mask
 
 
 class ScaleDegreeChord:
@@ -229,12 +297,20 @@ for triad_chord, interval in product(
     seventh = fifth + interval
     if seventh in triad_chord.chord_type.intervals:
         continue
-    seventh_chord_type = deepcopy(triad_chord.chord_type)
-    seventh_chord_type.seventh = seventh
-    seventh_chord_type.name = f"{triad_chord.chord_type} {seventh.abbr}"
+    seventh_chord_type = ChordType(
+        name=f"{triad_chord.chord_type} {seventh.abbr}",
+        base=triad_chord.chord_type.base,
+        seventh=seventh,
+    )
     seventh_chord = Chord(triad_chord.root, seventh_chord_type)
     seventh_chords.append(seventh_chord)
 
+# Symmetric chords (augmented triads, diminished sevenths) share a mask with
+# their inversions; the first chord registered for a mask is canonical.
+chords_by_mask: dict[int, Chord] = {}
+for chord in [*triads, *seventh_chords]:
+    chords_by_mask.setdefault(pitch_class_mask(chord.pitch_classes), chord)
+
 
 class ChordVoicing:
     def __init__(self, chord: Chord, pitches: list[Pitch]):
@@ -253,7 +329,7 @@ class ChordVoicing:
     def __hash__(self) -> int:
         return hash(frozenset(self.pitches))
 
-    @lru_cache
+    @cached("closest_voicings", maxsize=65536)
     def find_closest_voicings(self) -> set["ChordVoicing"]:
         n = len(self.pitches)
         voicings = set()
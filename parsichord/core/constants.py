@@ -144,3 +144,31 @@ triad_to_intervals = {
         Interval.MINOR_SIXTH,
     ),
 }
+
+_ionian = (
+    Interval.PERFECT_FIRST,
+    Interval.MAJOR_SECOND,
+    Interval.MAJOR_THIRD,
+    Interval.PERFECT_FOURTH,
+    Interval.PERFECT_FIFTH,
+    Interval.MAJOR_SIXTH,
+    Interval.MAJOR_SEVENTH,
+)
+
+
+def _rotate(degree: int) -> tuple[Interval, ...]:
+    return tuple(ivl - _ionian[degree] for ivl in _ionian[degree:] + _ionian[:degree])
+
+
+# keyed by the first three letters of the mode name, as in "Dmix" or "Dmixolydian"
+mode_to_intervals = {
+    "maj": _ionian,
+    "ion": _ionian,
+    "dor": _rotate(1),
+    "phr": _rotate(2),
+    "lyd": _rotate(3),
+    "mix": _rotate(4),
+    "min": _rotate(5),
+    "aeo": _rotate(5),
+    "loc": _rotate(6),
+}
@@ -0,0 +1,202 @@
+from collections import deque
+from typing import Iterable
+
+from .chord import Chord, chords_by_mask, pitch_class_mask
+from .constants import Interval, PitchClass
+
+UNREACHABLE = -1
+
+
+class ParsimoniousGraph:
+    """
+    Parsimonious voice-leading graph over a finite chord vocabulary.
+
+    Chords are nodes and two chords are adjacent when one note of the first
+    can move by a semitone or whole tone to give the second. All-pairs
+    shortest-path distances and next hops are computed once on construction,
+    so queries are table lookups. Ties are broken towards the chord that
+    appears first in the vocabulary.
+    """
+
+    def __init__(self, chords: Iterable[Chord]) -> None:
+        self.chords: list[Chord] = []
+        self._index: dict[int, int] = {}
+        for chord in chords:
+            if chord.mask not in self._index:
+                self._index[chord.mask] = len(self.chords)
+                self.chords.append(chord)
+
+        self.neighbours: list[tuple[int, ...]] = [
+            tuple(
+                sorted(
+                    self._index[neighbour.mask]
+                    for neighbour in self._adjacent(chord)
+                    if neighbour.mask in self._index
+                )
+            )
+            for chord in self.chords
+        ]
+        self.distances: list[list[int]] = [
+            self._breadth_first_distances(node) for node in range(len(self))
+        ]
+        self.next_hops: list[list[int]] = [
+            self._next_hops(node) for node in range(len(self))
+        ]
+        # nodes reachable from each node, nearest first
+        self._by_distance: list[tuple[int, ...]] = [
+            tuple(
+                sorted(
+                    (target for target in range(len(self)) if row[target] >= 0),
+                    key=lambda target: (row[target], target),
+                )
+            )
+            for row in self.distances
+        ]
+        self._nearest: list[list[int]] = [
+            [
+                self._first_containing(node, 1 << pitch_class.value)
+                for pitch_class in PitchClass
+            ]
+            for node in range(len(self))
+        ]
+
+    def __len__(self) -> int:
+        return len(self.chords)
+
+    def __contains__(self, chord: object) -> bool:
+        return isinstance(chord, Chord) and chord.mask in self._index
+
+    def index(self, chord: Chord) -> int:
+        """Return the node index of a chord, raising KeyError if unknown."""
+        return self._index[chord.mask]
+
+    def neighbours_of(self, chord: Chord) -> list[Chord]:
+        return [self.chords[node] for node in self.neighbours[self.index(chord)]]
+
+    def distance(self, chord_a: Chord, chord_b: Chord) -> int | None:
+        """Return the number of parsimonious moves from chord_a to chord_b."""
+        distance = self.distances[self.index(chord_a)][self.index(chord_b)]
+        return None if distance == UNREACHABLE else distance
+
+    def path(self, chord_a: Chord, chord_b: Chord) -> list[Chord] | None:
+        """Return a shortest path from chord_a to chord_b, both inclusive."""
+        node, target = self.index(chord_a), self.index(chord_b)
+        if self.distances[node][target] == UNREACHABLE:
+            return None
+        path = [self.chords[node]]
+        while node != target:
+            node = self.next_hops[node][target]
+            path.append(self.chords[node])
+        return path
+
+    def distance_to_containing(
+        self, chord: Chord, pitch_classes: Iterable[PitchClass]
+    ) -> int | None:
+        """Return the distance from chord to the closest chord containing every
+        pitch class given."""
+        mask = pitch_class_mask(pitch_classes)
+        node = self.index(chord)
+        target = self._nearest_node(node, mask)
+        return None if target == UNREACHABLE else self.distances[node][target]
+
+    def nearest_containing(
+        self, chord: Chord, pitch_classes: Iterable[PitchClass]
+    ) -> Chord | None:
+        """
+        Return the closest chord containing every pitch class given.
+
+        Chords outside the vocabulary are resolved through their parsimonious
+        neighbours.
+        """
+        mask = pitch_class_mask(pitch_classes)
+        if chord.mask & mask == mask:
+            return chord
+        if chord in self:
+            node = self._nearest_node(self.index(chord), mask)
+            return None if node == UNREACHABLE else self.chords[node]
+
+        best: tuple[int, int] | None = None
+        for neighbour in self._adjacent(chord):
+            if neighbour not in self:
+                continue
+            start = self.index(neighbour)
+            node = self._nearest_node(start, mask)
+            if node == UNREACHABLE:
+                continue
+            candidate = (self.distances[start][node], node)
+            if best is None or candidate < best:
+                best = candidate
+        return None if best is None else self.chords[best[1]]
+
+    def _nearest_node(self, node: int, mask: int) -> int:
+        if mask & (mask - 1) == 0:
+            return self._nearest[node][mask.bit_length() - 1]
+        return self._first_containing(node, mask)
+
+    def _first_containing(self, node: int, mask: int) -> int:
+        for target in self._by_distance[node]:
+            if self.chords[target].mask & mask == mask:
+                return target
+        return UNREACHABLE
+
+    def _adjacent(self, chord: Chord) -> Iterable[Chord]:
+        return chord.parsimonious_chords()
+
+    def _breadth_first_distances(self, source: int) -> list[int]:
+        distances = [UNREACHABLE] * len(self)
+        distances[source] = 0
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            for neighbour in self.neighbours[node]:
+                if distances[neighbour] == UNREACHABLE:
+                    distances[neighbour] = distances[node] + 1
+                    queue.append(neighbour)
+        return distances
+
+    def _next_hops(self, source: int) -> list[int]:
+        next_hops = [UNREACHABLE] * len(self)
+        next_hops[source] = source
+        for target in range(len(self)):
+            distance = self.distances[source][target]
+            if distance <= 0:
+                continue
+            next_hops[target] = next(
+                neighbour
+                for neighbour in self.neighbours[source]
+                if self.distances[neighbour][target] == distance - 1
+            )
+        return next_hops
+
+
+class VoiceLeadingGraph(ParsimoniousGraph):
+    """
+    Chord graph induced by moving a single voice of a voicing.
+
+    As well as parsimonious moves, a voicing that doubles a note can move the
+    doubled voice to add a pitch class, and a voice can move onto a pitch class
+    already sounding in another octave to drop one. Every step of
+    ChordVoicing.find_closest_voicings is an edge here, so distances in this
+    graph are lower bounds on the number of voice moves between voicings.
+    """
+
+    def _adjacent(self, chord: Chord) -> Iterable[Chord]:
+        adjacent = set()
+        for pitch_class in chord.pitch_classes:
+            without = chord.mask & ~(1 << pitch_class.value)
+            for ivl in [
+                -Interval.MAJOR_SECOND.value,
+                -Interval.MINOR_SECOND.value,
+                Interval.MINOR_SECOND.value,
+                Interval.MAJOR_SECOND.value,
+            ]:
+                moved = 1 << (pitch_class + ivl).value
+                for mask in (without | moved, chord.mask | moved):
+                    if (neighbour := chords_by_mask.get(mask)) is not None:
+                        adjacent.add(neighbour)
+        adjacent.discard(chord)
+        return adjacent
+
+
+parsimonious_graph = ParsimoniousGraph(chords_by_mask.values())
+voice_leading_graph = VoiceLeadingGraph(chords_by_mask.values())
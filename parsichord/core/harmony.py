@@ -1,61 +1,200 @@
 from abc import ABC, abstractmethod
-from collections import Counter, deque
-from functools import lru_cache
-from itertools import pairwise
+from collections import Counter
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from itertools import count, product
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+from weakref import WeakKeyDictionary
 
+import numpy as np
+
+from .. import instrument
+from ..cache import cached
 from ..utils import partition
-from .cadence import find_cadence
-from .chord import Chord, ChordVoicing, Pitch
-from .constants import PitchClass
-from .tune import Tune
+from .cadence import cadence_table, scan_cadences
+from .chord import Chord, ChordVoicing, Pitch, pitch_class_mask
+from .constants import PitchClass, Triad
+from .graph import parsimonious_graph, voice_leading_graph
+from .structure import PhraseType, TuneStructure
+from .tune import Note, Tune
+
+DEFAULT_MAX_EXPANSIONS = 2000
 
 
 class NotFound(Exception):
     pass
 
 
-@lru_cache
+class SearchBudgetExhausted(NotFound):
+    """The search gave up after max_expansions expansions, so a voicing may
+    exist beyond the budget."""
+
+
 def nearest_parsimonious_chord_containing_pitch_class(
     chord: Chord, pitch_class: PitchClass
 ) -> Chord:
-    queue: deque[Chord] = deque()
-    seen = set()
-    # implement bfs
-    queue.append(chord)
-    while queue:
-        new_chord = queue.popleft()
-        if pitch_class in new_chord.pitch_classes:
-            return new_chord
-        seen.add(new_chord)
-
-        for parsimonious_chord in new_chord.parsimonious_chords():
-            if parsimonious_chord not in seen:
-                queue.append(parsimonious_chord)
-    raise NotFound(f"No path from {chord} to Chord containing {pitch_class}")
-
-
-@lru_cache
+    nearest_chord = parsimonious_graph.nearest_containing(chord, [pitch_class])
+    if nearest_chord is None:
+        raise NotFound(f"No path from {chord} to Chord containing {pitch_class}")
+    return nearest_chord
+
+
+def default_pitch_range(chord_voicing: ChordVoicing) -> tuple[int, int]:
+    """Return the MIDI range spanning chord_voicing widened by an octave either
+    side."""
+    midi_values = [pitch.midi_value for pitch in chord_voicing.pitches]
+    return min(midi_values) - 12, max(midi_values) + 12
+
+
+def _voice_moves_heuristic(
+    chord_voicing: ChordVoicing, pitch_classes: list[PitchClass]
+) -> int | None:
+    # each voice move costs at least a semitone, so the number of chord-level
+    # moves still needed is an admissible estimate of the remaining cost
+    if chord_voicing.chord not in voice_leading_graph:
+        return 0
+    return voice_leading_graph.distance_to_containing(
+        chord_voicing.chord, pitch_classes
+    )
+
+
+def _neighbours(
+    chord_voicing: ChordVoicing,
+    expanded: set[ChordVoicing],
+    pitch_classes: list[PitchClass],
+    low: int,
+    high: int,
+) -> Iterator[tuple[ChordVoicing, int, int]]:
+    """Yield the unexpanded neighbours of chord_voicing within low to high,
+    with the cost of moving to them and the estimated cost remaining."""
+    total = sum(p.abs_value for p in chord_voicing.pitches)
+    for closest_voicing in chord_voicing.find_closest_voicings():
+        if closest_voicing in expanded or not all(
+            low <= p.midi_value <= high for p in closest_voicing.pitches
+        ):
+            continue
+        estimate = _voice_moves_heuristic(closest_voicing, pitch_classes)
+        if estimate is None:
+            continue
+        # neighbouring voicings differ by a single moved voice
+        move = abs(sum(p.abs_value for p in closest_voicing.pitches) - total)
+        yield closest_voicing, move, estimate
+
+
+@cached("voicing_search", maxsize=65536)
 def nearest_parsimonious_chord_voicing_containing(
-    chord_voicing: ChordVoicing, pitch: Pitch | list[Pitch]
+    chord_voicing: ChordVoicing,
+    pitch: Pitch | tuple[Pitch, ...],
+    pitch_range: tuple[int, int] | None = None,
+    max_expansions: int = DEFAULT_MAX_EXPANSIONS,
 ) -> ChordVoicing:
-    queue: deque[ChordVoicing] = deque()
-    if isinstance(pitch, list | tuple):
-        pitches = pitch
-    else:
-        pitches = [pitch]
-    seen = set()
-    # implement bfs
-    queue.append(chord_voicing)
-    while queue:
-        new_chord_voicing = queue.popleft()
-        if all(p.pitch_class in new_chord_voicing.chord.pitch_classes for p in pitches):
-            return new_chord_voicing
-        seen.add(new_chord_voicing.chord)
-
-        for parsimonious_chord_voicing in new_chord_voicing.find_closest_voicings():
-            if parsimonious_chord_voicing.chord not in seen:
-                queue.append(parsimonious_chord_voicing)
-    raise NotFound(f"No path from {chord_voicing} to ChordVoicing containing {pitch}")
+    """
+    Find the voicing closest to chord_voicing whose chord contains every pitch.
+
+    This is an A* search over ChordVoicing.find_closest_voicings where the
+    cost of a path is the total semitone movement of the voices. Voicings with
+    a pitch outside pitch_range (inclusive MIDI note numbers, by default
+    default_pitch_range(chord_voicing)) are never visited. NotFound is raised
+    if no voicing in range contains the pitches, and its subclass
+    SearchBudgetExhausted once max_expansions voicings have been expanded.
+    """
+    pitches = pitch if isinstance(pitch, list | tuple) else [pitch]
+    pitch_classes = [p.pitch_class for p in pitches]
+    mask = pitch_class_mask(pitch_classes)
+    low, high = pitch_range or default_pitch_range(chord_voicing)
+
+    recorder = instrument.active
+    expanded: set[ChordVoicing] = set()
+    frontier_peak = depth = 0
+    found = False
+    try:
+        estimate = _voice_moves_heuristic(chord_voicing, pitch_classes)
+        if estimate is None:
+            raise NotFound(
+                f"No path from {chord_voicing} to ChordVoicing containing {pitch}"
+            )
+
+        tie_breaker = count()
+        # depth follows the unique tie breaker, so it never decides the order
+        frontier = [(estimate, 0, next(tie_breaker), 0, chord_voicing)]
+        costs = {chord_voicing: 0}
+        while frontier:
+            if recorder is not None:
+                frontier_peak = max(frontier_peak, len(frontier))
+            _, cost, _, depth, new_chord_voicing = heappop(frontier)
+            if new_chord_voicing in expanded:
+                continue
+            if new_chord_voicing.chord.mask & mask == mask:
+                found = True
+                return new_chord_voicing
+            if len(expanded) >= max_expansions:
+                raise SearchBudgetExhausted(
+                    f"No ChordVoicing containing {pitch} within {max_expansions} "
+                    f"expansions of {chord_voicing}"
+                )
+            expanded.add(new_chord_voicing)
+
+            for closest_voicing, move, estimate in _neighbours(
+                new_chord_voicing, expanded, pitch_classes, low, high
+            ):
+                new_cost = cost + move
+                if new_cost < costs.get(closest_voicing, new_cost + 1):
+                    costs[closest_voicing] = new_cost
+                    heappush(
+                        frontier,
+                        (
+                            new_cost + estimate,
+                            new_cost,
+                            next(tie_breaker),
+                            depth + 1,
+                            closest_voicing,
+                        ),
+                    )
+        raise NotFound(
+            f"No path from {chord_voicing} to ChordVoicing containing {pitch}"
+        )
+    finally:
+        if recorder is not None:
+            recorder.search(len(expanded), frontier_peak, depth, found)
+
+
+def closest_voicing(
+    chord_voicing: ChordVoicing,
+    chord: Chord,
+    pitch_range: tuple[int, int] | None = None,
+) -> ChordVoicing:
+    """
+    Voice chord with the least total movement from chord_voicing.
+
+    Each voice moves to the nearest pitch of its assigned pitch class, every
+    pitch class of chord is sounded, and pitches are folded by octaves into
+    pitch_range (by default default_pitch_range(chord_voicing)).
+    """
+    low, high = pitch_range or default_pitch_range(chord_voicing)
+    voices = sorted(pitch.abs_value for pitch in chord_voicing.pitches)
+    while len(voices) < len(chord):
+        voices.append(voices[-1])
+
+    best: tuple[int, list[int]] | None = None
+    for assignment in product(chord.pitch_classes, repeat=len(voices)):
+        if len(set(assignment)) != len(chord):
+            continue
+        pitches = []
+        for voice, pitch_class in zip(voices, assignment):
+            pitch = voice + (pitch_class.value - voice + 6) % 12 - 6
+            while pitch + 48 < low:
+                pitch += 12
+            while pitch + 48 > high and pitch + 36 >= low:
+                pitch -= 12
+            pitches.append(pitch)
+        if len(set(pitches)) != len(pitches):
+            continue
+        cost = sum(abs(pitch - voice) for pitch, voice in zip(pitches, voices))
+        if best is None or cost < best[0]:
+            best = cost, pitches
+    if best is None:
+        raise NotFound(f"No voicing of {chord} close to {chord_voicing}")
+    return ChordVoicing(chord, [Pitch(pitch) for pitch in best[1]])
 
 
 class SimpleChordStrategy:
@@ -91,80 +230,520 @@ class SimpleChordStrategy:
 
 
 class IHarmonisationStrategy(ABC):
-    def __init__(self, harmonic_rhythm: int = 1):
+    def __init__(
+        self,
+        harmonic_rhythm: int = 1,
+        pitch_range: tuple[int, int] | None = None,
+        max_expansions: int = DEFAULT_MAX_EXPANSIONS,
+    ):
         # notes per chord
         self.harmonic_rhythm = harmonic_rhythm
+        # MIDI range the accompaniment may move in, by default an octave
+        # either side of the initial voicing
+        self.pitch_range = pitch_range
+        self.max_expansions = max_expansions
+
+    def search_pitch_range(self, chord_voicing: ChordVoicing) -> tuple[int, int]:
+        return self.pitch_range or default_pitch_range(chord_voicing)
 
     @abstractmethod
     def harmonize(self, tune: Tune, chord_voicing: ChordVoicing) -> None:
         pass
 
 
-class FirstNoteStrategy(IHarmonisationStrategy):
+Group = list[Note | None]
+
+
+def _group_key(group: Group) -> tuple:
+    """The notes of a group as a hashable value, to detect edits."""
+    return tuple(
+        None if note is None else (note.pitch.abs_value, note.duration)
+        for note in group
+    )
+
+
+@dataclass(frozen=True)
+class GroupState:
+    """The state of a greedy strategy entering a harmonic rhythm group: the
+    voicing it searches from and the chord it last wrote."""
+
+    chord_voicing: ChordVoicing
+    previous: ChordVoicing | None = None
+
+
+@dataclass
+class Checkpoints:
+    """The group contents and the state entering each group, and after the
+    last, of a tune's last harmonization."""
+
+    pitch_range: tuple[int, int]
+    group_keys: list[tuple]
+    states: list[GroupState]
+
+
+class GreedyStrategy(IHarmonisationStrategy):
+    """
+    Harmonize one harmonic rhythm group at a time from the state the previous
+    group left.
+
+    The state entering every group is checkpointed, so after an edit
+    reharmonize resumes from the first changed group and stops as soon as
+    the state matches the previous run again, rather than searching from the
+    start of the tune.
+    """
+
+    def __init__(
+        self,
+        harmonic_rhythm: int = 1,
+        pitch_range: tuple[int, int] | None = None,
+        max_expansions: int = DEFAULT_MAX_EXPANSIONS,
+    ):
+        super().__init__(harmonic_rhythm, pitch_range, max_expansions)
+        self._checkpoints: WeakKeyDictionary[Tune, Checkpoints] = WeakKeyDictionary()
+
+    def groups(self, notes: list[Note | None]) -> list[Group]:
+        rhythm = self.harmonic_rhythm
+        return [notes[i : i + rhythm] for i in range(0, len(notes), rhythm)]
+
+    @abstractmethod
+    def step(
+        self, chord_voicing: ChordVoicing, group: Group, pitch_range: tuple[int, int]
+    ) -> tuple[ChordVoicing | None, ChordVoicing]:
+        """
+        Harmonize a group from chord_voicing.
+
+        Return the voicing to sound at the start of the group, or None for
+        no chord, and the voicing the next group searches from.
+        """
+
+    def advance(
+        self, state: GroupState, group: Group, pitch_range: tuple[int, int]
+    ) -> tuple[ChordVoicing | None, GroupState]:
+        """Return the chord to write at the start of a group, if it changes,
+        and the state entering the next group."""
+        chord_voicing, following = self.step(state.chord_voicing, group, pitch_range)
+        if chord_voicing is None or chord_voicing == state.previous:
+            return None, GroupState(following, state.previous)
+        return chord_voicing, GroupState(following, chord_voicing)
+
+    @instrument.scoped
     def harmonize(self, tune: Tune, chord_voicing: ChordVoicing) -> None:
-        previous_chord_voicing = None
-        tune._chords.clear()
+        tune.chords.clear()
+        pitch_range = self.search_pitch_range(chord_voicing)
+        groups = self.groups(tune.notes)
 
-        for playhead, note in enumerate(tune.notes):
-            if chord_voicing is None:
-                raise
+        state = GroupState(chord_voicing)
+        states = [state]
+        for i, group in enumerate(groups):
+            chord, state = self.advance(state, group, pitch_range)
+            if chord is not None:
+                tune.set_chord(i * self.harmonic_rhythm, chord)
+            states.append(state)
+        self._checkpoints[tune] = Checkpoints(
+            pitch_range, [_group_key(group) for group in groups], states
+        )
+
+    @instrument.scoped
+    def reharmonize(self, tune: Tune) -> tuple[int, int]:
+        """
+        Bring the chords of a tune harmonized by this strategy up to date with
+        edits to its notes.
+
+        Return the playheads from which and up to which chords were
+        recomputed.
+        """
+        checkpoints = self._checkpoints.get(tune)
+        if checkpoints is None:
+            raise ValueError(f"{tune} has not been harmonized by {self}")
+        groups = self.groups(tune.notes)
+        keys = [_group_key(group) for group in groups]
+        old_keys, old_states = checkpoints.group_keys, checkpoints.states
+        changed = [
+            i for i, key in enumerate(keys) if i >= len(old_keys) or key != old_keys[i]
+        ]
+        first = changed[0] if changed else min(len(keys), len(old_keys))
+        last = changed[-1] if changed else -1
+
+        rhythm = self.harmonic_rhythm
+        state = old_states[first]
+        states = old_states[: first + 1]
+        region = []
+        i = first
+        while i < len(groups):
+            if i > last and i < len(old_keys) and state == old_states[i]:
+                # the rest of the tune is harmonized as before
+                states.extend(old_states[i + 1 : len(groups) + 1])
+                break
+            chord, state = self.advance(state, groups[i], checkpoints.pitch_range)
+            if chord is not None:
+                region.append((i * rhythm, chord))
+            states.append(state)
+            i += 1
+        else:
+            i = max(i, len(old_keys))
+        tune.chords.replace(first * rhythm, i * rhythm, region)
+        # drop the chords of groups the tune no longer has, which an early
+        # stop leaves in place
+        tune.chords.replace(len(groups) * rhythm, None, ())
+
+        checkpoints.group_keys = keys
+        checkpoints.states = states
+        return first * rhythm, i * rhythm
+
+    def stream(
+        self, notes: Iterable[Note | None], chord_voicing: ChordVoicing
+    ) -> Iterator[tuple[int, ChordVoicing]]:
+        """
+        Harmonize notes as they arrive, yielding the playhead and voicing of
+        each chord as soon as the group it starts is complete.
+
+        Only the current group is held, so memory is constant however long
+        the stream is.
+        """
+        harmonizer = StreamHarmonizer(self, chord_voicing)
+        for note in notes:
+            if (decision := harmonizer.push(note)) is not None:
+                yield decision
+        if (decision := harmonizer.flush()) is not None:
+            yield decision
+
+    async def astream(
+        self, notes: AsyncIterable[Note | None], chord_voicing: ChordVoicing
+    ) -> AsyncIterator[tuple[int, ChordVoicing]]:
+        """Harmonize an async stream of notes, as stream."""
+        harmonizer = StreamHarmonizer(self, chord_voicing)
+        async for note in notes:
+            if (decision := harmonizer.push(note)) is not None:
+                yield decision
+        if (decision := harmonizer.flush()) is not None:
+            yield decision
+
+
+class StreamHarmonizer:
+    """
+    Harmonize notes pushed one at a time with a greedy strategy.
+
+    Each push that completes a harmonic rhythm group runs the strategy's
+    search for that group only, so the work per note is bounded by the
+    strategy's max_expansions.
+    """
+
+    def __init__(self, strategy: GreedyStrategy, chord_voicing: ChordVoicing):
+        self.strategy = strategy
+        self.pitch_range = strategy.search_pitch_range(chord_voicing)
+        self.state = GroupState(chord_voicing)
+        self.playhead = 0
+        self._group: Group = []
+
+    def push(self, note: Note | None) -> tuple[int, ChordVoicing] | None:
+        """Add the note at the next playhead, returning a chord if it
+        completes a group that starts one."""
+        self._group.append(note)
+        self.playhead += 1
+        if len(self._group) < self.strategy.harmonic_rhythm:
+            return None
+        return self._complete()
+
+    def flush(self) -> tuple[int, ChordVoicing] | None:
+        """Harmonize a final partial group, if the strategy harmonizes
+        one."""
+        if not self.strategy.groups(self._group):
+            self._group = []
+            return None
+        return self._complete()
+
+    def _complete(self) -> tuple[int, ChordVoicing] | None:
+        start = self.playhead - len(self._group)
+        chord, self.state = self.strategy.advance(
+            self.state, self._group, self.pitch_range
+        )
+        self._group = []
+        return None if chord is None else (start, chord)
+
+
+class FirstNoteStrategy(GreedyStrategy):
+    def step(
+        self, chord_voicing: ChordVoicing, group: Group, pitch_range: tuple[int, int]
+    ) -> tuple[ChordVoicing | None, ChordVoicing]:
+        chord = None
+        for j, note in enumerate(group):
             if note is None:
                 continue
-
-            pitch = note.pitch
             chord_voicing = nearest_parsimonious_chord_voicing_containing(
-                chord_voicing, pitch
+                chord_voicing, note.pitch, pitch_range, self.max_expansions
             )
+            if j == 0:
+                chord = chord_voicing
+        return chord, chord_voicing
+
+
+class CommonTonesStrategy(GreedyStrategy):
+    """
+    Voice each group's three most frequent pitches together, dropping the
+    least frequent until a voicing containing the rest is found.
+
+    A pitch is dropped both when no voicing in range contains the group's
+    pitches and when the search exhausts max_expansions, so a small budget
+    can change the chord chosen. Instrumentation counts each drop as a retry
+    and those caused by the budget as budget_exhausted.
+    """
+
+    def groups(self, notes: list[Note | None]) -> list[Group]:
+        # a final partial group is left unharmonized
+        return partition(notes, part_size=self.harmonic_rhythm)
+
+    def step(
+        self, chord_voicing: ChordVoicing, group: Group, pitch_range: tuple[int, int]
+    ) -> tuple[ChordVoicing | None, ChordVoicing]:
+        pitches = [note.pitch for note in group if note is not None]
+
+        count_pitches = Counter(pitches)
+        pitches = sorted(count_pitches, key=lambda i: -count_pitches[i])[:3]
+
+        while True:
+            try:
+                chord_voicing = nearest_parsimonious_chord_voicing_containing(
+                    chord_voicing,
+                    tuple(pitches),
+                    pitch_range,
+                    self.max_expansions,
+                )
+                return chord_voicing, chord_voicing
+            except NotFound as error:
+                if instrument.active is not None:
+                    instrument.active.retry(
+                        budget_exhausted=isinstance(error, SearchBudgetExhausted)
+                    )
+                pitches.pop()
+
+
+class CadenceStrategy(IHarmonisationStrategy):
+    """
+    Harmonize with a base strategy, then write cadences at phrase endings.
+
+    Phrase endings come from TuneStructure. The ending of an antecedent
+    phrase takes a weak cadence and every other ending a strong one. All
+    endings are looked up at once in the key's cadence table, and each
+    cadence chord is voiced closest to the chord sounding before it. The base
+    chord resumes at the group after each resolution.
+    """
+
+    def __init__(
+        self,
+        harmonic_rhythm: int = 1,
+        pitch_range: tuple[int, int] | None = None,
+        max_expansions: int = DEFAULT_MAX_EXPANSIONS,
+        base: IHarmonisationStrategy | None = None,
+        phrase_length_in_bars: int = 4,
+    ):
+        super().__init__(harmonic_rhythm, pitch_range, max_expansions)
+        self.base = base or CommonTonesStrategy(
+            harmonic_rhythm, pitch_range, max_expansions
+        )
+        self.phrase_length_in_bars = phrase_length_in_bars
+
+    @instrument.scoped
+    def harmonize(self, tune: Tune, chord_voicing: ChordVoicing) -> None:
+        self.base.harmonize(tune, chord_voicing)
+        pitch_range = self.search_pitch_range(chord_voicing)
+        table = cadence_table(tune.key)
+
+        base = tune.chords.slice(0)
+        rhythm = self.harmonic_rhythm
+        for i, (playhead, chord_index) in enumerate(self.cadence_chords(tune)):
+            voicing = tune.chord_at(playhead) or chord_voicing
+            cadence_voicing = closest_voicing(
+                voicing, table.chords[chord_index], pitch_range
+            )
+            tune.set_chord(playhead, cadence_voicing)
+            # the base only writes chords that change, so after a resolution
+            # its chord must be restored or the cadence would sound on
+            following = (playhead // rhythm + 1) * rhythm
+            restored = base.at(following)
             if (
-                chord_voicing != previous_chord_voicing
-                and playhead % self.harmonic_rhythm == 0
+                i % 2
+                and following < len(tune.notes)
+                and following not in tune.chords
+                and restored is not None
+                and restored != cadence_voicing
             ):
-                previous_chord_voicing = chord_voicing
-                tune.set_chord(playhead, chord_voicing)
+                tune.set_chord(following, restored)
 
+    def cadence_chords(self, tune: Tune) -> list[tuple[int, int]]:
+        """
+        Return the playheads and cadence table indexes of the cadence chords.
 
-class CommonTonesStrategy(IHarmonisationStrategy):
-    def harmonize(self, tune: Tune, chord_voicing: ChordVoicing) -> None:
-        previous_chord_voicing = None
-        tune._chords.clear()
+        Chords are placed at the start of the harmonic rhythm group holding
+        their note. If the approach and resolution notes share a group, the
+        group is split and each chord placed at its own note.
+        """
+        structure = TuneStructure(tune, self.phrase_length_in_bars)
+        ends = np.arange(
+            structure.phrase_length, structure.length + 1, structure.phrase_length
+        )
+        strong = [
+            structure.get_phrase_type_at(end - 1) is not PhraseType.ANTECEDENT
+            for end in ends.tolist()
+        ]
+        points = scan_cadences(tune, ends, np.array(strong, dtype=bool))
 
-        for i, group in enumerate(
-            partition(tune.notes, part_size=self.harmonic_rhythm)
+        rhythm = self.harmonic_rhythm
+        approach = points.approach_onset // rhythm * rhythm
+        resolution = points.resolution_onset // rhythm * rhythm
+        shared = approach == resolution
+        approach = np.where(shared, points.approach_onset, approach)
+        resolution = np.where(shared, points.resolution_onset, resolution)
+        chords = []
+        for a, r, a_chord, r_chord in zip(
+            approach.tolist(),
+            resolution.tolist(),
+            points.approach_chord.tolist(),
+            points.resolution_chord.tolist(),
         ):
-            pitches = [note.pitch for note in group if note is not None]
+            chords.extend([(a, a_chord), (r, r_chord)])
+        return chords
 
-            count_pitches = Counter(pitches)
-            pitches = sorted(count_pitches, key=lambda i: -count_pitches[i])[:3]
 
-            while True:
-                try:
-                    chord_voicing = nearest_parsimonious_chord_voicing_containing(
-                        chord_voicing, tuple(pitches)
-                    )
-                    break
-                except NotFound:
-                    pitches.pop()
+class ViterbiStrategy(IHarmonisationStrategy):
+    """
+    Globally optimal harmonization over harmonic rhythm groups.
+
+    Every group of harmonic_rhythm notes is a time step and every chord in the
+    vocabulary a state. The chord sequence minimising melody misfit, chord
+    complexity, distance from the key and voice-leading distance between
+    consecutive chords, less a bonus for tonic and dominant chords at phrase
+    ends, is found with a Viterbi pass of O(T x S^2) array operations.
+    """
+
+    def __init__(
+        self,
+        harmonic_rhythm: int = 1,
+        pitch_range: tuple[int, int] | None = None,
+        chords: Iterable[Chord] | None = None,
+        phrase_length_in_bars: int = 4,
+        melody_weight: float = 2.0,
+        key_weight: float = 1.0,
+        voice_leading_weight: float = 0.25,
+        cadence_bonus: float = 1.0,
+    ):
+        # chords are voiced directly rather than searched for, so there is
+        # no search budget to take
+        super().__init__(harmonic_rhythm, pitch_range)
+        self.chords = list(chords or voice_leading_graph.chords)
+        self.phrase_length_in_bars = phrase_length_in_bars
+        self.melody_weight = melody_weight
+        self.key_weight = key_weight
+        self.voice_leading_weight = voice_leading_weight
+        self.cadence_bonus = cadence_bonus
 
+        nodes = [voice_leading_graph.index(chord) for chord in self.chords]
+        distances = np.array(voice_leading_graph.distances, dtype=float)[
+            np.ix_(nodes, nodes)
+        ]
+        distances[distances < 0] = np.inf
+        self._transitions = voice_leading_weight * distances
+        # chord_tones[pitch_class, state] is 1 if the chord contains it
+        self._chord_tones = np.array(
+            [[chord.mask >> i & 1 for chord in self.chords] for i in range(12)],
+            dtype=float,
+        )
+        self._complexity = np.array(
+            [
+                (chord.chord_type.base not in (Triad.MAJOR, Triad.MINOR)) * 0.5
+                + (chord.chord_type.seventh is not None) * 0.25
+                for chord in self.chords
+            ]
+        )
+
+    @instrument.scoped
+    def harmonize(self, tune: Tune, chord_voicing: ChordVoicing) -> None:
+        tune.chords.clear()
+        if tune.note_array.length == 0:
+            return
+        pitch_range = self.search_pitch_range(chord_voicing)
+
+        path = self.best_path(tune, chord_voicing.chord)
+        previous_chord_voicing = None
+        for i, state in enumerate(path):
+            chord_voicing = closest_voicing(
+                chord_voicing, self.chords[state], pitch_range
+            )
             if chord_voicing != previous_chord_voicing:
                 previous_chord_voicing = chord_voicing
                 tune.set_chord(i * self.harmonic_rhythm, chord_voicing)
 
+    def best_path(self, tune: Tune, initial_chord: Chord) -> list[int]:
+        """Return the state index of the best chord for each group."""
+        costs = self._emission_costs(tune)
+        n_groups, n_states = costs.shape
 
-class CadenceStrategy(IHarmonisationStrategy):
-    def harmonize(self, tune: Tune, chord_voicing: ChordVoicing) -> None:
-        tune._chords.clear()
-        harmonic_groups = partition(tune.notes, part_size=self.harmonic_rhythm)
+        if initial_chord in voice_leading_graph:
+            start = voice_leading_graph.index(initial_chord)
+            row = np.array(voice_leading_graph.distances[start], dtype=float)
+            nodes = [voice_leading_graph.index(chord) for chord in self.chords]
+            initial = row[nodes]
+            initial[initial < 0] = np.inf
+            cost = self.voice_leading_weight * initial + costs[0]
+        else:
+            cost = costs[0].copy()
 
-        for current_group, next_group in pairwise(harmonic_groups):
-            current_notes = [n for n in current_group if n is not None]
-            next_notes = [n for n in next_group if n is not None]
-            if len(current_notes) == 0 or len(next_notes) == 0:
-                continue
+        backpointers = np.zeros((n_groups, n_states), dtype=np.intp)
+        states = np.arange(n_states)
+        for t in range(1, n_groups):
+            candidates = cost[:, None] + self._transitions
+            backpointers[t] = np.argmin(candidates, axis=0)
+            cost = candidates[backpointers[t], states] + costs[t]
+
+        path = [int(np.argmin(cost))]
+        for t in range(n_groups - 1, 0, -1):
+            path.append(int(backpointers[t, path[-1]]))
+        return path[::-1]
+
+    def _emission_costs(self, tune: Tune) -> np.ndarray:
+        notes = tune.note_array
+        n_groups = -(-notes.length // self.harmonic_rhythm)
+
+        # weights[group, pitch_class]: time each pitch class sounds, with the
+        # note on the strong beat of each group counted twice
+        groups, beats = np.divmod(notes.onset, self.harmonic_rhythm)
+        weights = np.zeros((n_groups, 12))
+        np.add.at(
+            weights,
+            (groups, notes.pitch_class),
+            notes.duration * np.where(beats == 0, 2, 1),
+        )
+        totals = weights.sum(axis=1, keepdims=True)
+        misfit = (weights @ (1 - self._chord_tones)) / np.maximum(totals, 1e-9)
+
+        scale_mask = pitch_class_mask(tune.key.scale)
+        outside_key = np.array(
+            [
+                bin(chord.mask & ~scale_mask).count("1") / len(chord)
+                for chord in self.chords
+            ]
+        )
+        costs = (
+            self.melody_weight * misfit
+            + self.key_weight * outside_key
+            + self._complexity
+        )
 
-            current_note = current_notes[-1].pitch.pitch_class - tune.key.tonic
-            next_note = next_notes[0].pitch.pitch_class - tune.key.tonic
-            strong = True
+        tonic, dominant = tune.key.triad(0), tune.key.triad(4)
+        bonus = np.zeros((2, len(self.chords)))
+        for state, chord in enumerate(self.chords):
+            bonus[0, state] = self.cadence_bonus * (chord == tonic)
+            bonus[1, state] = 0.5 * self.cadence_bonus * (chord == dominant)
+        for group in self._phrase_end_groups(tune, n_groups):
+            costs[group] -= bonus[0]
+            if group > 0:
+                costs[group - 1] -= bonus[1]
+        return costs
 
-            cadence = find_cadence(current_note, next_note, strong)
-            if cadence is not None:
-                print(f"{cadence=}")
+    def _phrase_end_groups(self, tune: Tune, n_groups: int) -> set[int]:
+        ends = {n_groups - 1}
+        offset = 0
+        for i, bar in enumerate(tune.bars, start=1):
+            offset += len(bar)
+            if i % self.phrase_length_in_bars == 0:
+                ends.add(min((offset - 1) // self.harmonic_rhythm, n_groups - 1))
+        return ends
@@ -0,0 +1,140 @@
+import struct
+from pathlib import Path
+from typing import BinaryIO, Iterable
+
+from .schedule import SESSION_TEMPO, Event, schedule
+from .tune import Tune
+
+TICKS_PER_BEAT = 480
+# one beat a second, so event times in seconds map straight onto ticks
+MICROSECONDS_PER_BEAT = 1_000_000
+
+# General MIDI programs of the Player's default instruments
+HARP = 46
+CELLO = 42
+
+_END_OF_TRACK = b"\x00\xff\x2f\x00"
+
+
+def _variable_length(value: int) -> bytes:
+    """Encode a delta time as a MIDI variable-length quantity."""
+    encoded = [value & 0x7F]
+    value >>= 7
+    while value:
+        encoded.append(0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(reversed(encoded))
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return kind + struct.pack(">I", len(data)) + data
+
+
+def _velocity(volume: float) -> int:
+    return min(max(round(volume * 127), 1), 127)
+
+
+def _notes(
+    events: Iterable[Event], ticks_per_beat: int
+) -> list[tuple[int, int, int, int]]:
+    """
+    Return the start tick, end tick, pitch and velocity of each note.
+
+    A note still sounding when its pitch is struck again ends at the new
+    strike, so that its note off never silences the later note.
+    """
+    notes: list[tuple[int, int, int, int]] = []
+    for event in events:
+        start = round(event.time * ticks_per_beat)
+        seconds = event.length * 60 / SESSION_TEMPO
+        end = max(start + round(seconds * ticks_per_beat), start + 1)
+        for pitch in event.pitches:
+            notes.append((start, end, pitch, _velocity(event.volume)))
+    notes.sort(key=lambda note: (note[2], note[0]))
+
+    trimmed = []
+    for i, (start, end, pitch, velocity) in enumerate(notes):
+        if i + 1 < len(notes) and notes[i + 1][2] == pitch:
+            end = min(end, notes[i + 1][0])
+        # a note struck twice at once sounds once
+        if end > start:
+            trimmed.append((start, end, pitch, velocity))
+    return trimmed
+
+
+def _track(
+    events: Iterable[Event], channel: int, program: int, ticks_per_beat: int
+) -> bytes:
+    # (tick, 0 for off or 1 for on, pitch, velocity), so that at the same tick
+    # notes are released before they are struck again
+    messages: list[tuple[int, int, int, int]] = []
+    for start, end, pitch, velocity in _notes(events, ticks_per_beat):
+        messages.append((start, 1, pitch, velocity))
+        messages.append((end, 0, pitch, 0))
+    messages.sort()
+
+    data = bytearray(_variable_length(0) + bytes([0xC0 | channel, program]))
+    tick = 0
+    for time, on, pitch, velocity in messages:
+        status = (0x90 if on else 0x80) | channel
+        data += _variable_length(time - tick) + bytes([status, pitch, velocity])
+        tick = time
+    return _chunk(b"MTrk", bytes(data) + _END_OF_TRACK)
+
+
+def render_midi(
+    events: Iterable[Event],
+    ticks_per_beat: int = TICKS_PER_BEAT,
+    melody_program: int = HARP,
+    accompaniment_program: int = CELLO,
+) -> bytes:
+    """
+    Render scheduled events as a format 1 Standard MIDI File.
+
+    Melody notes go on channel 1 and chords on channel 2, each in its own
+    track after a tempo track.
+    """
+    events = list(events)
+    tempo = struct.pack(">I", MICROSECONDS_PER_BEAT)[1:]
+    tracks = [
+        _chunk(b"MTrk", b"\x00\xff\x51\x03" + tempo + _END_OF_TRACK),
+        _track(
+            (event for event in events if event.kind == "note"),
+            0,
+            melody_program,
+            ticks_per_beat,
+        ),
+        _track(
+            (event for event in events if event.kind == "chord"),
+            1,
+            accompaniment_program,
+            ticks_per_beat,
+        ),
+    ]
+    header = _chunk(b"MThd", struct.pack(">HHH", 1, len(tracks), ticks_per_beat))
+    return header + b"".join(tracks)
+
+
+def write_midi(
+    tune: Tune,
+    file: str | Path | BinaryIO,
+    meter: str | None = None,
+    speed: float = 0.12,
+    swing: float = 1,
+    play_melody: bool = True,
+    play_chords: bool = True,
+) -> None:
+    """
+    Write a tune and its chords to a Standard MIDI File without playing it.
+
+    Timing, swing and intensity are those Player uses for the meter, which
+    defaults to the tune's own.
+    """
+    meter = meter or tune.meter
+    if meter is None:
+        raise ValueError("The tune has no meter, so one must be given")
+    data = render_midi(schedule(tune, meter, speed, swing, play_melody, play_chords))
+    if isinstance(file, (str, Path)):
+        Path(file).write_bytes(data)
+    else:
+        file.write(data)
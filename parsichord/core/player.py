@@ -1,16 +1,26 @@
 import threading
-from time import sleep
-from typing import Generator
+from time import monotonic, sleep
+from typing import Generator, Iterable, Iterator
 
 import scamp
 
+from .harmony import GreedyStrategy
+from .schedule import (
+    SESSION_TEMPO,
+    Event,
+    LatenessStats,
+    Scheduler,
+    chord_event,
+    pattern_for,
+    schedule,
+)
 from .tune import ChordVoicing, Note, Tune
 
 
 class Player:
     def __init__(self, tune: Tune, melody: str = "harp", accompaniment: str = "cello"):
         self.session = scamp.Session().run_as_server()
-        self.session.tempo = 360
+        self.session.tempo = SESSION_TEMPO
         self.melody = self.session.new_part(melody)
         self.accompaniment = self.session.new_part(accompaniment)
         self.tune = tune
@@ -18,6 +28,8 @@ class Player:
         self.chord: list | None = None
         self.stop_arpeggio = False
         self.speed = 0.12
+        self.scheduler = Scheduler()
+        self.last_stats: LatenessStats | None = None
 
     def arpeggiate(self, event: threading.Event) -> Generator[Note, None, None]:
         if self.chord is None:
@@ -50,74 +62,109 @@ class Player:
             [pitch.midi_value for pitch in chord.pitches], volume, 10, blocking=False
         )
 
-    def play_jig(
+    def dispatch(self, event: Event) -> None:
+        """Send a scheduled event to scamp without blocking."""
+        if event.kind == "chord":
+            self.accompaniment.play_chord(
+                list(event.pitches), event.volume, event.length, blocking=False
+            )
+        else:
+            self.melody.play_note(
+                event.pitches[0], event.volume, event.length, blocking=False
+            )
+
+    def play(self, events: list[Event]) -> LatenessStats:
+        """Play precomputed events against the scheduler's clock."""
+        self.last_stats = self.scheduler.run(events, self.dispatch)
+        return self.last_stats
+
+    def accompany(
         self,
+        notes: Iterable[Note | None],
+        strategy: GreedyStrategy,
+        chord_voicing: ChordVoicing,
+        play_melody: bool = False,
+    ) -> LatenessStats:
+        """
+        Accompany notes as they arrive, such as from a live player, playing
+        each chord as soon as the strategy decides it.
+
+        If play_melody is set the notes are also played as they arrive.
+        Returns how long after the note completing each group its chord was
+        played.
+        """
+        start = arrived = monotonic()
+        latencies = []
+
+        def arrivals() -> Iterator[Note | None]:
+            nonlocal arrived
+            for note in notes:
+                arrived = monotonic()
+                if play_melody and note is not None:
+                    self.melody.play_note(
+                        note.pitch.midi_value, 1.0, note.duration, blocking=False
+                    )
+                yield note
+
+        for playhead, chord in strategy.stream(arrivals(), chord_voicing):
+            self.dispatch(chord_event(arrived - start, playhead, chord))
+            latencies.append(monotonic() - arrived)
+        self.last_stats = LatenessStats.from_samples(latencies)
+        return self.last_stats
+
+    def compile(
+        self,
+        meter: str | None = None,
         play_melody: bool = True,
         play_chords: bool = True,
         speed: float | None = None,
         swing: float = 1,
-        slip: bool = False,
-    ) -> None:
+    ) -> list[Event]:
+        """Compile the tune in a meter such as "6/8", by default its own, into
+        events that can be replayed with play."""
         if speed is not None:
             self.speed = speed
+        meter = meter or self.tune.meter
+        if meter is None:
+            raise ValueError("The tune has no meter, so one must be given")
+        return schedule(self.tune, meter, self.speed, swing, play_melody, play_chords)
 
-        if slip:
-            beats_per_bar = 3
-        else:
-            beats_per_bar = 2
-
-        # last_chord = None
-        for playhead, note in enumerate(self.tune.notes):
-            match playhead % 3:
-                case 0:
-                    intensity = 1.0
-                    stretch = (swing / (swing + 1)) * 2
-                case 1:
-                    intensity = 0.5
-                    stretch = (1 / (swing + 1)) * 2
-                case 2:
-                    intensity = 0.7
-                    stretch = 1.0
-
-            if note is not None and play_melody:
-                self.melody.play_note(
-                    note.pitch.midi_value, intensity, note.duration * stretch
-                )
-
-            chord = self.tune.get_chord(playhead)
-            if (
-                playhead % (beats_per_bar * 3) == 0
-                and chord is not None
-                and play_chords
-                # and chord != last_chord
-            ):
-                self.play_chord(chord)
-            sleep(self.speed * stretch)
+    def play_meter(
+        self,
+        meter: str | None = None,
+        play_melody: bool = True,
+        play_chords: bool = True,
+        speed: float | None = None,
+        swing: float = 1,
+    ) -> LatenessStats:
+        return self.play(self.compile(meter, play_melody, play_chords, speed, swing))
+
+    def play_jig(
+        self,
+        play_melody: bool = True,
+        play_chords: bool = True,
+        speed: float | None = None,
+        swing: float = 1,
+        slip: bool = False,
+    ) -> LatenessStats:
+        meter = "9/8" if slip else "6/8"
+        return self.play_meter(meter, play_melody, play_chords, speed, swing)
 
     def play_note_at(self, playhead: int, swing: float = 1) -> None:
         if playhead >= len(self.tune.notes):
             return
 
-        match playhead % 4:
-            case 0:
-                intensity = 1.0
-                stretch = (swing / (swing + 1)) * 2
-            case 1:
-                intensity = 0.7
-                stretch = (1 / (swing + 1)) * 2
-            case 2:
-                intensity = 0.7
-                stretch = 1.0
-            case 3:
-                intensity = 0.7
-                stretch = 1.0
-
+        intensity, stretch = pattern_for("4/4").accent(playhead, swing)
+        end = monotonic() + self.speed * stretch
         note = self.tune.notes[playhead]
         if note is not None:
             self.melody.play_note(
-                note.pitch.midi_value, intensity, note.duration * stretch
+                note.pitch.midi_value,
+                intensity,
+                note.duration * stretch,
+                blocking=False,
             )
-        sleep(self.speed * stretch)
+        sleep(max(end - monotonic(), 0))
 
     def play_reel(
         self,
@@ -125,25 +172,5 @@ class Player:
         play_chords: bool = True,
         speed: float | None = None,
         swing: float = 1,
-    ) -> None:
-        if speed is not None:
-            self.speed = speed
-
-        beats_per_bar = 4
-
-        last_chord = None
-        for playhead in range(len(self.tune.notes)):
-            chord = self.tune.get_chord(playhead) or last_chord
-            if (
-                playhead % beats_per_bar == 0
-                and chord is not None
-                and play_chords
-                # and chord != last_chord
-            ):
-                self.play_chord(chord)
-                print(chord)
-                if chord is not None:
-                    last_chord = chord
-
-            if play_melody:
-                self.play_note_at(playhead, swing)
+    ) -> LatenessStats:
+        return self.play_meter("4/4", play_melody, play_chords, speed, swing)
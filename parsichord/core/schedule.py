@@ -0,0 +1,223 @@
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+import numpy as np
+
+from .tune import ChordVoicing, Tune
+
+# beats per minute of the playback session, in which event lengths are given
+SESSION_TEMPO = 360
+CHORD_VOLUME = 0.5
+CHORD_LENGTH = 10
+
+
+@dataclass(frozen=True, order=True)
+class Event:
+    """
+    A note or chord to be played time seconds after the start of a tune.
+
+    length is in beats of the playback session, as passed to scamp.
+    """
+
+    time: float
+    playhead: int
+    kind: str = field(compare=False)
+    pitches: tuple[int, ...] = field(compare=False)
+    volume: float = field(compare=False)
+    length: float = field(compare=False)
+
+
+@dataclass(frozen=True)
+class LatenessStats:
+    """How late events were dispatched relative to their deadlines, in
+    seconds."""
+
+    count: int
+    mean: float
+    median: float
+    p95: float
+    max: float
+
+    @classmethod
+    def from_samples(cls, samples: list[float]) -> "LatenessStats":
+        if not samples:
+            return cls(0, 0.0, 0.0, 0.0, 0.0)
+        ordered = sorted(samples)
+        return cls(
+            len(ordered),
+            statistics.fmean(ordered),
+            statistics.median(ordered),
+            ordered[min(int(0.95 * len(ordered)), len(ordered) - 1)],
+            ordered[-1],
+        )
+
+
+@dataclass(frozen=True)
+class MeterPattern:
+    """
+    How a meter is played, in playheads of the unit note length.
+
+    Accents repeat every pulse playheads with the given intensities, and the
+    first two playheads of each pulse are swung. Chords change every
+    chord_interval playheads. If repeat_chords is set the chord sounding at
+    each change point is played, otherwise only a chord starting there.
+    """
+
+    pulse: int
+    intensities: tuple[float, ...]
+    chord_interval: int
+    repeat_chords: bool = False
+
+    def stretches(self, swing: float = 1) -> tuple[float, ...]:
+        swung = ((swing / (swing + 1)) * 2, (1 / (swing + 1)) * 2)
+        return (*swung, *[1.0] * (self.pulse - 2))
+
+    def accent(self, playhead: int, swing: float = 1) -> tuple[float, float]:
+        """Return the intensity and time stretch of a playhead."""
+        position = playhead % self.pulse
+        return self.intensities[position], self.stretches(swing)[position]
+
+
+_compound = (1.0, 0.5, 0.7)
+_common = (1.0, 0.7, 0.7, 0.7)
+_simple = (1.0, 0.7)
+
+meter_patterns = {
+    # jigs, slip jigs and slides
+    "6/8": MeterPattern(3, _compound, 6),
+    "9/8": MeterPattern(3, _compound, 9),
+    "12/8": MeterPattern(3, _compound, 6),
+    # reels, hornpipes, barndances and strathspeys
+    "4/4": MeterPattern(4, _common, 4, repeat_chords=True),
+    "2/4": MeterPattern(2, _simple, 4, repeat_chords=True),
+    "3/4": MeterPattern(2, _simple, 6, repeat_chords=True),
+    "3/2": MeterPattern(2, _simple, 4, repeat_chords=True),
+}
+
+
+def pattern_for(meter: str) -> MeterPattern:
+    try:
+        return meter_patterns[meter]
+    except KeyError:
+        raise ValueError(f"Unsupported meter {meter}") from None
+
+
+def chord_event(time: float, playhead: int, chord: ChordVoicing) -> Event:
+    return Event(
+        time,
+        playhead,
+        "chord",
+        tuple(pitch.midi_value for pitch in chord.pitches),
+        CHORD_VOLUME,
+        CHORD_LENGTH,
+    )
+
+
+def compile_schedule(
+    tune: Tune,
+    pattern: MeterPattern,
+    speed: float,
+    swing: float = 1,
+    play_melody: bool = True,
+    play_chords: bool = True,
+) -> list[Event]:
+    """
+    Precompute the events of a tune in time order.
+
+    Onsets are absolute, from a single cumulative sum of the stretches, so
+    they are exact however long the tune is.
+    """
+    notes = tune.notes
+    positions = np.arange(len(notes)) % pattern.pulse
+    stretch = np.array(pattern.stretches(swing))[positions]
+    intensity = np.array(pattern.intensities)[positions]
+    onsets = np.zeros(len(notes))
+    onsets[1:] = np.cumsum(speed * stretch)[:-1]
+
+    events = []
+    if play_chords:
+        chord_at = tune.chord_at if pattern.repeat_chords else tune.get_chord
+        for playhead in range(0, len(notes), pattern.chord_interval):
+            chord = chord_at(playhead)
+            if chord is not None:
+                events.append(chord_event(float(onsets[playhead]), playhead, chord))
+    if play_melody:
+        events.extend(
+            Event(
+                float(onsets[playhead]),
+                playhead,
+                "note",
+                (note.pitch.midi_value,),
+                float(intensity[playhead]),
+                note.duration * float(stretch[playhead]),
+            )
+            for playhead, note in enumerate(notes)
+            if note is not None
+        )
+    # stable, so chords stay ahead of notes struck at the same time
+    events.sort()
+    return events
+
+
+def schedule(
+    tune: Tune,
+    meter: str,
+    speed: float,
+    swing: float = 1,
+    play_melody: bool = True,
+    play_chords: bool = True,
+) -> list[Event]:
+    """Precompute the events of a tune in a meter such as "6/8"."""
+    return compile_schedule(
+        tune, pattern_for(meter), speed, swing, play_melody, play_chords
+    )
+
+
+class Scheduler:
+    """
+    Dispatch events at absolute deadlines on a monotonic clock.
+
+    Every deadline is measured from the start of the run rather than from the
+    previous event, so time spent dispatching never accumulates as drift. The
+    scheduler sleeps until lookahead seconds before each deadline and then
+    spins, since sleep can overshoot by a scheduler quantum.
+    """
+
+    def __init__(
+        self,
+        lookahead: float = 0.002,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.lookahead = lookahead
+        self.clock = clock
+        self.sleep = sleep
+
+    def run(
+        self,
+        events: Iterable[Event],
+        dispatch: Callable[[Event], None],
+        stop: threading.Event | None = None,
+    ) -> LatenessStats:
+        """Dispatch events in time order, returning their lateness. Setting
+        stop ends the run before the next event."""
+        lateness = []
+        start = self.clock()
+        for event in sorted(events):
+            if stop is not None and stop.is_set():
+                break
+            deadline = start + event.time
+            self._wait_until(deadline)
+            lateness.append(max(self.clock() - deadline, 0.0))
+            dispatch(event)
+        return LatenessStats.from_samples(lateness)
+
+    def _wait_until(self, deadline: float) -> None:
+        remaining = deadline - self.clock()
+        if remaining > self.lookahead:
+            self.sleep(remaining - self.lookahead)
+        while self.clock() < deadline:
+            pass
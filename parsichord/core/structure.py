@@ -1,11 +1,20 @@
+from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum, auto
+from itertools import combinations, product
+from string import ascii_uppercase
+from typing import Iterator
 
-from parsichord.utils import partition
+import numpy as np
 
 from .cadence import Cadence
 from .tune import Tune
 
+# Mersenne prime modulus, small enough that products of two residues fit in
+# an int64
+_MODULUS = (1 << 31) - 1
+_BASE = 1_000_003
+
 
 class PhraseType(Enum):
     ANTECEDENT = auto()
@@ -21,6 +30,263 @@ class PhraseSpan:
     end: int
 
 
+@dataclass(frozen=True)
+class Repeat:
+    """The length playheads from first recur from second, with mismatches
+    differing playheads."""
+
+    first: int
+    second: int
+    length: int
+    mismatches: int = 0
+
+
+@dataclass(frozen=True)
+class Section:
+    """A section of the form, such as the second A of AABB."""
+
+    label: str
+    start: int
+    end: int
+
+
+def tune_symbols(tune: Tune) -> np.ndarray:
+    """
+    Encode every playhead of a tune as an integer, so that equal runs of
+    symbols are equal runs of pitches and durations.
+
+    Silence is 0, and a sounding pitch is distinguished by whether it is
+    struck or held at the playhead.
+    """
+    notes = tune.note_array
+    index = notes.note_index
+    sounding = index >= 0
+    safe = np.where(sounding, index, 0)
+    pitch = notes.pitch.astype(np.int64)[safe] if len(notes) else np.zeros_like(safe)
+    onset = notes.onset[safe] if len(notes) else np.zeros_like(safe)
+    struck = onset == np.arange(len(index))
+    return np.where(sounding, pitch * 2 + 1 + struck, 0)
+
+
+class RepeatAnalysis:
+    """
+    Finds repeated segments of a symbol sequence with rolling hashes.
+
+    Every window of a given length is hashed in one vectorized pass from
+    prefix hashes, so equal windows are found by grouping hashes rather than
+    by comparing every pair. Matches are verified against the symbols, so
+    hash collisions never produce false repeats.
+    """
+
+    def __init__(self, symbols: np.ndarray) -> None:
+        self.symbols = np.asarray(symbols, dtype=np.int64)
+        n = len(self.symbols)
+        self._prefix = np.zeros(n + 1, dtype=np.int64)
+        self._powers = np.ones(n + 1, dtype=np.int64)
+        prefix, power = 0, 1
+        for i, symbol in enumerate((self.symbols % _MODULUS).tolist()):
+            prefix = (prefix * _BASE + symbol) % _MODULUS
+            power = power * _BASE % _MODULUS
+            self._prefix[i + 1] = prefix
+            self._powers[i + 1] = power
+
+    @classmethod
+    def from_tune(cls, tune: Tune) -> "RepeatAnalysis":
+        return cls(tune_symbols(tune))
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def window_hashes(self, length: int) -> np.ndarray:
+        """Return the hash of the window of length starting at every
+        playhead."""
+        if not 0 < length <= len(self):
+            return np.zeros(0, dtype=np.int64)
+        shifted = self._prefix[:-length] * self._powers[length] % _MODULUS
+        return (self._prefix[length:] - shifted) % _MODULUS
+
+    def mismatches(self, first: int, second: int, length: int) -> int:
+        a = self.symbols[first : first + length]
+        b = self.symbols[second : second + length]
+        return int(np.count_nonzero(a != b))
+
+    def _common_extension(self, first: int, second: int) -> int:
+        """The number of equal symbols from first and second onwards."""
+        length = len(self) - second
+        a, b = self.symbols[first : first + length], self.symbols[second:]
+        unequal = np.flatnonzero(a != b)
+        return int(unequal[0]) if len(unequal) else length
+
+    def _equal_windows(self, length: int) -> list[np.ndarray]:
+        """Group the starts of windows of length by hash."""
+        hashes = self.window_hashes(length)
+        order = np.argsort(hashes, kind="stable")
+        boundaries = np.flatnonzero(np.diff(hashes[order])) + 1
+        return [g for g in np.split(order, boundaries) if len(g) > 1]
+
+    def _maximal_pairs(self, min_length: int) -> Iterator[tuple[int, int, int]]:
+        """
+        Yield the starts and length of every maximal exact repeat of at least
+        min_length playheads.
+
+        Windows with equal hashes are split by the symbol before them, and
+        only windows preceded by different symbols are paired, since any
+        other pair extends a repeat starting a playhead earlier. Every pair
+        compared is then a repeat unless the hashes collide, so the work
+        grows with the number of repeats rather than the square of the
+        windows.
+        """
+        for group in self._equal_windows(min_length):
+            by_left: defaultdict[int, list[int]] = defaultdict(list)
+            for start in group.tolist():
+                by_left[int(self.symbols[start - 1]) if start else -1].append(start)
+            for starts, other_starts in combinations(by_left.values(), 2):
+                for a, b in product(starts, other_starts):
+                    first, second = min(a, b), max(a, b)
+                    length = self._common_extension(first, second)
+                    if length >= min_length:
+                        yield first, second, length
+
+    def repeats(self, min_length: int) -> list[Repeat]:
+        """
+        Return every maximal exact repeat of at least min_length playheads, at
+        any offset.
+
+        A repeat is maximal if it cannot be extended on either side.
+        """
+        return sorted(
+            (Repeat(*pair) for pair in self._maximal_pairs(min_length)),
+            key=lambda r: (r.first, r.second),
+        )
+
+    def near_repeats(self, length: int, max_mismatches: int) -> list[Repeat]:
+        """
+        Return non-overlapping segments of at least length playheads that
+        recur with at most max_mismatches differing playheads per window.
+
+        By the pigeonhole principle two windows that differ in at most k
+        playheads agree exactly on one of k + 1 blocks, so only windows
+        overlapping an exact repeat of a block's length are compared, with
+        one cumulative count of differences per repeat. That needs blocks of
+        at least one playhead, so max_mismatches must be less than length.
+        """
+        if not 0 <= max_mismatches < length:
+            raise ValueError(
+                f"max_mismatches must be from 0 to {length - 1}, not {max_mismatches}"
+            )
+        block_length = length // (max_mismatches + 1)
+        last = len(self) - length
+        matches: set[tuple[int, int]] = set()
+        for first, second, run in self._maximal_pairs(block_length):
+            shift = second - first
+            start = max(first - length + block_length, 0)
+            stop = min(first + run - block_length, last - shift)
+            if shift < length or stop < start:
+                continue
+            unequal = (
+                self.symbols[start : stop + length]
+                != self.symbols[start + shift : stop + shift + length]
+            )
+            differing = np.zeros(len(unequal) + 1, dtype=np.int64)
+            np.cumsum(unequal, out=differing[1:])
+            within = differing[length:] - differing[:-length] <= max_mismatches
+            matches.update((shift, start + i) for i in np.flatnonzero(within).tolist())
+        return self._merge(sorted(matches), length)
+
+    def _merge(self, matches: list[tuple[int, int]], length: int) -> list[Repeat]:
+        """Merge matching windows that follow each other at the same shift."""
+        runs: list[list[int]] = []
+        for shift, first in matches:
+            if runs and runs[-1][0] == shift and runs[-1][2] == first - 1:
+                runs[-1][2] = first
+            else:
+                runs.append([shift, first, first])
+        repeats = []
+        for shift, start, end in runs:
+            span = min(end - start + length, shift)
+            repeats.append(
+                Repeat(
+                    start,
+                    start + shift,
+                    span,
+                    self.mismatches(start, start + shift, span),
+                )
+            )
+        return sorted(repeats, key=lambda r: (r.first, r.second))
+
+    def sections(self, section_length: int, tolerance: float = 0.125) -> list[Section]:
+        """
+        Split the sequence into sections of section_length and label each by
+        the first earlier section it matches, e.g. A A B B.
+
+        Sections match if they differ in at most tolerance of their playheads,
+        so repeats with second-time endings share a label. A shorter final
+        section is kept and compared over its own length.
+        """
+        sections: list[Section] = []
+        representatives: dict[str, int] = {}
+        exact: dict[tuple[int, int], tuple[str, int]] = {}
+        for start in range(0, len(self), section_length):
+            length = min(section_length, len(self) - start)
+            key = (length, int(self.window_hashes(length)[start]))
+            label = None
+            if key in exact:
+                # equal hashes are only a candidate, as hashes can collide
+                exact_label, first = exact[key]
+                if not self.mismatches(first, start, length):
+                    label = exact_label
+            label = label or self._matching_label(
+                representatives, start, length, int(tolerance * length)
+            )
+            if label is None:
+                label = _label(len(representatives))
+                representatives[label] = start
+            exact.setdefault(key, (label, start))
+            sections.append(Section(label, start, start + length - 1))
+        return sections
+
+    def _matching_label(
+        self, representatives: dict[str, int], start: int, length: int, limit: int
+    ) -> str | None:
+        for label, first in representatives.items():
+            if first + length <= len(self):
+                if self.mismatches(first, start, length) <= limit:
+                    return label
+        return None
+
+    def form(self, section_length: int, tolerance: float = 0.125) -> str:
+        """Return the form as a string of section labels, such as "AABB"."""
+        return "".join(s.label for s in self.sections(section_length, tolerance))
+
+    def periods(self, phrase_length: int) -> list[tuple[int, int]]:
+        """
+        Return the starts of adjacent phrases that open the same way, as
+        (antecedent, consequent) pairs.
+
+        Phrases open the same way if their first halves are equal.
+        """
+        opening = max(phrase_length // 2, 1)
+        hashes = self.window_hashes(opening)
+        periods = []
+        start = 0
+        while start + 2 * phrase_length <= len(self):
+            following = start + phrase_length
+            if hashes[start] == hashes[following] and not self.mismatches(
+                start, following, opening
+            ):
+                periods.append((start, following))
+                start += 2 * phrase_length
+            else:
+                start += phrase_length
+        return periods
+
+
+def _label(index: int) -> str:
+    """A, B, ..., Z, then A2, B2, ..."""
+    letter = ascii_uppercase[index % 26]
+    return letter if index < 26 else f"{letter}{index // 26 + 1}"
+
+
 class TuneStructure:
     """Represents the formal structure of a tune, with non-overlapping phrases
     of regular length."""
@@ -30,6 +296,8 @@ class TuneStructure:
         self.length: int = len(tune.notes)
         self.phrase_length: int = phrase_length_in_bars * 8
         self.phrases: list[PhraseSpan] = []
+        self._phrases_by_index: dict[int, PhraseSpan] = {}
+        self.analysis = RepeatAnalysis.from_tune(tune)
         self._analyze_form()
 
     def add_phrase(self, phrase_type: PhraseType, start: int, end: int) -> None:
@@ -42,11 +310,14 @@ class TuneStructure:
         if end - start + 1 != self.phrase_length:
             raise ValueError(f"Phrase length must be {self.phrase_length}")
 
-        expected_start = len(self.phrases) * self.phrase_length
-        if start != expected_start:
-            raise ValueError(f"Phrase must start at position {expected_start}")
+        if start % self.phrase_length:
+            raise ValueError(f"Phrase must start at a multiple of {self.phrase_length}")
+        if self.phrases and start <= self.phrases[-1].end:
+            raise ValueError(f"Phrase must start after {self.phrases[-1].end}")
 
-        self.phrases.append(PhraseSpan(phrase_type, start, end))
+        phrase = PhraseSpan(phrase_type, start, end)
+        self.phrases.append(phrase)
+        self._phrases_by_index[start // self.phrase_length] = phrase
 
     def get_phrase_type_at(self, position: int) -> PhraseType | None:
         """Get the phrase type at the given position."""
@@ -55,27 +326,26 @@ class TuneStructure:
                 f"Position {position} out of bounds for tune of length {self.length}"
             )
 
-        phrase_index = position // self.phrase_length
-        if phrase_index < len(self.phrases):
-            return self.phrases[phrase_index].phrase_type
-        return None
+        phrase = self._phrases_by_index.get(position // self.phrase_length)
+        return phrase.phrase_type if phrase is not None else None
+
+    def sections(self, tolerance: float = 0.125) -> list[Section]:
+        """Label the tune's parts, each two phrases long, e.g. A A B B."""
+        return self.analysis.sections(2 * self.phrase_length, tolerance)
+
+    def form(self, tolerance: float = 0.125) -> str:
+        return "".join(section.label for section in self.sections(tolerance))
 
     def _detect_periods(self) -> None:
-        """Detect periods in the tune."""
-        phrases = partition(self.tune.notes, part_size=self.phrase_length)
-        for i, current_phrase in enumerate(phrases[:-1]):
-            next_phrase = phrases[i + 1]
-            if current_phrase[:4] == next_phrase[:4]:
-                self.add_phrase(
-                    PhraseType.ANTECEDENT,
-                    i * self.phrase_length,
-                    (i + 1) * self.phrase_length - 1,
-                )
-                self.add_phrase(
-                    PhraseType.CONSEQUENT,
-                    (i + 1) * self.phrase_length,
-                    (i + 2) * self.phrase_length - 1,
-                )
+        """Detect periods, pairs of adjacent phrases whose first halves are
+        the same."""
+        for antecedent, consequent in self.analysis.periods(self.phrase_length):
+            self.add_phrase(PhraseType.ANTECEDENT, antecedent, consequent - 1)
+            self.add_phrase(
+                PhraseType.CONSEQUENT,
+                consequent,
+                consequent + self.phrase_length - 1,
+            )
 
     def _analyze_form(self) -> None:
         """Analyze the tune's form and populate phrases."""
@@ -1,8 +1,32 @@
+from collections import deque
+
+import numpy as np
+
 from .chord import Chord, ChordType, Major, Minor
-from .constants import Interval
+from .constants import Interval, PitchClass
+
+# the 24 major and minor triads: majors by root, then minors by root
+triads: tuple[Chord, ...] = tuple(Chord(root, Major) for root in PitchClass) + tuple(
+    Chord(root, Minor) for root in PitchClass
+)
+# keyed by mask, so any chord with the pitch classes of a triad is found
+triad_index: dict[int, int] = {chord.mask: i for i, chord in enumerate(triads)}
+
+
+def index_of(chord: Chord) -> int:
+    """Return the index of a major or minor triad in triads."""
+    try:
+        return triad_index[chord.mask]
+    except KeyError:
+        raise ValueError(f"{chord!r} is not a major or minor triad") from None
 
 
 class Transformation:
+    """
+    A transformation between two chord types, precomputed as a table of
+    triad indexes so that applying it is a lookup.
+    """
+
     def __init__(
         self,
         chord_type_a: ChordType,
@@ -12,8 +36,11 @@ class Transformation:
         self.chord_type_a = chord_type_a
         self.chord_type_b = chord_type_b
         self.transposition = transposition
+        self.table = np.arange(len(triads), dtype=np.int8)
+        for i, chord in enumerate(triads):
+            self.table[i] = index_of(self._transform(chord))
 
-    def __call__(self, chord: Chord) -> Chord:
+    def _transform(self, chord: Chord) -> Chord:
         if chord.chord_type == self.chord_type_a:
             return Chord(
                 root=chord.root + self.transposition, chord_type=self.chord_type_b
@@ -24,12 +51,80 @@ class Transformation:
             )
         return chord
 
+    def __call__(self, chord: Chord) -> Chord:
+        if (index := triad_index.get(chord.mask)) is None:
+            return chord
+        return triads[self.table[index]]
+
 
 P = Transformation(Major, Minor, Interval.PERFECT_FIRST)
-L = Transformation(Minor, Major, Interval.PERFECT_FOURTH)
-R = Transformation(Minor, Major, Interval.MAJOR_SIXTH)
+L = Transformation(Major, Minor, Interval.MAJOR_THIRD)
+R = Transformation(Major, Minor, Interval.MAJOR_SIXTH)
 plr_group: list[Transformation] = [P, L, R]
 
+# cayley[t, i] is the index of transformation t applied to triad i
+cayley = np.stack([transformation.table for transformation in plr_group])
+_letters = "PLR"
+
+
+def word_table(word: str) -> np.ndarray:
+    """
+    Compose a word such as "PLR" into a single table of triad indexes.
+
+    Letters are applied left to right, so "PL" is P followed by L.
+    """
+    table = np.arange(len(triads), dtype=np.int8)
+    for letter in word:
+        if letter not in _letters:
+            raise ValueError(f"Unknown transformation {letter!r} in {word!r}")
+        table = cayley[_letters.index(letter)][table]
+    return table
+
+
+def apply_word(word: str, chord: Chord) -> Chord:
+    return triads[word_table(word)[index_of(chord)]]
+
+
+def _distances() -> np.ndarray:
+    """Breadth-first search from every triad over the PLR graph."""
+    n = len(triads)
+    distance = np.full((n, n), -1, dtype=np.int8)
+    for source in range(n):
+        distance[source, source] = 0
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            for following in cayley[:, current].tolist():
+                if distance[source, following] < 0:
+                    distance[source, following] = distance[source, current] + 1
+                    queue.append(following)
+    return distance
+
+
+# distance[a, b] is the length of the shortest PLR word from triad a to b
+distance = _distances()
+# first_move[a, b] is the first transformation of a shortest word from a to
+# b, preferring P, then L, then R
+first_move = np.argmax(distance[cayley] == distance[np.newaxis] - 1, axis=0).astype(
+    np.int8
+)
+
+
+def tonnetz_distance(a: Chord, b: Chord) -> int:
+    """The number of P, L and R moves between two triads."""
+    return int(distance[index_of(a), index_of(b)])
+
+
+def shortest_word(a: Chord, b: Chord) -> str:
+    """Return a shortest PLR word taking triad a to triad b."""
+    current, target = index_of(a), index_of(b)
+    word = []
+    while current != target:
+        move = first_move[current, target]
+        word.append(_letters[move])
+        current = cayley[move, current]
+    return "".join(word)
+
 
 def alternate_subdominant(chord: Chord) -> Chord:
     if chord.is_major() and chord.is_triad():
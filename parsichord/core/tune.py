@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, Mapping
 
-from parsichord.core.chord import ChordVoicing, Pitch
-from parsichord.core.constants import PitchClass
+import numpy as np
+
+from parsichord.core.chord import Chord, ChordVoicing, Pitch
+from parsichord.core.constants import PitchClass, mode_to_intervals
 
 
 class Note(ABC):
@@ -35,10 +40,269 @@ class Key:
         self.tonic = tonic
         self.mode = mode
 
+    @property
+    def scale(self) -> list[PitchClass]:
+        """
+        The pitch classes of the mode, starting on the tonic.
+
+        Unrecognised modes are treated as major.
+        """
+        intervals = mode_to_intervals.get(
+            self.mode[:3].lower(), mode_to_intervals["maj"]
+        )
+        return [self.tonic + ivl for ivl in intervals]
+
+    def triad(self, degree: int) -> Chord:
+        """The diatonic triad built on a zero-based scale degree."""
+        scale = self.scale
+        chord = Chord.from_pitch_classes(
+            [scale[(degree + step) % len(scale)] for step in (0, 2, 4)]
+        )
+        if chord is None:
+            raise ValueError(f"No triad on degree {degree} of {scale}")
+        return chord
+
+
+class NoteArray:
+    """
+    Columnar store of a tune's notes.
+
+    Notes are held in parallel arrays of MIDI pitch, duration, onset playhead
+    and bar index, with bar_offsets giving the playhead each bar starts at
+    followed by the tune length. note_index and bar_index map every playhead
+    to the sounding note (-1 for none) and its bar, for O(1) lookups.
+    """
+
+    __slots__ = (
+        "pitch",
+        "duration",
+        "onset",
+        "bar",
+        "bar_offsets",
+        "note_index",
+        "bar_index",
+    )
+
+    def __init__(
+        self,
+        pitch: np.ndarray,
+        duration: np.ndarray,
+        onset: np.ndarray,
+        bar: np.ndarray,
+        bar_offsets: np.ndarray,
+    ) -> None:
+        self.pitch = pitch
+        self.duration = duration
+        self.onset = onset
+        self.bar = bar
+        self.bar_offsets = bar_offsets
+
+        length = int(bar_offsets[-1]) if len(bar_offsets) else 0
+        self.note_index = np.full(length, -1, dtype=np.int64)
+        ends = np.minimum(onset + np.maximum(duration.astype(np.int64), 1), length)
+        for i, (start, end) in enumerate(zip(onset, ends)):
+            self.note_index[start:end] = i
+        self.bar_index = np.repeat(
+            np.arange(max(len(bar_offsets) - 1, 0)), np.diff(bar_offsets)
+        )
+
+    @classmethod
+    def from_bars(cls, bars: list[list["Note | None"]]) -> "NoteArray":
+        pitch, duration, onset, bar = [], [], [], []
+        bar_offsets = [0]
+        for i, notes in enumerate(bars):
+            for j, note in enumerate(notes):
+                if note is None:
+                    continue
+                pitch.append(note.pitch.midi_value)
+                duration.append(note.duration)
+                onset.append(bar_offsets[-1] + j)
+                bar.append(i)
+            bar_offsets.append(bar_offsets[-1] + len(notes))
+        return cls(
+            np.array(pitch, dtype=np.int16),
+            np.array(duration, dtype=np.float64),
+            np.array(onset, dtype=np.int64),
+            np.array(bar, dtype=np.int32),
+            np.array(bar_offsets, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.pitch)
+
+    @property
+    def length(self) -> int:
+        """The number of playheads in the tune."""
+        return len(self.note_index)
+
+    @property
+    def pitch_class(self) -> np.ndarray:
+        return self.pitch % 12
+
+    def note_at(self, playhead: int) -> int | None:
+        """Return the index of the note sounding at playhead."""
+        index = int(self.note_index[playhead])
+        return None if index < 0 else index
+
+    def bar_at(self, playhead: int) -> int:
+        return int(self.bar_index[playhead])
+
+
+class ChordTrack:
+    """
+    The chords of a tune, each sounding from its playhead until the next.
+
+    Playheads are kept in a sorted array parallel to the voicings, so the
+    chord sounding at any playhead is a binary search and the chords of a
+    region are a contiguous slice.
+    """
+
+    __slots__ = ("_playheads", "_voicings")
+
+    def __init__(
+        self,
+        chords: Mapping[int, ChordVoicing] | Iterable[tuple[int, ChordVoicing]] = (),
+    ) -> None:
+        items = sorted(dict(chords).items(), key=lambda item: item[0])
+        self._playheads = [playhead for playhead, _ in items]
+        self._voicings = [voicing for _, voicing in items]
+
+    def __len__(self) -> int:
+        return len(self._playheads)
+
+    def __iter__(self) -> Iterator[tuple[int, ChordVoicing]]:
+        return zip(self._playheads, self._voicings)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)})"
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, ChordTrack)
+            and self._playheads == other._playheads
+            and self._voicings == other._voicings
+        )
+
+    def __contains__(self, playhead: object) -> bool:
+        return isinstance(playhead, int) and self._index(playhead) is not None
+
+    def __getitem__(self, playhead: int) -> ChordVoicing:
+        """Return the chord starting at playhead."""
+        index = self._index(playhead)
+        if index is None:
+            raise KeyError(playhead)
+        return self._voicings[index]
+
+    def __setitem__(self, playhead: int, chord_voicing: ChordVoicing) -> None:
+        index = bisect_left(self._playheads, playhead)
+        if index < len(self) and self._playheads[index] == playhead:
+            self._voicings[index] = chord_voicing
+        else:
+            self._playheads.insert(index, playhead)
+            self._voicings.insert(index, chord_voicing)
+
+    def _index(self, playhead: int) -> int | None:
+        index = bisect_left(self._playheads, playhead)
+        if index < len(self) and self._playheads[index] == playhead:
+            return index
+        return None
+
+    @property
+    def playheads(self) -> list[int]:
+        return list(self._playheads)
+
+    def items(self) -> list[tuple[int, ChordVoicing]]:
+        return list(self)
+
+    def get(self, playhead: int) -> ChordVoicing | None:
+        """Return the chord starting at playhead, if there is one."""
+        index = self._index(playhead)
+        return None if index is None else self._voicings[index]
+
+    def at(self, playhead: int) -> ChordVoicing | None:
+        """Return the chord sounding at playhead, the last to start at or
+        before it."""
+        index = bisect_right(self._playheads, playhead) - 1
+        return self._voicings[index] if index >= 0 else None
+
+    def pop(self, playhead: int) -> ChordVoicing | None:
+        """Remove and return the chord starting at playhead, if there is
+        one."""
+        index = self._index(playhead)
+        if index is None:
+            return None
+        del self._playheads[index]
+        return self._voicings.pop(index)
+
+    def clear(self) -> None:
+        self._playheads.clear()
+        self._voicings.clear()
+
+    def _bounds(self, start: int, stop: int | None) -> tuple[int, int]:
+        end = len(self) if stop is None else bisect_left(self._playheads, stop)
+        return bisect_left(self._playheads, start), end
+
+    def slice(self, start: int, stop: int | None = None) -> "ChordTrack":
+        """Return the chords starting from start up to stop."""
+        i, j = self._bounds(start, stop)
+        track = ChordTrack()
+        track._playheads = self._playheads[i:j]
+        track._voicings = self._voicings[i:j]
+        return track
+
+    def replace(
+        self,
+        start: int,
+        stop: int | None,
+        chords: Mapping[int, ChordVoicing] | Iterable[tuple[int, ChordVoicing]],
+    ) -> None:
+        """Replace the chords starting from start up to stop with chords, which
+        must start within the same region."""
+        region = ChordTrack(chords)
+        if region._playheads and not (
+            start <= region._playheads[0]
+            and (stop is None or region._playheads[-1] < stop)
+        ):
+            raise ValueError(f"Chords must start within {start} to {stop}")
+        i, j = self._bounds(start, stop)
+        self._playheads[i:j] = region._playheads
+        self._voicings[i:j] = region._voicings
+
+    def __getstate__(self) -> tuple:
+        # each distinct voicing is stored once, as its chord and MIDI pitches
+        table: dict[ChordVoicing, int] = {}
+        voicings: list[tuple[Chord, array]] = []
+        for voicing in self._voicings:
+            if voicing not in table:
+                table[voicing] = len(voicings)
+                pitches = array("B", sorted(p.midi_value for p in voicing.pitches))
+                voicings.append((voicing.chord, pitches))
+        indexes = [table[voicing] for voicing in self._voicings]
+        gaps = np.diff(self._playheads, prepend=0).tolist()
+        return _packed(gaps), voicings, _packed(indexes)
+
+    def __setstate__(self, state: tuple) -> None:
+        gaps, voicings, indexes = state
+        table = [
+            ChordVoicing(chord, [Pitch(midi - 48) for midi in pitches])
+            for chord, pitches in voicings
+        ]
+        self._playheads = np.cumsum(gaps, dtype=np.int64).tolist()
+        self._voicings = [table[index] for index in indexes]
+
+
+def _packed(values: list[int]) -> array:
+    """Pack non-negative integers into the unsigned array with the smallest
+    item size that holds them."""
+    high = max(values, default=0)
+    typecode = next(t for t in "BHIQ" if high < 1 << 8 * array(t).itemsize)
+    return array(typecode, values)
+
 
 class Tune(ABC):
     def __init__(self) -> None:
-        self._chords: dict[int, ChordVoicing] = dict()
+        self.chords = ChordTrack()
+        self._note_array: NoteArray | None = None
 
     @property
     @abstractmethod
@@ -55,8 +319,25 @@ class Tune(ABC):
     def key(self) -> Key:
         ...
 
+    @property
+    def meter(self) -> str | None:
+        """The time signature, e.g. "6/8", if known."""
+        return None
+
+    @property
+    def note_array(self) -> NoteArray:
+        """Columnar view of notes, built from bars on first access."""
+        if self._note_array is None:
+            self._note_array = NoteArray.from_bars(self.bars)
+        return self._note_array
+
     def get_chord(self, playhead: int) -> ChordVoicing | None:
-        return self._chords.get(playhead, None)
+        """Return the chord starting at playhead, if there is one."""
+        return self.chords.get(playhead)
+
+    def chord_at(self, playhead: int) -> ChordVoicing | None:
+        """Return the chord sounding at playhead."""
+        return self.chords.at(playhead)
 
     def set_chord(self, playhead: int, chord: ChordVoicing) -> None:
-        self._chords[playhead] = chord
+        self.chords[playhead] = chord
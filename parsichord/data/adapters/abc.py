@@ -0,0 +1,418 @@
+import re
+from fractions import Fraction
+from typing import Iterator, NamedTuple
+
+import numpy as np
+
+from parsichord.core.chord import Pitch
+from parsichord.core.constants import PitchClass
+from parsichord.core.tune import Key, Note, NoteArray, Tune
+from parsichord.data.thesession import TuneData
+
+DEFAULT_UNIT_LENGTH = Fraction(1, 8)
+
+_letter_values = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+_accidental_values = {"^": 1, "^^": 2, "_": -1, "__": -2, "=": 0}
+# notes in the time of which p notes are played, for the tuplet (p
+_tuplet_q = {2: 3, 3: 2, 4: 3, 6: 2, 8: 3}
+
+_pitch_pattern = re.compile(r"(\^{1,2}|_{1,2}|=)?([A-Ga-g])([',]*)")
+_length_pattern = re.compile(r"(\d*)(/*)(\d*)")
+_key_pattern = re.compile(r"\s*([A-Ga-g])([#b]?)\s*([A-Za-z]*)")
+_token_pattern = re.compile(
+    r"""
+      (?P<chord_symbol>"[^"]*")
+    | (?P<field>\[[A-Za-z]:[^\]\n]*\]|^[A-Za-z]:[^\n]*$)
+    | (?P<decoration>![^!\n]*!|\+[^+\n]*\+|[~.HLMOPSTuv])
+    | (?P<grace>\{[^}]*\})
+    | (?P<bar>:*\[?\|+\]?:*\d*(?:[,-]\d+)*|:{2,}|\[\d+)
+    | (?P<tuplet>\((?P<tuplet_p>\d+)(?::\d*)*)
+    | (?P<note>
+        (?P<accidental>\^{1,2}|_{1,2}|=)?
+        (?P<letter>[A-Ga-gzx])
+        (?P<octave>[',]*)
+        (?P<length>\d*/*\d*)
+      )
+    | (?P<broken>[<>]+)
+    | (?P<chord_open>\[)
+    | (?P<chord_close>\])
+    | (?P<other>\s+|.)
+    """,
+    re.VERBOSE | re.MULTILINE,
+)
+
+
+# the alteration carried to the end of the bar for each note letter and
+# natural pitch value, as set by explicit accidentals
+Accidentals = dict[tuple[str, int], int]
+
+
+class ABCToken(NamedTuple):
+    """
+    A lexeme of the ABC body.
+
+    Notes and rests carry their playhead, which ABCTune counts from the first
+    full bar so that anacrusis notes have negative playheads.
+    """
+
+    kind: str
+    text: str
+    playhead: int | None = None
+
+
+class ABCNote(Note):
+    __slots__ = ("_pitch", "_duration")
+
+    def __init__(self, pitch: Pitch, duration: float):
+        self._pitch = pitch
+        self._duration = duration
+
+    @property
+    def pitch(self) -> Pitch:
+        return self._pitch
+
+    @property
+    def duration(self) -> float:
+        return self._duration
+
+
+def parse_key(mode: str) -> tuple[Key, dict[str, int]]:
+    """
+    Parse a key such as "Dmajor", "Ador" or "F#m" into a Key and the
+    accidental of each natural note letter in its key signature.
+    """
+    match = _key_pattern.match(mode)
+    if match is None:
+        return Key(PitchClass.C, "major"), {}
+    letter, accidental, mode_name = match.groups()
+    tonic = PitchClass(
+        (_letter_values[letter.upper()] + {"#": 1, "b": -1, "": 0}[accidental]) % 12
+    )
+    mode_name = mode_name.lower() or "major"
+    if mode_name == "m":
+        mode_name = "minor"
+    key = Key(tonic, mode_name)
+
+    signature = {}
+    scale = key.scale
+    letters = "CDEFGAB"
+    start = letters.index(letter.upper())
+    for degree, pitch_class in enumerate(scale):
+        natural = letters[(start + degree) % 7]
+        alteration = (pitch_class.value - _letter_values[natural] + 6) % 12 - 6
+        if alteration:
+            signature[natural] = alteration
+    return key, signature
+
+
+def pitch_value(
+    accidental: str | None,
+    letter: str,
+    octave: str,
+    signature: dict[str, int],
+    accidentals: Accidentals,
+) -> int:
+    """
+    Return the absolute pitch value of an ABC note, recording an explicit
+    accidental in accidentals so that it carries to later notes.
+
+    An unmarked note takes the accidental carried in the bar, or else the
+    key signature's.
+    """
+    natural = (
+        letter.upper(),
+        _letter_values[letter.upper()]
+        + 12 * (letter.islower() + octave.count("'") - octave.count(",")),
+    )
+    if accidental is not None:
+        accidentals[natural] = _accidental_values[accidental]
+    return natural[1] + accidentals.get(natural, signature.get(natural[0], 0))
+
+
+def read_pitch(text: str, signature: dict[str, int], accidentals: Accidentals) -> int:
+    """Return the absolute pitch value of an ABC note such as "^F,", as
+    pitch_value."""
+    match = _pitch_pattern.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Invalid ABC pitch {text!r}")
+    accidental, letter, octave = match.groups()
+    return pitch_value(accidental, letter, octave, signature, accidentals)
+
+
+def spell_pitch(
+    pitch: Pitch, signature: dict[str, int], accidentals: Accidentals | None = None
+) -> str:
+    """
+    Write a pitch as an ABC note in a key signature, e.g. F in D major is
+    "=F".
+
+    Notes that read correctly unmarked, against the key signature and any
+    accidentals carried in the bar, are written without accidentals, so
+    that no explicit accidental carries over to later notes in the bar.
+    """
+    accidental, letter, natural_value = next(
+        _spellings(pitch.abs_value, signature, accidentals or {})
+    )
+    octave = (natural_value - _letter_values[letter]) // 12
+    if octave > 0:
+        return accidental + letter.lower() + "'" * (octave - 1)
+    return accidental + letter + "," * -octave
+
+
+def _spellings(
+    value: int, signature: dict[str, int], accidentals: Accidentals
+) -> Iterator[tuple[str, str, int]]:
+    # unmarked spellings first, then naturals, sharps and flats
+    for accidental in ("", "=", "^", "_"):
+        for letter, natural in _letter_values.items():
+            if accidental:
+                alterations = [_accidental_values[accidental]]
+            else:
+                alterations = [-2, -1, 0, 1, 2]
+            for alteration in alterations:
+                natural_value = value - alteration
+                if (natural_value - natural) % 12:
+                    continue
+                reading = accidentals.get(
+                    (letter, natural_value), signature.get(letter, 0)
+                )
+                if accidental == "" and reading != alteration:
+                    continue
+                if accidental == "=" and reading == 0:
+                    continue
+                yield accidental, letter, natural_value
+
+
+def parse_length(text: str) -> Fraction:
+    """Parse an ABC note length multiplier such as "2", "/", "//" or "3/2"."""
+    if not text:
+        return Fraction(1)
+    match = _length_pattern.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Invalid note length {text!r}")
+    numerator, slashes, denominator = match.groups()
+    length = Fraction(int(numerator or 1))
+    if slashes:
+        length /= int(denominator) if denominator else 2 ** len(slashes)
+    return length
+
+
+class ABCParser:
+    """
+    Single-pass parser for the subset of ABC used on thesession.org.
+
+    Notes, accidentals, octaves, lengths, broken rhythms, tuplets, bar lines,
+    repeats and chord symbols are read straight into arrays, with pitches
+    resolved once against the key signature and accidentals carried to the
+    end of the bar. Grace notes and decorations are skipped, and only the
+    first note of a [chord] is kept as melody.
+
+    Lengths are scaled from the unit note length set by L: fields to
+    eighth notes, the default unit of thesession.org settings. Playheads
+    follow PyABCTuneAdapter: every note or rest takes max(1, int(length))
+    slots, where length is in eighth notes.
+    """
+
+    def __init__(self, tune_data: TuneData) -> None:
+        self.key, self.signature = parse_key(tune_data["mode"])
+        self.unit = DEFAULT_UNIT_LENGTH
+        self.tokens: list[ABCToken] = []
+        self.chord_symbols: dict[int, str] = {}
+
+        self._pitch: list[int] = []
+        self._duration: list[float] = []
+        self._onset: list[int] = []
+        self._bar_lines: list[int] = []
+        self._bar_accidentals: Accidentals = {}
+        self._playhead = 0
+        self._in_chord = False
+        self._chord_has_note = False
+        self._broken: Fraction | None = None
+        self._last_length = Fraction(1)
+        self._tuplet: tuple[int, Fraction] | None = None
+        self._parse(tune_data["abc"])
+
+    def _parse(self, abc: str) -> None:
+        for match in _token_pattern.finditer(abc):
+            kind = match.lastgroup or "other"
+            text = match.group()
+            playhead = None
+            if kind == "note":
+                playhead = self._note(match)
+            elif kind == "field":
+                self._field(text.strip("[]"))
+            elif kind == "bar":
+                self._bar_lines.append(self._playhead)
+                self._bar_accidentals.clear()
+            elif kind == "chord_symbol":
+                self.chord_symbols[self._playhead] = text[1:-1]
+            elif kind == "tuplet":
+                p = int(match.group("tuplet_p"))
+                self._tuplet = (p, Fraction(_tuplet_q.get(p, 2), p))
+            elif kind == "broken":
+                self._broken_rhythm(text)
+            elif kind == "chord_open":
+                self._in_chord, self._chord_has_note = True, False
+            elif kind == "chord_close":
+                self._in_chord = False
+            self.tokens.append(ABCToken(kind, text, playhead))
+        self._bar_lines.append(self._playhead)
+
+    def _field(self, field: str) -> None:
+        name, _, value = field.partition(":")
+        if name == "K":
+            # the tune keeps its header key, inline changes only respell notes
+            _, self.signature = parse_key(value)
+        elif name == "L":
+            self.unit = Fraction(value.strip())
+
+    def _note(self, match: re.Match[str]) -> int | None:
+        letter = match.group("letter")
+        pitch = None
+        if letter not in "zx":
+            # accidentals carry from every note of a [chord], melody or not
+            pitch = pitch_value(
+                match.group("accidental"),
+                letter,
+                match.group("octave"),
+                self.signature,
+                self._bar_accidentals,
+            )
+        if self._in_chord:
+            if self._chord_has_note:
+                return None
+            self._chord_has_note = True
+
+        length = parse_length(match.group("length")) * (self.unit / DEFAULT_UNIT_LENGTH)
+        if self._broken is not None:
+            length *= self._broken
+            self._broken = None
+        if self._tuplet is not None:
+            remaining, ratio = self._tuplet
+            length *= ratio
+            self._tuplet = (remaining - 1, ratio) if remaining > 1 else None
+
+        playhead = self._playhead
+        self._playhead += max(1, int(length))
+        if pitch is None:
+            return playhead
+
+        self._pitch.append(pitch + 48)
+        self._duration.append(float(length))
+        self._onset.append(playhead)
+        self._last_length = length
+        return playhead
+
+    def _broken_rhythm(self, text: str) -> None:
+        # the previous note is lengthened and the next shortened by the same
+        # amount, or the reverse for <
+        if not self._duration:
+            return
+        dotted = Fraction(1, 2 ** len(text))
+        previous, following = (
+            (2 - dotted, dotted) if text[0] == ">" else (dotted, 2 - dotted)
+        )
+        self._duration[-1] = float(self._last_length * previous)
+        self._broken = following
+
+    def note_array(self) -> NoteArray:
+        onset = np.array(self._onset, dtype=np.int64)
+        bar_offsets = np.unique(np.array([0, *self._bar_lines], dtype=np.int64))
+        bar = np.searchsorted(bar_offsets, onset, side="right") - 1
+        return NoteArray(
+            np.array(self._pitch, dtype=np.int16),
+            np.array(self._duration, dtype=np.float64),
+            onset,
+            bar.astype(np.int32),
+            bar_offsets,
+        )
+
+
+class ABCTune(Tune):
+    """
+    Tune parsed by the fast-path ABCParser.
+
+    The note array is built at parse time and notes and bars are derived
+    from it, so no per-note objects are created unless they are asked for.
+    """
+
+    def __init__(self, tune_data: TuneData):
+        super().__init__()
+        self.tune_data = tune_data
+        parser = ABCParser(tune_data)
+        self._key = parser.key
+
+        note_array = parser.note_array()
+        self._anacrusis_length = 0
+        offsets = note_array.bar_offsets
+        if len(offsets) > 2 and offsets[1] - offsets[0] < offsets[2] - offsets[1]:
+            self._anacrusis_length = int(offsets[1])
+        self._full_note_array = note_array
+        self._note_array = self._drop_anacrusis(note_array)
+        self.tokens = [
+            token
+            if token.playhead is None
+            else token._replace(playhead=token.playhead - self._anacrusis_length)
+            for token in parser.tokens
+        ]
+        self.chord_symbols = {
+            playhead - self._anacrusis_length: symbol
+            for playhead, symbol in parser.chord_symbols.items()
+            if playhead >= self._anacrusis_length
+        }
+        self._notes: list[Note | None] | None = None
+
+    def _drop_anacrusis(self, note_array: NoteArray) -> NoteArray:
+        if not self._anacrusis_length:
+            return note_array
+        keep = note_array.onset >= self._anacrusis_length
+        return NoteArray(
+            note_array.pitch[keep],
+            note_array.duration[keep],
+            note_array.onset[keep] - self._anacrusis_length,
+            note_array.bar[keep] - 1,
+            note_array.bar_offsets[1:] - self._anacrusis_length,
+        )
+
+    @property
+    def key(self) -> Key:
+        return self._key
+
+    @property
+    def meter(self) -> str:
+        return self.tune_data["meter"]
+
+    @property
+    def note_array(self) -> NoteArray:
+        assert self._note_array is not None
+        return self._note_array
+
+    @property
+    def notes(self) -> list[Note | None]:
+        if self._notes is None:
+            self._notes = self._slots(self.note_array)
+        return self._notes
+
+    @property
+    def bars(self) -> list[list[Note | None]]:
+        notes = self.notes
+        offsets = self.note_array.bar_offsets
+        return [notes[start:end] for start, end in zip(offsets, offsets[1:])]
+
+    @property
+    def anacrusis(self) -> list[Note | None] | None:
+        """Returns the anacrusis bar if it exists, otherwise None."""
+        if not self._anacrusis_length:
+            return None
+        return self._slots(self._full_note_array)[: self._anacrusis_length]
+
+    @staticmethod
+    def _slots(note_array: NoteArray) -> list[Note | None]:
+        notes: list[Note | None] = [None] * note_array.length
+        for pitch, duration, onset in zip(
+            note_array.pitch.tolist(),
+            note_array.duration.tolist(),
+            note_array.onset.tolist(),
+        ):
+            notes[onset] = ABCNote(Pitch(pitch - 48), duration)
+        return notes
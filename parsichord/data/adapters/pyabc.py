@@ -10,7 +10,8 @@ from pyabc import (
 
 from parsichord.core.chord import ChordVoicing, Pitch
 from parsichord.core.constants import PitchClass
-from parsichord.core.tune import Key, Note, Tune
+from parsichord.core.tune import Key, Note, NoteArray, Tune
+from parsichord.data.adapters.abc import ABCToken
 from parsichord.data.thesession import TuneData
 
 
@@ -51,8 +52,11 @@ class PyABCNoteAdapter(Note):
 class PyABCTuneAdapter(Tune):
     def __init__(self, tune_data: TuneData):
         super().__init__()
+        self._meter = tune_data["meter"]
         self._tune = self._load_pyabc_tune(tune_data)
         self._bars, self._anacrusis = self._parse_bars()
+        self._notes = [note for bar in self._bars for note in bar]
+        self._note_array = NoteArray.from_bars(self._bars)
 
     def _load_pyabc_tune(self, tune_data: TuneData) -> PyABCTune:
         return PyABCTune(json=tune_data)
@@ -62,9 +66,13 @@ class PyABCTuneAdapter(Tune):
         pyabc_key = PyABCKey(self._tune.header["key"])
         return Key(PitchClass(pyabc_key.root.value), pyabc_key.mode)
 
+    @property
+    def meter(self) -> str:
+        return self._meter
+
     @property
     def notes(self) -> list[Note | None]:
-        return [note for bar in self.bars for note in bar]
+        return self._notes
 
     def _parse_bars(self) -> tuple[list[list[Note | None]], list[Note | None] | None]:
         """Parse the tune tokens into bars using beams as bar delimiters."""
@@ -93,6 +101,21 @@ class PyABCTuneAdapter(Tune):
 
         return all_bars, None
 
+    @property
+    def tokens(self) -> list[ABCToken]:
+        """The body tokens, with notes at the playheads used by notes."""
+        playhead = -len(self._anacrusis or [])
+        tokens = []
+        for token in self._tune.tokens:
+            if isinstance(token, PyABCNote):
+                tokens.append(ABCToken("note", token._text, playhead))
+                playhead += max(int(token.duration), 1)
+            elif isinstance(token, ChordSymbol):
+                tokens.append(ABCToken("chord_symbol", token._text))
+            else:
+                tokens.append(ABCToken("other", token._text))
+        return tokens
+
     @property
     def anacrusis(self) -> list[Note | None] | None:
         """Returns the anacrusis bar if it exists, otherwise None."""
@@ -0,0 +1,186 @@
+import csv
+import json
+import re
+import sqlite3
+from contextlib import closing
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterator, TextIO, cast
+
+from parsichord.data.thesession import TuneData
+
+CHUNK_SIZE = 1 << 16
+
+_tonic_pattern = re.compile(r"[A-G][b#]?")
+
+
+class DumpRecord(TuneData):
+    """A setting from the data dump, with its tune type."""
+
+    type: str
+
+
+def _skip_separators(
+    stream: TextIO, buffer: str, position: int, chunk_size: int
+) -> tuple[str, int]:
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position < len(buffer):
+            return buffer, position
+        if not (chunk := stream.read(chunk_size)):
+            raise ValueError("Unexpected end of JSON array")
+        buffer, position = chunk, 0
+
+
+def iter_json_array(stream: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the objects in a top-level JSON array one at a time.
+
+    The stream is read in chunks and only the object being decoded is held in
+    memory, so arbitrarily large arrays can be streamed from disk.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position = _skip_separators(stream, "", 0, chunk_size)
+    if buffer[position] != "[":
+        raise ValueError("Expected a JSON array")
+    position += 1
+
+    while True:
+        buffer, position = _skip_separators(stream, buffer, position, chunk_size)
+        if buffer[position] == "]":
+            return
+        try:
+            element, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # the object runs past the end of the buffer
+            if not (chunk := stream.read(chunk_size)):
+                raise
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield element
+
+
+def _to_record(row: dict[str, Any]) -> DumpRecord:
+    return {
+        "tune": int(row["tune_id"]),
+        "setting": int(row["setting_id"]),
+        "name": row["name"],
+        "type": row["type"],
+        "meter": row["meter"],
+        "mode": row["mode"],
+        "abc": row["abc"],
+    }
+
+
+def iter_dump(path: str | Path) -> Iterator[DumpRecord]:
+    """Stream the settings in thesession.org's tunes.json or tunes.csv
+    export."""
+    path = Path(path)
+    with open(path, newline="", encoding="utf-8") as stream:
+        if path.suffix == ".csv":
+            rows: Iterator[dict[str, Any]] = csv.DictReader(stream)
+        else:
+            rows = iter_json_array(stream)
+        for row in rows:
+            yield _to_record(row)
+
+
+def tonic_of(mode: str) -> str:
+    """Return the tonic of a thesession mode such as "Ebdorian"."""
+    match = _tonic_pattern.match(mode)
+    return match.group() if match else ""
+
+
+class TuneCorpus:
+    """
+    Local SQLite index of a thesession.org data dump.
+
+    Settings are indexed by tune id, setting id, type, meter, mode and tonic,
+    so subsets such as all reels in D can be selected without rescanning the
+    dump.
+    """
+
+    columns = ("setting", "tune", "name", "type", "meter", "mode", "tonic", "abc")
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS settings ("
+                "setting INTEGER PRIMARY KEY, tune INTEGER NOT NULL, "
+                "name TEXT, type TEXT, meter TEXT, mode TEXT, tonic TEXT, abc TEXT)"
+            )
+            for column in ("tune", "type", "meter", "mode", "tonic"):
+                connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS settings_{column} "
+                    f"ON settings ({column})"
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path)
+
+    @classmethod
+    def build(
+        cls, dump_path: str | Path, path: str | Path, batch_size: int = 1000
+    ) -> "TuneCorpus":
+        """Stream a data dump into the index at path."""
+        corpus = cls(path)
+        corpus.add(iter_dump(dump_path), batch_size)
+        return corpus
+
+    def add(self, records: Iterator[DumpRecord], batch_size: int = 1000) -> None:
+        placeholders = ", ".join("?" * len(self.columns))
+        with closing(self._connect()) as connection:
+            while batch := list(islice(records, batch_size)):
+                with connection:
+                    connection.executemany(
+                        f"INSERT OR REPLACE INTO settings VALUES ({placeholders})",
+                        (
+                            (
+                                record["setting"],
+                                record["tune"],
+                                record["name"],
+                                record["type"],
+                                record["meter"],
+                                record["mode"],
+                                tonic_of(record["mode"]),
+                                record["abc"],
+                            )
+                            for record in batch
+                        ),
+                    )
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM settings").fetchone()[0]
+
+    def select(
+        self,
+        tune: int | None = None,
+        setting: int | None = None,
+        tune_type: str | None = None,
+        meter: str | None = None,
+        mode: str | None = None,
+        tonic: str | None = None,
+    ) -> Iterator[DumpRecord]:
+        """Yield the settings matching every filter given, in setting order."""
+        filters = {
+            "tune": tune,
+            "setting": setting,
+            "type": tune_type,
+            "meter": meter,
+            "mode": mode,
+            "tonic": tonic,
+        }
+        filters = {column: v for column, v in filters.items() if v is not None}
+        where = " AND ".join(f"{column} = ?" for column in filters) or "1"
+        with closing(self._connect()) as connection:
+            connection.row_factory = sqlite3.Row
+            rows = connection.execute(
+                "SELECT tune, setting, name, type, meter, mode, abc FROM settings "
+                f"WHERE {where} ORDER BY setting",
+                list(filters.values()),
+            )
+            for row in rows:
+                yield cast(DumpRecord, dict(row))
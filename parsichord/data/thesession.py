@@ -1,10 +1,35 @@
-from typing import TypedDict
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Iterable, TypedDict
 
 import requests
+from requests.adapters import HTTPAdapter
+
+THESESSION_URL = "https://thesession.org"
+CACHE_DIR_ENV = "PARSICHORD_CACHE_DIR"
+OFFLINE_ENV = "PARSICHORD_OFFLINE"
+DEFAULT_TTL = 30 * 24 * 60 * 60
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
 tune_type_to_meter = {
     "jig": "6/8",
     "reel": "4/4",
+    "slip jig": "9/8",
+    "hornpipe": "4/4",
+    "polka": "2/4",
+    "slide": "12/8",
+    "waltz": "3/4",
+    "barndance": "4/4",
+    "strathspey": "4/4",
+    "three-two": "3/2",
+    "mazurka": "3/4",
+    "march": "2/4",
 }
 
 
@@ -17,11 +42,253 @@ class TuneData(TypedDict):
     abc: str
 
 
-def get_session_tune_data(tune_id: int, version: int = 0) -> TuneData:
-    response = requests.get(f"https://thesession.org/tunes/{tune_id}?format=json")
+class TuneNotCached(LookupError):
+    pass
+
+
+class BulkFetchError(Exception):
+    """
+    Raised after a bulk fetch in which some tunes failed.
+
+    results holds the tunes that were fetched and errors the exception raised
+    for each tune that was not.
+    """
+
+    def __init__(self, results: dict[int, Any], errors: dict[int, Exception]):
+        super().__init__(f"Failed to fetch tunes {sorted(errors)}")
+        self.results = results
+        self.errors = errors
+
+
+class RateLimiter:
+    """Space calls to wait() at least 1 / rate seconds apart across threads."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next, now)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class TuneCache:
+    """
+    Persistent SQLite cache of raw thesession.org tune JSON, keyed by tune id.
+
+    Entries older than ttl seconds are treated as missing unless stale entries
+    are explicitly allowed. A ttl of None never expires entries.
+    """
+
+    def __init__(
+        self, directory: str | Path | None = None, ttl: float | None = DEFAULT_TTL
+    ) -> None:
+        directory = Path(directory or default_cache_dir())
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / "thesession.sqlite3"
+        self.ttl = ttl
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS tunes ("
+                "tune_id INTEGER PRIMARY KEY, fetched_at REAL NOT NULL, "
+                "json TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, tune_id: int, allow_stale: bool = False) -> dict[str, Any] | None:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT fetched_at, json FROM tunes WHERE tune_id = ?", (tune_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        fetched_at, tune_json = row
+        if not allow_stale and self.ttl is not None:
+            if time.time() - fetched_at >= self.ttl:
+                return None
+        return json.loads(tune_json)
+
+    def put(self, tune_id: int, tune_json: dict[str, Any]) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO tunes VALUES (?, ?, ?)",
+                (tune_id, time.time(), json.dumps(tune_json)),
+            )
+
+    def __contains__(self, tune_id: int) -> bool:
+        return self.get(tune_id, allow_stale=True) is not None
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get(CACHE_DIR_ENV) or Path.home() / ".cache" / "parsichord")
+
+
+_default_cache: TuneCache | None = None
+
+
+def default_tune_cache() -> TuneCache:
+    """Return the shared cache in PARSICHORD_CACHE_DIR, creating it on first
+    use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TuneCache()
+    return _default_cache
+
+
+def is_offline() -> bool:
+    return os.environ.get(OFFLINE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def fetch_tune_json(
+    tune_id: int,
+    cache: TuneCache | None = None,
+    offline: bool | None = None,
+    base_url: str = THESESSION_URL,
+    session: requests.Session | None = None,
+) -> dict[str, Any]:
+    """
+    Return the raw JSON for a tune, from the cache when possible.
+
+    In offline mode (by default set by PARSICHORD_OFFLINE) the network is
+    never used: stale cache entries are returned and TuneNotCached is raised
+    for tunes that were never fetched.
+    """
+    if cache is None:
+        cache = default_tune_cache()
+    offline = is_offline() if offline is None else offline
+
+    tune_json = cache.get(tune_id, allow_stale=offline)
+    if tune_json is not None:
+        return tune_json
+    if offline:
+        raise TuneNotCached(f"Tune {tune_id} is not in {cache.path}")
+
+    if session is None:
+        with requests.Session() as session:
+            tune_json = _download(tune_id, session, base_url)
+    else:
+        tune_json = _download(tune_id, session, base_url)
+    cache.put(tune_id, tune_json)
+    return tune_json
+
+
+def _download(
+    tune_id: int,
+    session: requests.Session,
+    base_url: str,
+    rate_limiter: RateLimiter | None = None,
+    retries: int = 3,
+    backoff: float = 1.0,
+) -> dict[str, Any]:
+    """GET a tune, retrying connection errors and throttled or failed responses
+    with exponential backoff."""
+    url = f"{base_url}/tunes/{tune_id}?format=json"
+    for attempt in range(retries):
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        delay = backoff * 2**attempt
+        try:
+            response = session.get(url, timeout=30)
+        except (requests.ConnectionError, requests.Timeout):
+            pass
+        else:
+            if response.status_code not in RETRY_STATUS_CODES:
+                response.raise_for_status()
+                return response.json()
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+        time.sleep(delay)
+
+    if rate_limiter is not None:
+        rate_limiter.wait()
+    response = session.get(url, timeout=30)
     response.raise_for_status()
-    tune_json = response.json()
+    return response.json()
+
+
+def create_session(pool_size: int = 10) -> requests.Session:
+    """Return a session keeping up to pool_size connections alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
+def fetch_tunes_json(
+    tune_ids: Iterable[int],
+    cache: TuneCache | None = None,
+    offline: bool | None = None,
+    base_url: str = THESESSION_URL,
+    max_workers: int = 4,
+    rate: float = 2.0,
+    retries: int = 3,
+    backoff: float = 1.0,
+) -> dict[int, dict[str, Any]]:
+    """
+    Return the raw JSON of many tunes, keyed by tune id.
+
+    Cached tunes are served from the cache. The rest are downloaded by up to
+    max_workers threads sharing a pooled session, with requests across all
+    threads limited to rate per second and retried with exponential backoff.
+    If any tune fails, BulkFetchError is raised once every tune has been
+    tried, carrying the partial results.
+    """
+    if cache is None:
+        cache = default_tune_cache()
+    offline = is_offline() if offline is None else offline
+
+    results: dict[int, dict[str, Any]] = {}
+    errors: dict[int, Exception] = {}
+    missing = []
+    for tune_id in dict.fromkeys(tune_ids):
+        tune_json = cache.get(tune_id, allow_stale=offline)
+        if tune_json is not None:
+            results[tune_id] = tune_json
+        elif offline:
+            errors[tune_id] = TuneNotCached(f"Tune {tune_id} is not in {cache.path}")
+        else:
+            missing.append(tune_id)
+
+    if missing:
+        rate_limiter = RateLimiter(rate)
+        with create_session(max_workers) as session, ThreadPoolExecutor(
+            max_workers
+        ) as executor:
+            futures = {
+                tune_id: executor.submit(
+                    _download,
+                    tune_id,
+                    session,
+                    base_url,
+                    rate_limiter,
+                    retries,
+                    backoff,
+                )
+                for tune_id in missing
+            }
+            for tune_id, future in futures.items():
+                try:
+                    results[tune_id] = future.result()
+                except Exception as exc:
+                    errors[tune_id] = exc
+                else:
+                    cache.put(tune_id, results[tune_id])
+
+    if errors:
+        raise BulkFetchError(results, errors)
+    return results
+
+
+def tune_data_from_json(tune_json: dict[str, Any], version: int = 0) -> TuneData:
     name = tune_json["name"]
     ref_number = tune_json["id"]
     tune_type = tune_json["type"]
@@ -37,3 +304,37 @@ def get_session_tune_data(tune_id: int, version: int = 0) -> TuneData:
         "mode": key,
         "abc": abc.replace("!", "\r\n"),
     }
+
+
+def get_session_tune_data(
+    tune_id: int,
+    version: int = 0,
+    cache: TuneCache | None = None,
+    offline: bool | None = None,
+    base_url: str = THESESSION_URL,
+) -> TuneData:
+    tune_json = fetch_tune_json(tune_id, cache, offline, base_url)
+    return tune_data_from_json(tune_json, version)
+
+
+def get_session_tunes(
+    tune_ids: Iterable[int],
+    cache: TuneCache | None = None,
+    offline: bool | None = None,
+    base_url: str = THESESSION_URL,
+    max_workers: int = 4,
+    rate: float = 2.0,
+    retries: int = 3,
+    backoff: float = 1.0,
+) -> dict[int, list[TuneData]]:
+    """Return every setting of each tune, keyed by tune id."""
+    tunes_json = fetch_tunes_json(
+        tune_ids, cache, offline, base_url, max_workers, rate, retries, backoff
+    )
+    return {
+        tune_id: [
+            tune_data_from_json(tune_json, version)
+            for version in range(len(tune_json["settings"]))
+        ]
+        for tune_id, tune_json in tunes_json.items()
+    }
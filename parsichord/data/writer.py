@@ -0,0 +1,194 @@
+import re
+from typing import Iterable, Mapping, TextIO
+
+from parsichord.core.chord import ChordVoicing, Pitch
+from parsichord.core.tune import ChordTrack
+from parsichord.data.adapters.abc import (
+    DEFAULT_UNIT_LENGTH,
+    ABCToken,
+    Accidentals,
+    parse_key,
+    read_pitch,
+    spell_pitch,
+)
+from parsichord.data.thesession import TuneData
+
+_note_pattern = re.compile(r"(?P<pitch>[\^_=]*[A-Ga-gzx][',]*)(?P<length>[\d/]*)")
+
+
+def voicing_text(
+    chord_voicing: ChordVoicing,
+    note: str = "",
+    in_chord: bool = False,
+    signature: dict[str, int] | None = None,
+    accidentals: Accidentals | None = None,
+) -> str:
+    """
+    Write a chord symbol and the voicing as an ABC chord, with note, e.g.
+    "d2", as its first note, which ABCParser reads as the melody.
+
+    Every voice takes the length of note, and a rest is replaced by the
+    voicing alone. If note is already inside a [chord] only the voices are
+    written after it. Voices are spelled in the key signature given, against
+    the accidentals carried in the bar, which are updated with those
+    written.
+    """
+    signature = signature or {}
+    accidentals = {} if accidentals is None else accidentals
+    match = _note_pattern.fullmatch(note)
+    pitch, length = (match["pitch"], match["length"]) if match else ("", "")
+    melody = None
+    if pitch and pitch not in ("z", "x"):
+        melody = read_pitch(pitch, signature, dict(accidentals))
+    chord = _voices(chord_voicing, pitch, melody, length, signature, accidentals)
+    if in_chord:
+        return chord
+    return f'"{chord_voicing.chord}"[{chord}]'
+
+
+def _voices(
+    chord_voicing: ChordVoicing,
+    pitch: str,
+    melody: int | None,
+    length: str,
+    signature: dict[str, int],
+    accidentals: Accidentals,
+) -> str:
+    # the melody comes first, so its accidental carries to the voices
+    voices = [] if melody is None else [_respell(pitch, melody, signature, accidentals)]
+    voices += [
+        _spell(voice.abs_value, signature, accidentals)
+        for voice in sorted(chord_voicing.pitches, key=lambda p: p.abs_value)
+    ]
+    return "".join(voice + length for voice in voices)
+
+
+def _spell(value: int, signature: dict[str, int], accidentals: Accidentals) -> str:
+    text = spell_pitch(Pitch(value), signature, accidentals)
+    read_pitch(text, signature, accidentals)
+    return text
+
+
+def _respell(
+    text: str, value: int, signature: dict[str, int], accidentals: Accidentals
+) -> str:
+    """Keep text if it reads as value against accidentals, or else spell
+    value afresh, recording the accidentals written."""
+    if read_pitch(text, signature, dict(accidentals)) != value:
+        return _spell(value, signature, accidentals)
+    read_pitch(text, signature, accidentals)
+    return text
+
+
+def write_header(stream: TextIO, tune_data: TuneData, reference: int = 1) -> None:
+    """Write the header fields of a tune. thesession.org settings have no L:
+    field and are read in the default unit note length, so that is written,
+    and L: fields in the body are written with its tokens."""
+    stream.write(f"X:{reference}\n")
+    stream.write(f"T:{tune_data['name']}\n")
+    stream.write(f"M:{tune_data['meter']}\n")
+    stream.write(f"L:{DEFAULT_UNIT_LENGTH}\n")
+    stream.write(f"K:{tune_data['mode']}\n")
+
+
+class _Respeller:
+    """
+    Track the accidentals carried in a bar both as the original ABC reads
+    and as the written ABC reads, so that notes keep their pitches when
+    chord voices with accidentals are merged in.
+    """
+
+    def __init__(self, signature: dict[str, int]) -> None:
+        self.signature = signature
+        self.source: Accidentals = {}
+        self.written: Accidentals = {}
+
+    def token(
+        self,
+        token: ABCToken,
+        chord_voicing: ChordVoicing | None = None,
+        in_chord: bool = False,
+    ) -> str:
+        """Return the text of a token as it must be written, with
+        chord_voicing merged in if given."""
+        if token.kind == "bar":
+            self.source.clear()
+            self.written.clear()
+        elif token.kind == "field" and token.text.strip("[]").startswith("K:"):
+            _, self.signature = parse_key(token.text.strip("[]")[2:])
+        if token.kind != "note":
+            return token.text
+
+        match = _note_pattern.fullmatch(token.text)
+        if match is None:
+            return token.text
+        pitch, length = match["pitch"], match["length"]
+        melody = None
+        if pitch not in ("z", "x"):
+            melody = read_pitch(pitch, self.signature, self.source)
+        if chord_voicing is not None:
+            chord = _voices(
+                chord_voicing, pitch, melody, length, self.signature, self.written
+            )
+            return chord if in_chord else f'"{chord_voicing.chord}"[{chord}]'
+        if melody is None:
+            return token.text
+        return _respell(pitch, melody, self.signature, self.written) + length
+
+
+def write_tune(
+    stream: TextIO,
+    tune_data: TuneData,
+    tokens: Iterable[ABCToken],
+    chords: ChordTrack | Mapping[int, ChordVoicing],
+    reference: int = 1,
+) -> None:
+    """
+    Write the tokens of a tune with its chords merged in, token by token.
+
+    Each chord is written on the first note or rest at or after its playhead,
+    and chord symbols in the original ABC are dropped in favour of chords.
+    Accidentals are tracked through each bar, and notes are respelled where
+    an accidental written in a chord would otherwise change their pitch.
+    """
+    write_header(stream, tune_data, reference)
+    _, signature = parse_key(tune_data["mode"])
+    respeller = _Respeller(signature)
+    pending = iter(sorted(chords.items(), key=lambda item: item[0]))
+    next_chord = next(pending, None)
+    in_chord = False
+    for token in tokens:
+        if token.kind == "chord_symbol":
+            continue
+        if token.kind in ("chord_open", "chord_close"):
+            in_chord = token.kind == "chord_open"
+        chord_voicing = None
+        while (
+            token.playhead is not None
+            and next_chord is not None
+            and next_chord[0] <= token.playhead
+        ):
+            chord_voicing = next_chord[1]
+            next_chord = next(pending, None)
+        stream.write(respeller.token(token, chord_voicing, in_chord))
+    stream.write("\n\n")
+
+
+def write_songbook(
+    stream: TextIO,
+    tunes: Iterable[
+        tuple[TuneData, Iterable[ABCToken], ChordTrack | Mapping[int, ChordVoicing]]
+    ],
+) -> int:
+    """
+    Stream harmonized tunes to a file or socket, numbering them from 1.
+
+    tunes yields the data, tokens (e.g. ABCTune.tokens) and chords of each
+    tune. It may be a generator, so only one tune needs to be in memory at a
+    time. Returns the number of tunes written.
+    """
+    count = 0
+    for count, (tune_data, tokens, chords) in enumerate(tunes, start=1):
+        write_tune(stream, tune_data, tokens, chords, count)
+        stream.flush()
+    return count
@@ -0,0 +1,190 @@
+"""
+Opt-in instrumentation of the harmony engine.
+
+    with instrument() as instrumentation:
+        strategy.harmonize(tune, chord_voicing)
+    print(instrumentation.by_strategy())
+
+Searches, retries and cache lookups are recorded only while an
+Instrumentation is active. The engine checks the module-level active before
+recording anything, so instrumentation costs a None check when disabled.
+Recording is process-wide and not thread-safe.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Iterator, TypeVar, cast
+
+Harmonize = TypeVar("Harmonize", bound=Callable[..., Any])
+
+
+@dataclass(frozen=True)
+class SearchRecord:
+    """One voicing search, attributed to the strategy and tune it ran for."""
+
+    strategy: str | None
+    tune: str | None
+    nodes_expanded: int
+    frontier_peak: int
+    depth: int
+    found: bool
+
+
+@dataclass
+class SearchStats:
+    """Search counters summed over calls, with peaks taken as maxima."""
+
+    searches: int = 0
+    not_found: int = 0
+    nodes_expanded: int = 0
+    frontier_peak: int = 0
+    max_depth: int = 0
+    retries: int = 0
+    budget_exhausted: int = 0
+    cache_hits: defaultdict[str, int] = field(default_factory=lambda: defaultdict(int))
+    cache_misses: defaultdict[str, int] = field(
+        default_factory=lambda: defaultdict(int)
+    )
+
+    def add(self, record: SearchRecord) -> None:
+        self.searches += 1
+        self.not_found += not record.found
+        self.nodes_expanded += record.nodes_expanded
+        self.frontier_peak = max(self.frontier_peak, record.frontier_peak)
+        self.max_depth = max(self.max_depth, record.depth)
+
+    def merge(self, other: "SearchStats") -> None:
+        self.searches += other.searches
+        self.not_found += other.not_found
+        self.nodes_expanded += other.nodes_expanded
+        self.frontier_peak = max(self.frontier_peak, other.frontier_peak)
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.retries += other.retries
+        self.budget_exhausted += other.budget_exhausted
+        for name, hits in other.cache_hits.items():
+            self.cache_hits[name] += hits
+        for name, misses in other.cache_misses.items():
+            self.cache_misses[name] += misses
+
+    @property
+    def mean_nodes_expanded(self) -> float:
+        return self.nodes_expanded / self.searches if self.searches else 0.0
+
+    def hit_rate(self, name: str) -> float:
+        hits = self.cache_hits.get(name, 0)
+        lookups = hits + self.cache_misses.get(name, 0)
+        return hits / lookups if lookups else 0.0
+
+
+Scope = tuple[str | None, str | None]
+
+
+def tune_label(tune: object) -> str:
+    """Label a tune by its thesession.org tune and setting ids if it has
+    them."""
+    tune_data = getattr(tune, "tune_data", None)
+    if isinstance(tune_data, dict) and "tune" in tune_data:
+        return f"{tune_data['tune']}/{tune_data.get('setting', tune_data['tune'])}"
+    return f"{type(tune).__name__}@{id(tune):x}"
+
+
+class Instrumentation:
+    """
+    Records of every search while active, and counters per strategy and tune.
+
+    Work done outside a strategy, such as a direct call to a search function,
+    is attributed to the strategy and tune None.
+    """
+
+    def __init__(self) -> None:
+        self.records: list[SearchRecord] = []
+        self._stats: defaultdict[Scope, SearchStats] = defaultdict(SearchStats)
+        self._scope: Scope = (None, None)
+        self._depth = 0
+
+    @contextmanager
+    def scope(self, strategy: str, tune: object) -> Iterator[None]:
+        """
+        Attribute work to a strategy harmonizing a tune.
+
+        Scopes nest, as when a strategy delegates to a base strategy, and work
+        is attributed to the outermost.
+        """
+        previous = self._scope
+        if not self._depth:
+            self._scope = (strategy, tune_label(tune))
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self._scope = previous
+
+    def search(
+        self, nodes_expanded: int, frontier_peak: int, depth: int, found: bool
+    ) -> None:
+        record = SearchRecord(*self._scope, nodes_expanded, frontier_peak, depth, found)
+        self.records.append(record)
+        self._stats[self._scope].add(record)
+
+    def retry(self, budget_exhausted: bool = False) -> None:
+        """Count a search retried with fewer pitches, and whether it failed
+        because its expansion budget ran out."""
+        stats = self._stats[self._scope]
+        stats.retries += 1
+        stats.budget_exhausted += budget_exhausted
+
+    def cache_lookup(self, name: str, hit: bool) -> None:
+        stats = self._stats[self._scope]
+        if hit:
+            stats.cache_hits[name] += 1
+        else:
+            stats.cache_misses[name] += 1
+
+    def _aggregate(self, index: int) -> dict[str | None, SearchStats]:
+        aggregated: defaultdict[str | None, SearchStats] = defaultdict(SearchStats)
+        for scope, stats in self._stats.items():
+            aggregated[scope[index]].merge(stats)
+        return dict(aggregated)
+
+    def by_strategy(self) -> dict[str | None, SearchStats]:
+        return self._aggregate(0)
+
+    def by_tune(self) -> dict[str | None, SearchStats]:
+        return self._aggregate(1)
+
+    def total(self) -> SearchStats:
+        total = SearchStats()
+        for stats in self._stats.values():
+            total.merge(stats)
+        return total
+
+
+active: Instrumentation | None = None
+
+
+@contextmanager
+def instrument() -> Iterator[Instrumentation]:
+    """Record the harmony engine's work until the block exits."""
+    global active
+    previous = active
+    active = instrumentation = Instrumentation()
+    try:
+        yield instrumentation
+    finally:
+        active = previous
+
+
+def scoped(harmonize: Harmonize) -> Harmonize:
+    """Attribute the work of a strategy's harmonize method to the strategy and
+    the tune it harmonizes."""
+
+    @wraps(harmonize)
+    def wrapper(self: object, tune: object, *args: Any, **kwargs: Any) -> Any:
+        if active is None:
+            return harmonize(self, tune, *args, **kwargs)
+        with active.scope(type(self).__name__, tune):
+            return harmonize(self, tune, *args, **kwargs)
+
+    return cast(Harmonize, wrapper)
@@ -0,0 +1,168 @@
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Hashable, Iterable
+
+import numpy as np
+
+from parsichord.core.tune import Tune
+from parsichord.data.thesession import TuneData
+
+TuneFactory = Callable[[TuneData], Tune]
+SettingKey = tuple[int, int]
+
+# Mersenne prime for the MinHash permutations; residues below it multiply
+# within an int64
+_PRIME = (1 << 31) - 1
+_EMPTY = np.iinfo(np.int64).max
+
+
+def abc_tune(tune_data: TuneData) -> Tune:
+    """Parse a setting with the fast-path ABCTune parser."""
+    from parsichord.data.adapters.abc import ABCTune
+
+    return ABCTune(tune_data)
+
+
+def interval_ngrams(pitches: np.ndarray, n: int = 4) -> np.ndarray:
+    """
+    Return the distinct n-grams of melodic intervals as integers.
+
+    Intervals are unchanged by transposition, so settings in different keys
+    give the same n-grams. Intervals are clipped to two octaves either way.
+    """
+    intervals = np.clip(np.diff(np.asarray(pitches, dtype=np.int64)), -24, 24) + 24
+    if len(intervals) < n:
+        return np.zeros(0, dtype=np.int64)
+    windows = np.lib.stride_tricks.sliding_window_view(intervals, n)
+    ngrams = windows @ (49 ** np.arange(n, dtype=np.int64))
+    return np.unique(ngrams % _PRIME)
+
+
+class MelodyIndex:
+    """
+    MinHash and LSH index of tune settings for melodic similarity queries.
+
+    Each setting is reduced to a MinHash signature of its interval n-grams,
+    whose agreement with another signature estimates the Jaccard similarity
+    of their n-gram sets. Signatures are split into bands, and an inverted
+    index from each band's values to settings finds candidates sharing any
+    band, so a query scores only those rather than the whole corpus.
+    """
+
+    def __init__(
+        self, num_perm: int = 128, bands: int = 32, n: int = 4, seed: int = 0
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.n = n
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.int64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.int64)
+        self.keys: list[SettingKey] = []
+        self._signatures: list[np.ndarray] = []
+        self._stacked: np.ndarray | None = None
+        self._buckets: defaultdict[tuple[int, Hashable], list[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def signatures(self) -> np.ndarray:
+        if self._stacked is None or len(self._stacked) != len(self._signatures):
+            self._stacked = np.array(self._signatures, dtype=np.int64).reshape(
+                len(self._signatures), self.num_perm
+            )
+        return self._stacked
+
+    def signature(self, pitches: np.ndarray) -> np.ndarray:
+        """Return the MinHash signature of a pitch sequence."""
+        ngrams = interval_ngrams(pitches, self.n)
+        if not len(ngrams):
+            return np.full(self.num_perm, _EMPTY, dtype=np.int64)
+        hashes = (np.outer(self._a, ngrams) + self._b[:, None]) % _PRIME
+        return hashes.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> list[tuple[int, Hashable]]:
+        rows = signature.reshape(self.bands, -1)
+        return [(band, row.tobytes()) for band, row in enumerate(rows)]
+
+    def add(self, key: SettingKey, pitches: np.ndarray) -> None:
+        """Add a setting, e.g. (tune id, setting id), by its MIDI pitches."""
+        self._insert(key, self.signature(pitches))
+
+    def _insert(self, key: SettingKey, signature: np.ndarray) -> None:
+        item = len(self.keys)
+        self.keys.append(key)
+        self._signatures.append(signature)
+        if signature[0] == _EMPTY:
+            return
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].append(item)
+
+    def add_tune(self, key: SettingKey, tune: Tune) -> None:
+        self.add(key, tune.note_array.pitch)
+
+    def add_settings(
+        self, tune_datas: Iterable[TuneData], tune_factory: TuneFactory = abc_tune
+    ) -> None:
+        for tune_data in tune_datas:
+            key = (tune_data["tune"], tune_data["setting"])
+            self.add_tune(key, tune_factory(tune_data))
+
+    def candidates(self, signature: np.ndarray) -> np.ndarray:
+        """Return the settings that share at least one band with
+        signature."""
+        if signature[0] == _EMPTY:
+            return np.zeros(0, dtype=np.int64)
+        found: set[int] = set()
+        for band_key in self._band_keys(signature):
+            found.update(self._buckets.get(band_key, ()))
+        return np.array(sorted(found), dtype=np.int64)
+
+    def query(
+        self, pitches: np.ndarray, k: int = 10, exclude: SettingKey | None = None
+    ) -> list[tuple[SettingKey, float]]:
+        """
+        Return up to k settings most similar to a pitch sequence, with their
+        estimated Jaccard similarity, best first.
+        """
+        signature = self.signature(pitches)
+        candidates = self.candidates(signature)
+        if not len(candidates):
+            return []
+        scores = (self.signatures[candidates] == signature).mean(axis=1)
+        order = np.argsort(-scores, kind="stable")
+        results = []
+        for i in order:
+            key = self.keys[candidates[i]]
+            if key != exclude:
+                results.append((key, float(scores[i])))
+            if len(results) == k:
+                break
+        return results
+
+    def query_tune(
+        self, tune: Tune, k: int = 10, exclude: SettingKey | None = None
+    ) -> list[tuple[SettingKey, float]]:
+        return self.query(tune.note_array.pitch, k, exclude)
+
+    def save(self, path: str | Path) -> None:
+        """Save the index as a .npz file. Buckets are rebuilt on load."""
+        np.savez_compressed(
+            path,
+            params=np.array([self.num_perm, self.bands, self.n, self.seed]),
+            keys=np.array(self.keys, dtype=np.int64).reshape(len(self), 2),
+            signatures=self.signatures,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "MelodyIndex":
+        with np.load(path) as data:
+            num_perm, bands, n, seed = data["params"].tolist()
+            index = cls(num_perm, bands, n, seed)
+            for key, signature in zip(data["keys"].tolist(), data["signatures"]):
+                index._insert((key[0], key[1]), signature)
+        return index
@@ -0,0 +1,90 @@
+from fractions import Fraction
+
+import pytest
+from tunes import tune_data
+
+from parsichord.core.chord import Pitch
+from parsichord.core.constants import PitchClass
+from parsichord.data.adapters.abc import ABCTune, parse_key, parse_length, spell_pitch
+
+
+@pytest.mark.parametrize(
+    "mode, tonic, signature",
+    [
+        ("Dmajor", PitchClass.D, {"F": 1, "C": 1}),
+        ("Ador", PitchClass.A, {"F": 1}),
+        ("Edorian", PitchClass.E, {"F": 1, "C": 1}),
+        ("Bbmajor", PitchClass.Bb, {"B": -1, "E": -1}),
+        ("Gmixolydian", PitchClass.G, {}),
+    ],
+)
+def test_parse_key(mode: str, tonic: PitchClass, signature: dict[str, int]) -> None:
+    key, accidentals = parse_key(mode)
+    assert key.tonic == tonic
+    assert accidentals == signature
+
+
+@pytest.mark.parametrize(
+    "text, length",
+    [("", 1), ("2", 2), ("/", Fraction(1, 2)), ("//", Fraction(1, 4)), ("3/2", 1.5)],
+)
+def test_parse_length(text: str, length: Fraction) -> None:
+    assert parse_length(text) == length
+
+
+class TestABCTune:
+    def setup_method(self) -> None:
+        self.tune = ABCTune(
+            tune_data(
+                1, '|:A|"D"dfa ^gfe|d2B A>B(3cde|"G"=fFf g2e:|\r\n|1 z3 {g}AB,c|]'
+            )
+        )
+
+    def test_pitches(self) -> None:
+        assert self.tune.note_array.pitch.tolist() == [
+            62, 66, 69, 68, 66, 64,
+            62, 59, 57, 59, 61, 62, 64,
+            65, 54, 65, 67, 64,
+            57, 47, 61,
+        ]  # fmt: skip
+
+    def test_bars(self) -> None:
+        anacrusis = self.tune.anacrusis
+        assert anacrusis is not None and len(anacrusis) == 1
+        assert anacrusis[0] is not None and anacrusis[0].pitch == Pitch(9)
+        assert [len(bar) for bar in self.tune.bars] == [6, 8, 6, 6]
+        assert self.tune.note_array.bar_offsets.tolist() == [0, 6, 14, 20, 26]
+
+    def test_durations(self) -> None:
+        durations = self.tune.note_array.duration.tolist()
+        assert durations[6:12] == pytest.approx([2, 1, 1.5, 0.5, 2 / 3, 2 / 3])
+        assert self.tune.notes[6] is not None
+        assert self.tune.notes[6].duration == 2
+        assert self.tune.notes[7] is None
+
+    def test_chord_symbols(self) -> None:
+        assert self.tune.chord_symbols == {0: "D", 14: "G"}
+
+    def test_key(self) -> None:
+        assert self.tune.key.tonic == PitchClass.D
+        assert self.tune.key.mode == "major"
+        assert self.tune.meter == "6/8"
+
+
+@pytest.mark.parametrize(
+    "abc", ["L:1/4\nd B/A/>B/ c/|d3/2 z3/2|", "[L:1/16]d4B2 A2>B2 c2|d6 z6|"]
+)
+def test_unit_note_length(abc: str) -> None:
+    eighths = ABCTune(tune_data(1, "d2B A>B c|d3 z3|")).note_array
+    note_array = ABCTune(tune_data(1, abc)).note_array
+    assert note_array.onset.tolist() == eighths.onset.tolist()
+    assert note_array.duration.tolist() == eighths.duration.tolist()
+    assert note_array.bar_offsets.tolist() == eighths.bar_offsets.tolist()
+
+
+@pytest.mark.parametrize(
+    "value, text", [(2, "D"), (5, "=F"), (6, "F"), (13, "c"), (-1, "B,"), (24, "=c'")]
+)
+def test_spell_pitch(value: int, text: str) -> None:
+    _, signature = parse_key("Dmajor")
+    assert spell_pitch(Pitch(value), signature) == text
@@ -0,0 +1,70 @@
+from typing import Iterator
+
+import pytest
+from tunes import JIG, simple_tune, tune_data
+
+from parsichord.batch import harmonize_many
+from parsichord.core.chord import Chord, ChordVoicing, Major, Pitch
+from parsichord.core.constants import PitchClass
+from parsichord.core.harmony import CommonTonesStrategy, IHarmonisationStrategy
+from parsichord.data.thesession import TuneData
+
+C_MAJOR_VOICING = ChordVoicing(
+    Chord(PitchClass.C, Major),
+    [Pitch(PitchClass.C), Pitch(PitchClass.E), Pitch(PitchClass.G)],
+)
+
+
+def strategy_factory() -> IHarmonisationStrategy:
+    return CommonTonesStrategy(harmonic_rhythm=3)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_harmonize_many(jobs: int) -> None:
+    abc = " ".join(str(value) for value in JIG)
+    tune_datas = [tune_data(i, abc) for i in range(5)]
+    tune_datas[2] = tune_data(2, "not an abc body")
+    progress: list[tuple[int, int]] = []
+
+    results = harmonize_many(
+        tune_datas,
+        strategy_factory,
+        C_MAJOR_VOICING,
+        jobs=jobs,
+        chunk_size=2,
+        progress=lambda done, total: progress.append((done, total)),
+        tune_factory=simple_tune,
+    )
+
+    assert [result.index for result in results] == list(range(5))
+    assert [result.tune for result in results] == list(range(5))
+    assert [result.ok for result in results] == [True, True, False, True, True]
+    assert "ValueError" in (results[2].error or "")
+    assert results[0].chords == results[1].chords
+    assert results[0].chords[0] is not None
+    assert progress[-1] == (5, 5)
+
+
+def test_harmonize_many_bounds_chunks_in_flight() -> None:
+    abc = " ".join(str(value) for value in JIG)
+    read: list[int] = []
+
+    def tune_datas() -> Iterator[TuneData]:
+        for i in range(20):
+            read.append(i)
+            yield tune_data(i, abc)
+
+    read_at_first_result: list[int] = []
+    results = harmonize_many(
+        tune_datas(),
+        strategy_factory,
+        C_MAJOR_VOICING,
+        jobs=2,
+        chunk_size=1,
+        progress=lambda done, total: read_at_first_result.append(len(read)),
+        tune_factory=simple_tune,
+    )
+
+    assert len(results) == 20
+    # two chunks per worker are submitted before any result is consumed
+    assert read_at_first_result[0] <= 4
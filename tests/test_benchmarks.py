@@ -0,0 +1,33 @@
+import pytest
+
+from benchmarks.suite import Benchmark, compare, measure, to_json
+from benchmarks.synthetic import generate_setting
+from parsichord.core.constants import PitchClass
+from parsichord.data.adapters.abc import ABCTune
+
+
+@pytest.mark.parametrize("tune_type, bar_length", [("jig", 6), ("reel", 8)])
+def test_generate_setting(tune_type: str, bar_length: int) -> None:
+    setting = generate_setting(tune_type, bars=12, mode="Gmajor", pitch_range=(60, 72))
+    assert setting == generate_setting(
+        tune_type, bars=12, mode="Gmajor", pitch_range=(60, 72)
+    )
+    tune = ABCTune(setting)
+    assert tune.key.tonic == PitchClass.G
+    assert [len(bar) for bar in tune.bars] == [bar_length] * 12
+    pitch = tune.note_array.pitch
+    assert 60 <= pitch.min() and pitch.max() <= 72
+    assert set((pitch % 12).tolist()) <= {pc.value for pc in tune.key.scale}
+
+
+def test_compare_flags_regressions() -> None:
+    timing = measure(Benchmark("noop", lambda: None, number=3), repeat=2)
+    assert (timing.repeat, timing.number) == (2, 3)
+
+    baseline = to_json({"a": timing, "b": timing}, {})
+    results = to_json({"a": timing, "c": timing}, {})
+    results["benchmarks"]["a"]["best"] = timing.best * 2 + 1e-3
+    [comparison] = compare(baseline, results, threshold=0.5)
+    assert comparison.name == "a"
+    assert comparison.regressed
+    assert not compare(baseline, baseline)[0].regressed
@@ -0,0 +1,65 @@
+import pytest
+
+from parsichord.cache import (
+    CACHE_SIZES_ENV,
+    CacheRegistry,
+    LRUCache,
+    environment_cache_sizes,
+    parse_cache_sizes,
+)
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self) -> None:
+        cache = LRUCache("test", maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        stats = cache.stats()
+        assert (stats.size, stats.hits, stats.misses, stats.evictions) == (2, 2, 1, 1)
+
+    def test_zero_maxsize_disables_caching(self) -> None:
+        cache = LRUCache("test", maxsize=0)
+        cache.put("a", 1)
+        assert len(cache) == 0
+
+
+class TestCacheRegistry:
+    def test_cached_counts_hits_and_misses(self) -> None:
+        registry = CacheRegistry()
+        calls = []
+
+        @registry.cached("square", maxsize=8)
+        def square(x: int) -> int:
+            calls.append(x)
+            return x * x
+
+        assert [square(2), square(2), square(3)] == [4, 4, 9]
+        assert calls == [2, 3]
+        stats = registry.stats()["square"]
+        assert (stats.hits, stats.misses) == (1, 2)
+        assert stats.hit_rate == 1 / 3
+
+        registry.clear_all()
+        assert registry.stats()["square"].size == 0
+
+    def test_configured_size_overrides_declared_size(self) -> None:
+        registry = CacheRegistry({"square": 1})
+        assert registry.get_cache("square", maxsize=8).maxsize == 1
+
+        registry.configure("square", 4)
+        assert registry["square"].maxsize == 4
+
+
+def test_parse_cache_sizes() -> None:
+    assert parse_cache_sizes("a=10, b=none,") == {"a": 10, "b": None}
+
+
+def test_malformed_environment_cache_sizes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(CACHE_SIZES_ENV, "voicing_search=lots")
+    with pytest.warns(RuntimeWarning, match=CACHE_SIZES_ENV):
+        assert environment_cache_sizes() == {}
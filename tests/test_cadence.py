@@ -0,0 +1,57 @@
+import numpy as np
+from tunes import JIG, SimpleTune
+
+from parsichord.core.cadence import (
+    cadence_table,
+    cadence_tables,
+    cadences,
+    find_cadence,
+    perfect_cadence,
+    scan_cadences,
+)
+from parsichord.core.chord import Chord, Major, Minor
+from parsichord.core.constants import Interval, PitchClass, mode_to_intervals
+from parsichord.core.tune import Key
+
+
+def test_registry_covers_every_mode() -> None:
+    assert set(cadences) == set(mode_to_intervals)
+    assert len(cadence_tables) == 12 * len(mode_to_intervals)
+    assert (
+        find_cadence(Interval.MAJOR_SEVENTH, Interval.PERFECT_FIRST, True)
+        is perfect_cadence
+    )
+    # in dorian the seventh is minor and the chord on the fifth is minor
+    dorian = find_cadence(
+        Interval.MINOR_SEVENTH, Interval.PERFECT_FIRST, True, mode="dor"
+    )
+    assert dorian is not None
+    assert dorian.approach_chord.chord_type == Minor
+
+
+def test_cadence_table() -> None:
+    table = cadence_table(Key(PitchClass.G, "major"))
+    strong, approach, resolution = 1, PitchClass.Gb.value, PitchClass.G.value
+    assert table.chords[table.approach[strong, approach, resolution]] == Chord(
+        PitchClass.D, Major
+    )
+    assert table.chords[table.resolution[strong, approach, resolution]] == Chord(
+        PitchClass.G, Major
+    )
+    assert table.approach[0, approach, PitchClass.C.value] == -1
+
+
+def test_scan_cadences() -> None:
+    tune = SimpleTune(JIG)
+    points = scan_cadences(tune, np.array([8, 16, 24, 30]), np.ones(4, dtype=bool))
+    table = cadence_table(tune.key)
+    assert points.approach_onset.tolist() == [6, 22]
+    assert points.resolution_onset.tolist() == [7, 23]
+    assert [table.chords[i] for i in points.approach_chord] == [
+        Chord(PitchClass.G, Major),
+        Chord(PitchClass.G, Major),
+    ]
+    assert [table.chords[i] for i in points.resolution_chord] == [
+        Chord(PitchClass.D, Major),
+        Chord(PitchClass.D, Major),
+    ]
@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from parsichord.core.chord import Chord, ChordType, ChordVoicing, Pitch
@@ -63,3 +65,44 @@ class TestChordVoicing:
 
     def test_voice_leading(self) -> None:
         assert self.e_minor_voicing in self.c_major_voicing.find_closest_voicings()
+
+
+class TestChord:
+    def test_from_pitch_classes(self) -> None:
+        chord = Chord.from_pitch_classes({PitchClass.E, PitchClass.G, PitchClass.C})
+        assert chord is not None
+        assert chord.root == PitchClass.C
+        assert chord.chord_type.base == Triad.MAJOR
+
+    def test_from_pitch_classes_seventh(self) -> None:
+        chord = Chord.from_pitch_classes(
+            [PitchClass.G, PitchClass.B, PitchClass.D, PitchClass.F]
+        )
+        assert chord is not None
+        assert str(chord) == "G7"
+
+    @pytest.mark.parametrize(
+        "pitch_classes",
+        [[], [PitchClass.C, PitchClass.G], [PitchClass.C, PitchClass.Db, PitchClass.D]],
+    )
+    def test_from_pitch_classes_unknown(self, pitch_classes: list[PitchClass]) -> None:
+        assert Chord.from_pitch_classes(pitch_classes) is None
+
+    def test_chords_are_interned(self) -> None:
+        major = ChordType(name="Major", base=Triad.MAJOR)
+        assert Chord(PitchClass.C, major) is Chord(PitchClass.C, major)
+        assert Chord(PitchClass.C, major) + Interval.PERFECT_FIFTH is Chord(
+            PitchClass.G, major
+        )
+
+    def test_chord_equality_uses_pitch_classes(self) -> None:
+        augmented = ChordType(name="Augmented", base=Triad.AUGMENTED)
+        c_augmented = Chord(PitchClass.C, augmented)
+        assert c_augmented == Chord(PitchClass.E, augmented)
+        assert hash(c_augmented) == hash(Chord(PitchClass.Ab, augmented))
+        assert PitchClass.Ab in c_augmented
+        assert PitchClass.G not in c_augmented
+
+    def test_chord_pickles_to_interned_instance(self) -> None:
+        chord = Chord(PitchClass.D, ChordType(name="Minor", base=Triad.MINOR))
+        assert pickle.loads(pickle.dumps(chord)) is chord
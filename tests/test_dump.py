@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from parsichord.data.dump import TuneCorpus, iter_dump, iter_json_array
+
+ROWS = [
+    {
+        "tune_id": "1",
+        "setting_id": str(setting_id),
+        "name": name,
+        "type": tune_type,
+        "meter": meter,
+        "mode": mode,
+        "abc": "|:d2B A2F|ABA ABd:|\r\n",
+        "date": "2001-01-01 00:00:00",
+        "username": "Jeremy",
+    }
+    for setting_id, name, tune_type, meter, mode in [
+        (1, "Cooley's", "reel", "4/4", "Eminor"),
+        (2, "The Silver Spear", "reel", "4/4", "Dmajor"),
+        (3, "The Kesh", "jig", "6/8", "Gmajor"),
+        (4, "The Mason's Apron", "reel", "4/4", "Amajor"),
+        (5, "Drowsy Maggie", "reel", "4/4", "Dmixolydian"),
+    ]
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_json_array(chunk_size: int) -> None:
+    stream = io.StringIO("  " + json.dumps(ROWS, indent=2))
+    assert list(iter_json_array(stream, chunk_size)) == ROWS
+
+
+def test_iter_json_array_rejects_truncated_input() -> None:
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(json.dumps(ROWS)[:-1]), chunk_size=8))
+
+
+@pytest.fixture(params=["json", "csv"])
+def dump_path(request: pytest.FixtureRequest, tmp_path: Path) -> Path:
+    path = tmp_path / f"tunes.{request.param}"
+    with open(path, "w", newline="", encoding="utf-8") as stream:
+        if request.param == "json":
+            json.dump(ROWS, stream)
+        else:
+            writer = csv.DictWriter(stream, fieldnames=list(ROWS[0]))
+            writer.writeheader()
+            writer.writerows(ROWS)
+    return path
+
+
+def test_iter_dump(dump_path: Path) -> None:
+    records = list(iter_dump(dump_path))
+    assert [record["setting"] for record in records] == [1, 2, 3, 4, 5]
+    assert records[2] == {
+        "tune": 1,
+        "setting": 3,
+        "name": "The Kesh",
+        "type": "jig",
+        "meter": "6/8",
+        "mode": "Gmajor",
+        "abc": "|:d2B A2F|ABA ABd:|\r\n",
+    }
+
+
+def test_corpus_selects_from_index(dump_path: Path, tmp_path: Path) -> None:
+    corpus = TuneCorpus.build(dump_path, tmp_path / "corpus.sqlite3", batch_size=2)
+    dump_path.unlink()
+
+    assert len(corpus) == 5
+    reels_in_d = corpus.select(tune_type="reel", tonic="D")
+    assert [record["name"] for record in reels_in_d] == [
+        "The Silver Spear",
+        "Drowsy Maggie",
+    ]
+    assert [record["setting"] for record in corpus.select(meter="6/8")] == [3]
+    assert next(corpus.select(setting=4))["mode"] == "Amajor"
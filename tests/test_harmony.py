@@ -0,0 +1,292 @@
+import asyncio
+import random
+from typing import AsyncIterator
+
+import pytest
+from tunes import JIG, SimpleNote, SimpleTune
+
+from parsichord.core.chord import Chord, ChordVoicing, Major, Minor, Pitch
+from parsichord.core.constants import PitchClass
+from parsichord.core.graph import parsimonious_graph
+from parsichord.core.harmony import (
+    CadenceStrategy,
+    CommonTonesStrategy,
+    FirstNoteStrategy,
+    GreedyStrategy,
+    IHarmonisationStrategy,
+    NotFound,
+    SearchBudgetExhausted,
+    StreamHarmonizer,
+    ViterbiStrategy,
+    closest_voicing,
+    nearest_parsimonious_chord_containing_pitch_class,
+    nearest_parsimonious_chord_voicing_containing,
+)
+from parsichord.core.tune import Note
+
+C_MAJOR = Chord(PitchClass.C, Major)
+A_MINOR = Chord(PitchClass.A, Minor)
+C_MAJOR_VOICING = ChordVoicing(
+    C_MAJOR, [Pitch(PitchClass.C), Pitch(PitchClass.E), Pitch(PitchClass.G)]
+)
+
+
+class TestParsimoniousGraph:
+    def test_neighbours_match_parsimonious_chords(self) -> None:
+        assert set(parsimonious_graph.neighbours_of(C_MAJOR)) == (
+            C_MAJOR.parsimonious_chords()
+        )
+
+    def test_distance(self) -> None:
+        assert parsimonious_graph.distance(C_MAJOR, C_MAJOR) == 0
+        assert parsimonious_graph.distance(C_MAJOR, A_MINOR) == 1
+
+    def test_path(self) -> None:
+        target = Chord(PitchClass.Gb, Major)
+        path = parsimonious_graph.path(C_MAJOR, target)
+        distance = parsimonious_graph.distance(C_MAJOR, target)
+        assert path is not None and distance is not None
+        assert path[0] == C_MAJOR and path[-1] == target
+        assert len(path) == distance + 1
+        for chord, next_chord in zip(path, path[1:]):
+            assert next_chord in chord.parsimonious_chords()
+
+    def test_nearest_containing_is_deterministic(self) -> None:
+        nearest = parsimonious_graph.nearest_containing(C_MAJOR, [PitchClass.A])
+        assert nearest is not None
+        assert PitchClass.A in nearest
+        assert parsimonious_graph.distance(C_MAJOR, nearest) == 1
+        assert nearest is parsimonious_graph.nearest_containing(C_MAJOR, [PitchClass.A])
+
+
+@pytest.mark.parametrize("pitch_class", list(PitchClass))
+def test_nearest_parsimonious_chord_containing_pitch_class(
+    pitch_class: PitchClass,
+) -> None:
+    chord = nearest_parsimonious_chord_containing_pitch_class(C_MAJOR, pitch_class)
+    assert pitch_class in chord
+
+
+class TestNearestParsimoniousChordVoicing:
+    def test_returns_voicing_unchanged_when_it_contains_pitch(self) -> None:
+        voicing = nearest_parsimonious_chord_voicing_containing(
+            C_MAJOR_VOICING, Pitch(PitchClass.E)
+        )
+        assert voicing is C_MAJOR_VOICING
+
+    def test_minimises_voice_movement(self) -> None:
+        voicing = nearest_parsimonious_chord_voicing_containing(
+            C_MAJOR_VOICING, Pitch(PitchClass.A)
+        )
+        assert voicing.chord == A_MINOR
+        assert voicing.pitches == {
+            Pitch(PitchClass.C),
+            Pitch(PitchClass.E),
+            Pitch(PitchClass.A),
+        }
+
+    def test_respects_pitch_range(self) -> None:
+        # the only As reachable lie outside C3-G3
+        with pytest.raises(NotFound) as raised:
+            nearest_parsimonious_chord_voicing_containing(
+                C_MAJOR_VOICING, Pitch(PitchClass.A), pitch_range=(48, 55)
+            )
+        assert not isinstance(raised.value, SearchBudgetExhausted)
+
+    def test_raises_when_budget_exhausted(self) -> None:
+        with pytest.raises(SearchBudgetExhausted):
+            nearest_parsimonious_chord_voicing_containing(
+                C_MAJOR_VOICING, Pitch(PitchClass.Gb), max_expansions=1
+            )
+
+
+def test_closest_voicing() -> None:
+    voicing = closest_voicing(C_MAJOR_VOICING, A_MINOR)
+    assert voicing.chord == A_MINOR
+    assert voicing.pitches == {
+        Pitch(PitchClass.C),
+        Pitch(PitchClass.E),
+        Pitch(PitchClass.A),
+    }
+
+
+@pytest.mark.parametrize(
+    "strategy_class",
+    [FirstNoteStrategy, CommonTonesStrategy, ViterbiStrategy, CadenceStrategy],
+)
+def test_strategy_harmonizes_every_group(
+    strategy_class: type[IHarmonisationStrategy],
+) -> None:
+    tune = SimpleTune(JIG)
+    strategy = strategy_class(harmonic_rhythm=3)
+    strategy.harmonize(tune, C_MAJOR_VOICING)
+
+    assert tune.get_chord(0) is not None
+    low, high = strategy.search_pitch_range(C_MAJOR_VOICING)
+    for _, chord_voicing in tune.chords:
+        assert all(low <= pitch.midi_value <= high for pitch in chord_voicing.pitches)
+
+
+def test_cadence_strategy_writes_cadences() -> None:
+    tune = SimpleTune(JIG)
+    strategy = CadenceStrategy(harmonic_rhythm=3, phrase_length_in_bars=1)
+    # each approach shares a group with its resolution, which is split
+    assert strategy.cadence_chords(tune) == [(6, 2), (7, 1), (22, 2), (23, 1)]
+
+    strategy.harmonize(tune, C_MAJOR_VOICING)
+    chords = {playhead: tune.chords[playhead].chord for playhead in (6, 7, 22, 23)}
+    assert chords == {
+        6: Chord(PitchClass.G, Major),
+        7: Chord(PitchClass.D, Major),
+        22: Chord(PitchClass.G, Major),
+        23: Chord(PitchClass.D, Major),
+    }
+    for playhead, chord in chords.items():
+        note = tune.notes[playhead]
+        assert note is not None and note.pitch.pitch_class in chord
+
+
+@pytest.mark.parametrize("seed", [7, 64, 151, 163])
+def test_cadences_keep_base_chords(seed: int) -> None:
+    rng = random.Random(seed)
+    pitch_values = rng.choices([2, 4, 6, 7, 9, 11, 13], k=48)
+    base = SimpleTune(pitch_values)
+    CommonTonesStrategy(3).harmonize(base, C_MAJOR_VOICING)
+    tune = SimpleTune(pitch_values)
+    strategy = CadenceStrategy(3, phrase_length_in_bars=1)
+    strategy.harmonize(tune, C_MAJOR_VOICING)
+
+    cadence_groups = {playhead // 3 for playhead, _ in strategy.cadence_chords(tune)}
+    for playhead in range(len(pitch_values)):
+        if playhead // 3 not in cadence_groups:
+            assert tune.chord_at(playhead) == base.chord_at(playhead)
+
+
+def test_cadence_in_first_group() -> None:
+    # the whole phrase is one group, so there is no earlier group to move the
+    # approach chord to
+    strategy = CadenceStrategy(harmonic_rhythm=8, phrase_length_in_bars=1)
+    assert strategy.cadence_chords(SimpleTune(JIG[:8])) == [(6, 2), (7, 1)]
+
+
+@pytest.mark.parametrize("strategy_class", [FirstNoteStrategy, CommonTonesStrategy])
+class TestReharmonize:
+    def harmonized(
+        self, strategy_class: type[GreedyStrategy], pitch_values: list[int]
+    ) -> tuple[GreedyStrategy, SimpleTune]:
+        strategy = strategy_class(harmonic_rhythm=3)
+        tune = SimpleTune(pitch_values)
+        strategy.harmonize(tune, C_MAJOR_VOICING)
+        return strategy, tune
+
+    def assert_matches_full_run(
+        self, strategy_class: type[GreedyStrategy], tune: SimpleTune
+    ) -> None:
+        _, expected = self.harmonized(
+            strategy_class,
+            [note.pitch.abs_value - 12 for note in tune.notes if note is not None],
+        )
+        assert tune.chords == expected.chords
+
+    def test_unchanged(self, strategy_class: type[GreedyStrategy]) -> None:
+        strategy, tune = self.harmonized(strategy_class, JIG * 4)
+        assert strategy.reharmonize(tune) == (len(JIG) * 4, len(JIG) * 4)
+
+    def test_edit_stops_early(self, strategy_class: type[GreedyStrategy]) -> None:
+        strategy, tune = self.harmonized(strategy_class, JIG * 4)
+        tune._notes[30] = SimpleNote(Pitch(4, octave=1))
+        start, stop = strategy.reharmonize(tune)
+        assert start == 30 and stop < len(tune.notes)
+        self.assert_matches_full_run(strategy_class, tune)
+
+    def test_edits_change_length(self, strategy_class: type[GreedyStrategy]) -> None:
+        strategy, tune = self.harmonized(strategy_class, JIG * 2)
+        del tune._notes[len(JIG) :]
+        strategy.reharmonize(tune)
+        self.assert_matches_full_run(strategy_class, tune)
+
+        tune._notes.extend(SimpleNote(Pitch(v, octave=1)) for v in JIG[::-1])
+        assert strategy.reharmonize(tune) == (len(JIG), 2 * len(JIG))
+        self.assert_matches_full_run(strategy_class, tune)
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_edit_and_truncate(
+        self, strategy_class: type[GreedyStrategy], seed: int
+    ) -> None:
+        rng = random.Random(seed)
+        strategy, tune = self.harmonized(strategy_class, rng.choices(JIG, k=36))
+        tune._notes[3] = SimpleNote(Pitch(rng.choice(JIG), octave=1))
+        del tune._notes[-3:]
+        strategy.reharmonize(tune)
+        assert all(playhead < len(tune.notes) for playhead in tune.chords.playheads)
+        self.assert_matches_full_run(strategy_class, tune)
+
+    def test_requires_harmonize(self, strategy_class: type[GreedyStrategy]) -> None:
+        with pytest.raises(ValueError):
+            strategy_class().reharmonize(SimpleTune(JIG))
+
+
+@pytest.mark.parametrize("strategy_class", [FirstNoteStrategy, CommonTonesStrategy])
+@pytest.mark.parametrize("harmonic_rhythm", [3, 5])
+class TestStream:
+    def expected(
+        self, strategy: GreedyStrategy, tune: SimpleTune
+    ) -> list[tuple[int, ChordVoicing]]:
+        strategy.harmonize(tune, C_MAJOR_VOICING)
+        return tune.chords.items()
+
+    def test_stream_matches_harmonize(
+        self, strategy_class: type[GreedyStrategy], harmonic_rhythm: int
+    ) -> None:
+        strategy = strategy_class(harmonic_rhythm=harmonic_rhythm)
+        tune = SimpleTune(JIG)
+        decisions = list(strategy.stream(iter(tune.notes), C_MAJOR_VOICING))
+        assert decisions == self.expected(strategy, tune)
+
+    def test_astream_matches_harmonize(
+        self, strategy_class: type[GreedyStrategy], harmonic_rhythm: int
+    ) -> None:
+        strategy = strategy_class(harmonic_rhythm=harmonic_rhythm)
+        tune = SimpleTune(JIG)
+
+        async def notes() -> AsyncIterator[Note | None]:
+            for note in tune.notes:
+                await asyncio.sleep(0)
+                yield note
+
+        async def collect() -> list[tuple[int, ChordVoicing]]:
+            return [d async for d in strategy.astream(notes(), C_MAJOR_VOICING)]
+
+        assert asyncio.run(collect()) == self.expected(strategy, tune)
+
+    def test_decides_when_group_completes(
+        self, strategy_class: type[GreedyStrategy], harmonic_rhythm: int
+    ) -> None:
+        harmonizer = StreamHarmonizer(
+            strategy_class(harmonic_rhythm=harmonic_rhythm), C_MAJOR_VOICING
+        )
+        notes = SimpleTune(JIG).notes
+        for note in notes[: harmonic_rhythm - 1]:
+            assert harmonizer.push(note) is None
+        decision = harmonizer.push(notes[harmonic_rhythm - 1])
+        assert decision is not None and decision[0] == 0
+
+
+class TestViterbiStrategy:
+    def test_harmonizes_strong_beats_with_chord_tones(self) -> None:
+        tune = SimpleTune(JIG)
+        ViterbiStrategy(harmonic_rhythm=3).harmonize(tune, C_MAJOR_VOICING)
+
+        chord_voicing = None
+        for playhead, note in enumerate(tune.notes):
+            chord_voicing = tune.chord_at(playhead)
+            assert chord_voicing is not None
+            if note is not None and playhead % 3 == 0:
+                assert note.pitch.pitch_class in chord_voicing.chord
+
+    def test_ends_phrase_on_tonic(self) -> None:
+        tune = SimpleTune(JIG)
+        strategy = ViterbiStrategy(harmonic_rhythm=3)
+        path = strategy.best_path(tune, C_MAJOR)
+        assert len(path) == len(JIG) // 3
+        assert strategy.chords[path[-1]] == tune.key.triad(0)
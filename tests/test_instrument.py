@@ -0,0 +1,67 @@
+from tunes import JIG, SimpleTune
+
+from parsichord import cache, instrument
+from parsichord.core.chord import Chord, ChordVoicing, Major, Pitch
+from parsichord.core.constants import PitchClass
+from parsichord.core.harmony import (
+    CadenceStrategy,
+    CommonTonesStrategy,
+    nearest_parsimonious_chord_voicing_containing,
+)
+from parsichord.instrument import SearchStats, tune_label
+
+D_MAJOR = ChordVoicing(Chord(PitchClass.D, Major), [Pitch(2), Pitch(6), Pitch(9)])
+
+
+def test_disabled_by_default() -> None:
+    assert instrument.active is None
+    with instrument.instrument() as instrumentation:
+        assert instrument.active is instrumentation
+    assert instrument.active is None
+
+
+def test_search_records() -> None:
+    cache.clear_all()
+    with instrument.instrument() as instrumentation:
+        for _ in range(2):
+            nearest_parsimonious_chord_voicing_containing(D_MAJOR, Pitch(4))
+    [record] = instrumentation.records
+    assert record.found and record.strategy is None
+    assert record.nodes_expanded >= record.depth >= 1
+    assert record.frontier_peak >= 1
+
+    total = instrumentation.total()
+    assert total.searches == 1
+    assert total.cache_hits["voicing_search"] == 1
+    assert total.cache_misses["voicing_search"] == 1
+    assert total.hit_rate("voicing_search") == 0.5
+
+
+def test_stats_per_strategy_and_tune() -> None:
+    cache.clear_all()
+    first, second = SimpleTune(JIG), SimpleTune(JIG[::-1])
+    with instrument.instrument() as instrumentation:
+        CommonTonesStrategy(harmonic_rhythm=3).harmonize(first, D_MAJOR)
+        CadenceStrategy(harmonic_rhythm=3).harmonize(second, D_MAJOR)
+
+    by_strategy = instrumentation.by_strategy()
+    assert set(by_strategy) == {"CommonTonesStrategy", "CadenceStrategy"}
+    by_tune = instrumentation.by_tune()
+    assert set(by_tune) == {tune_label(first), tune_label(second)}
+
+    total = instrumentation.total()
+    assert total.searches == len(instrumentation.records)
+    merged = SearchStats()
+    for stats in by_tune.values():
+        merged.merge(stats)
+    assert merged == total
+
+
+def test_retries() -> None:
+    cache.clear_all()
+    strategy = CommonTonesStrategy(harmonic_rhythm=6, max_expansions=5)
+    with instrument.instrument() as instrumentation:
+        strategy.harmonize(SimpleTune(JIG), D_MAJOR)
+    total = instrumentation.total()
+    assert total.retries == total.not_found > 0
+    assert 0 < total.budget_exhausted <= total.retries
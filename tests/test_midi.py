@@ -0,0 +1,119 @@
+import io
+import struct
+
+from tunes import JIG, SimpleTune
+
+from parsichord.core.chord import Chord, ChordVoicing, Major, Pitch
+from parsichord.core.constants import PitchClass
+from parsichord.core.midi import (
+    TICKS_PER_BEAT,
+    _variable_length,
+    render_midi,
+    write_midi,
+)
+from parsichord.core.schedule import SESSION_TEMPO, Event
+
+D_MAJOR = ChordVoicing(Chord(PitchClass.D, Major), [Pitch(2), Pitch(6), Pitch(9)])
+
+
+def read_tracks(data: bytes) -> tuple[tuple[int, int, int], list[bytes]]:
+    assert data[:4] == b"MThd"
+    header = struct.unpack(">HHH", data[8:14])
+    tracks, position = [], 14
+    while position < len(data):
+        assert data[position : position + 4] == b"MTrk"
+        (length,) = struct.unpack(">I", data[position + 4 : position + 8])
+        tracks.append(data[position + 8 : position + 8 + length])
+        position += 8 + length
+    return header, tracks
+
+
+def note_messages(track: bytes) -> list[tuple[int, int, int, int]]:
+    """Return the absolute tick, status, pitch and velocity of each note on
+    and off."""
+    notes, tick, position = [], 0, 0
+    while position < len(track):
+        delta = 0
+        while True:
+            byte = track[position]
+            position += 1
+            delta = (delta << 7) | (byte & 0x7F)
+            if not byte & 0x80:
+                break
+        tick += delta
+        status = track[position]
+        if status == 0xFF:
+            position += 3 + track[position + 2]
+        elif status & 0xF0 == 0xC0:
+            position += 2
+        else:
+            if status & 0xF0 in (0x80, 0x90):
+                notes.append(
+                    (tick, status & 0xF0, track[position + 1], track[position + 2])
+                )
+            position += 3
+    return notes
+
+
+def note_ons(track: bytes) -> list[tuple[int, int, int]]:
+    """Return the absolute tick, pitch and velocity of each note on."""
+    return [
+        (tick, pitch, velocity)
+        for tick, status, pitch, velocity in note_messages(track)
+        if status == 0x90
+    ]
+
+
+def test_variable_length() -> None:
+    assert _variable_length(0) == b"\x00"
+    assert _variable_length(0x7F) == b"\x7f"
+    assert _variable_length(0x80) == b"\x81\x00"
+    assert _variable_length(0x0FFFFFFF) == b"\xff\xff\xff\x7f"
+
+
+def test_write_midi() -> None:
+    tune = SimpleTune(JIG)
+    tune.set_chord(0, D_MAJOR)
+    tune.set_chord(12, D_MAJOR)
+    stream = io.BytesIO()
+    write_midi(tune, stream, "6/8", speed=0.25, swing=2)
+
+    (file_format, count, division), tracks = read_tracks(stream.getvalue())
+    assert (file_format, count, division) == (1, 3, TICKS_PER_BEAT)
+
+    melody = note_ons(tracks[1])
+    assert len(melody) == len(JIG)
+    assert [tick for tick, _, _ in melody[:4]] == [0, 160, 240, 360]
+    assert [pitch for _, pitch, _ in melody[:3]] == [62, 62, 69]
+    assert [velocity for _, _, velocity in melody[:3]] == [127, 64, 89]
+
+    chords = note_ons(tracks[2])
+    assert sorted(pitch for tick, pitch, _ in chords if tick == 0) == [50, 54, 57]
+    assert {tick for tick, _, _ in chords} == {0, 1440}
+
+
+def test_restruck_pitch_sounds_for_its_full_length() -> None:
+    # each chord lasts two seconds but the next is struck after one
+    length = 2 * SESSION_TEMPO / 60
+    events = [
+        Event(0.0, 0, "chord", (50, 54), 1.0, length),
+        Event(1.0, 3, "chord", (50, 57), 1.0, length),
+    ]
+    _, tracks = read_tracks(render_midi(events))
+
+    sounding: dict[int, int] = {}
+    spans = []
+    for tick, status, pitch, _ in note_messages(tracks[2]):
+        if status == 0x90:
+            assert pitch not in sounding
+            sounding[pitch] = tick
+        else:
+            spans.append((pitch, sounding.pop(pitch), tick))
+    assert not sounding
+    ticks = TICKS_PER_BEAT
+    assert sorted(spans) == [
+        (50, 0, ticks),
+        (50, ticks, 3 * ticks),
+        (54, 0, 2 * ticks),
+        (57, ticks, 3 * ticks),
+    ]
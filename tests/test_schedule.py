@@ -0,0 +1,147 @@
+import threading
+
+import pytest
+from tunes import JIG, SimpleTune
+
+from parsichord.core.chord import Chord, ChordVoicing, Major, Pitch
+from parsichord.core.constants import PitchClass
+from parsichord.core.schedule import (
+    Event,
+    LatenessStats,
+    Scheduler,
+    meter_patterns,
+    pattern_for,
+    schedule,
+)
+
+D_MAJOR = ChordVoicing(Chord(PitchClass.D, Major), [Pitch(2), Pitch(6), Pitch(9)])
+
+
+class FakeClock:
+    """A clock that advances a little on every reading and jumps on sleep."""
+
+    def __init__(self, tick: float = 0.0001) -> None:
+        self.now = 100.0
+        self.tick = tick
+
+    def __call__(self) -> float:
+        self.now += self.tick
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_jig_schedule() -> None:
+    tune = SimpleTune(JIG)
+    tune.set_chord(0, D_MAJOR)
+    tune.set_chord(6, D_MAJOR)
+    events = schedule(tune, "6/8", speed=0.1, swing=2)
+
+    notes = [event for event in events if event.kind == "note"]
+    assert len(notes) == len(JIG)
+    assert [event.time for event in notes[:4]] == pytest.approx(
+        [0.0, 0.4 / 3, 0.2, 0.3]
+    )
+    assert [event.volume for event in notes[:3]] == [1.0, 0.5, 0.7]
+
+    chords = [event for event in events if event.kind == "chord"]
+    assert [event.playhead for event in chords] == [0, 6]
+    assert sorted(chords[0].pitches) == [50, 54, 57]
+
+
+def test_onsets_do_not_drift() -> None:
+    tune = SimpleTune(JIG * 100)
+    events = schedule(tune, "6/8", speed=0.1, swing=2, play_chords=False)
+    # every dotted beat is exactly 0.3 seconds however far into the tune
+    assert events[-3].time == pytest.approx(0.3 * (len(events) // 3 - 1))
+
+
+def test_reel_schedule_repeats_chord() -> None:
+    tune = SimpleTune(JIG[:16], bar_length=8)
+    tune.set_chord(0, D_MAJOR)
+    events = schedule(tune, "4/4", speed=0.1, play_melody=False)
+    assert [event.playhead for event in events] == [0, 4, 8, 12]
+
+
+def test_reel_schedule_plays_sounding_chord() -> None:
+    g_major = ChordVoicing(Chord(PitchClass.G, Major), [Pitch(2), Pitch(7), Pitch(11)])
+    tune = SimpleTune(JIG[:16], bar_length=8)
+    tune.set_chord(0, D_MAJOR)
+    tune.set_chord(6, g_major)
+    events = schedule(tune, "4/4", speed=0.1, play_melody=False)
+    assert [sorted(event.pitches) for event in events] == [
+        [50, 54, 57],
+        [50, 54, 57],
+        [50, 55, 59],
+        [50, 55, 59],
+    ]
+
+
+@pytest.mark.parametrize(
+    "meter, chord_playheads", [("9/8", [0, 9, 18]), ("12/8", [0, 6, 12, 18])]
+)
+def test_compound_meters(meter: str, chord_playheads: list[int]) -> None:
+    tune = SimpleTune(JIG)
+    for playhead in chord_playheads:
+        tune.set_chord(playhead, D_MAJOR)
+    tune.set_chord(3, D_MAJOR)
+    events = schedule(tune, meter, speed=0.1)
+    chords = [event.playhead for event in events if event.kind == "chord"]
+    assert chords == chord_playheads
+
+
+def test_polka() -> None:
+    tune = SimpleTune(JIG[:8], bar_length=4)
+    tune.set_chord(0, D_MAJOR)
+    events = schedule(tune, "2/4", speed=0.1, swing=3)
+    notes = [event for event in events if event.kind == "note"]
+    assert [event.volume for event in notes[:4]] == [1.0, 0.7, 1.0, 0.7]
+    assert [event.time for event in notes[:3]] == pytest.approx([0, 0.15, 0.2])
+    chords = [event for event in events if event.kind == "chord"]
+    assert [event.playhead for event in chords] == [0, 4]
+
+
+def test_meter_patterns() -> None:
+    assert pattern_for("6/8").accent(4, swing=2) == (0.5, pytest.approx(2 / 3))
+    assert all(
+        len(pattern.intensities) == pattern.pulse for pattern in meter_patterns.values()
+    )
+    with pytest.raises(ValueError):
+        pattern_for("7/8")
+
+
+def test_scheduler_dispatches_on_deadlines() -> None:
+    clock = FakeClock()
+    scheduler = Scheduler(lookahead=0.001, clock=clock, sleep=clock.sleep)
+    events = [
+        Event(0.2, 2, "note", (60,), 1.0, 1.0),
+        Event(0.0, 0, "note", (62,), 1.0, 1.0),
+        Event(0.1, 1, "chord", (50, 54), 0.5, 10),
+    ]
+    start = clock.now
+    dispatched: list[tuple[int, float]] = []
+    stats = scheduler.run(
+        events, lambda event: dispatched.append((event.playhead, clock.now - start))
+    )
+
+    assert [playhead for playhead, _ in dispatched] == [0, 1, 2]
+    for (_, elapsed), expected in zip(dispatched, [0.0, 0.1, 0.2]):
+        assert elapsed == pytest.approx(expected, abs=0.001)
+    assert stats.count == 3
+    assert 0 <= stats.mean <= stats.max < 0.001
+
+
+def test_scheduler_stop() -> None:
+    stop = threading.Event()
+    stop.set()
+    stats = Scheduler().run([Event(0.0, 0, "note", (60,), 1.0, 1.0)], print, stop)
+    assert stats == LatenessStats(0, 0.0, 0.0, 0.0, 0.0)
+
+
+def test_lateness_stats() -> None:
+    stats = LatenessStats.from_samples([0.004, 0.001, 0.002, 0.003])
+    assert stats.count == 4
+    assert stats.mean == pytest.approx(0.0025)
+    assert stats.median == pytest.approx(0.0025)
+    assert stats.max == 0.004
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import numpy as np
+from tunes import JIG, SimpleTune, tune_data
+
+from parsichord.similarity import MelodyIndex, interval_ngrams
+
+rng = np.random.default_rng(1)
+MELODIES = [rng.integers(55, 80, 64) for _ in range(50)]
+
+
+def test_interval_ngrams_ignore_transposition() -> None:
+    melody = np.array([62, 64, 66, 67, 69, 71])
+    ngrams = interval_ngrams(melody, n=3)
+    assert len(ngrams) == 3
+    assert np.array_equal(ngrams, interval_ngrams(melody + 5, n=3))
+    assert len(interval_ngrams(melody[:3], n=3)) == 0
+
+
+class TestMelodyIndex:
+    def setup_method(self) -> None:
+        self.index = MelodyIndex()
+        for i, melody in enumerate(MELODIES):
+            self.index.add((i, i), melody)
+
+    def test_query_finds_variant(self) -> None:
+        variant = MELODIES[7].copy() + 3
+        variant[40:44] = [60, 60, 60, 60]
+        results = self.index.query(variant, k=3)
+        assert results[0][0] == (7, 7)
+        assert results[0][1] > 0.5
+        assert all(score < 0.5 for _, score in results[1:])
+
+    def test_exclude(self) -> None:
+        results = self.index.query(MELODIES[3], k=1, exclude=(3, 3))
+        assert all(key != (3, 3) for key, _ in results)
+
+    def test_add_is_incremental(self) -> None:
+        tune = SimpleTune(JIG)
+        assert self.index.query_tune(tune) == []
+        self.index.add_tune((100, 1), tune)
+        assert self.index.query_tune(tune, k=1) == [((100, 1), 1.0)]
+
+    def test_add_settings(self) -> None:
+        self.index.add_settings([tune_data(200, "dfa gfe|dBA FED|")])
+        assert len(self.index) == len(MELODIES) + 1
+        assert self.index.keys[-1] == (200, 200)
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        path = tmp_path / "index.npz"
+        self.index.save(path)
+        loaded = MelodyIndex.load(path)
+        assert loaded.keys == self.index.keys
+        assert np.array_equal(loaded.signatures, self.index.signatures)
+        assert loaded.query(MELODIES[5], k=2) == self.index.query(MELODIES[5], k=2)
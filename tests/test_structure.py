@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from tunes import JIG, SimpleTune
+
+from parsichord.core.structure import (
+    PhraseType,
+    Repeat,
+    RepeatAnalysis,
+    TuneStructure,
+    tune_symbols,
+)
+
+# 16 playhead phrases: A opens like A2, B is unrelated
+A = list(range(1, 17))
+A2 = list(range(1, 9)) + [30, 31, 32, 33, 34, 35, 36, 37]
+B = [50 + i % 5 for i in range(16)]
+
+
+def test_window_hashes() -> None:
+    analysis = RepeatAnalysis(np.array([1, 2, 3, 1, 2, 3, 4]))
+    hashes = analysis.window_hashes(3)
+    assert len(hashes) == 5
+    assert hashes[0] == hashes[3]
+    assert len(set(hashes.tolist())) == 4
+    assert len(analysis.window_hashes(8)) == 0
+
+
+def test_repeats() -> None:
+    symbols = np.array([9, *A[:6], 7, *A[:6], 8])
+    assert RepeatAnalysis(symbols).repeats(4) == [Repeat(1, 8, 6)]
+
+
+def test_near_repeats() -> None:
+    first = A * 2
+    second = list(first)
+    second[5] = 99
+    analysis = RepeatAnalysis(np.array([*first, *B, *second]))
+    repeats = analysis.near_repeats(len(first), max_mismatches=2)
+    assert Repeat(0, 48, 32, 1) in repeats
+    assert analysis.near_repeats(len(first), max_mismatches=0) == []
+
+
+def test_near_repeats_boundary() -> None:
+    # windows of 4 that differ everywhere but one playhead still match
+    analysis = RepeatAnalysis(np.array([1, 2, 3, 4, 5, 6, 7, 4]))
+    assert analysis.near_repeats(4, max_mismatches=3) == [Repeat(0, 4, 4, 3)]
+    with pytest.raises(ValueError):
+        analysis.near_repeats(4, max_mismatches=4)
+
+
+def test_sections() -> None:
+    ending = list(A2)
+    ending[-1] = 0
+    analysis = RepeatAnalysis(np.array(A + A2 + A + ending + B * 4 + A[:8]))
+    assert analysis.form(32) == "AABBA"
+    sections = analysis.sections(32)
+    assert (sections[-1].start, sections[-1].end) == (128, 135)
+
+
+class CollidingAnalysis(RepeatAnalysis):
+    """Hashes every window alike, as if every hash collided."""
+
+    def window_hashes(self, length: int) -> np.ndarray:
+        return np.zeros(max(len(self) - length + 1, 0), dtype=np.int64)
+
+
+def test_hash_collisions_never_match() -> None:
+    symbols = np.array(A + B + A + [9, *A[:6], 7, *A[:6], 8])
+    analysis = CollidingAnalysis(symbols)
+    assert analysis.form(16, tolerance=0) == "ABAC"
+    assert analysis.repeats(6) == RepeatAnalysis(symbols).repeats(6)
+    assert analysis.near_repeats(16, 2) == RepeatAnalysis(symbols).near_repeats(16, 2)
+
+
+def test_repetitive_repeats() -> None:
+    # every window of a run of one symbol repeats, but each maximal repeat
+    # is reported once
+    analysis = RepeatAnalysis(np.array([1] * 8))
+    assert analysis.repeats(2) == [Repeat(0, shift, 8 - shift) for shift in range(1, 7)]
+
+
+def test_tune_symbols() -> None:
+    tune = SimpleTune([2, 4])
+    assert tune_symbols(tune).tolist() == [(62 * 2) + 2, (64 * 2) + 2]
+
+
+class TestTuneStructure:
+    @pytest.fixture
+    def structure(self) -> TuneStructure:
+        # one-bar phrases, the second opening like the first
+        pitches = JIG[:8] + JIG[:4] + JIG[12:16] + JIG[16:24] + JIG[8:16]
+        return TuneStructure(SimpleTune(pitches, bar_length=8), 1)
+
+    def test_periods(self, structure: TuneStructure) -> None:
+        assert [(p.phrase_type, p.start, p.end) for p in structure.phrases] == [
+            (PhraseType.ANTECEDENT, 0, 7),
+            (PhraseType.CONSEQUENT, 8, 15),
+        ]
+        assert structure.get_phrase_type_at(9) == PhraseType.CONSEQUENT
+        assert structure.get_phrase_type_at(20) is None
+
+    def test_form(self, structure: TuneStructure) -> None:
+        assert structure.form() == "AB"
@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from parsichord.data.thesession import (
+    BulkFetchError,
+    RateLimiter,
+    TuneCache,
+    TuneNotCached,
+    fetch_tunes_json,
+    get_session_tune_data,
+    get_session_tunes,
+)
+
+TUNE_JSON = {
+    "id": 1,
+    "name": "The Kesh",
+    "type": "jig",
+    "settings": [
+        {"id": 1, "key": "Gmajor", "abc": "|:GAG GAB|ABA ABd:|!"},
+        {"id": 2, "key": "Gmajor", "abc": "|:G3 GAB|ABA ABd:|!"},
+    ],
+}
+
+
+TUNES = {1: TUNE_JSON, 2: {**TUNE_JSON, "id": 2, "name": "Out on the Ocean"}}
+
+
+class TheSessionHandler(BaseHTTPRequestHandler):
+    requests: list[str] = []
+    # number of 503 responses to send for a tune before serving it
+    failures: dict[int, int] = {}
+
+    def do_GET(self) -> None:
+        self.requests.append(self.path)
+        tune_id = int(self.path.split("/")[2].split("?")[0])
+        if self.failures.get(tune_id, 0) > 0:
+            self.failures[tune_id] -= 1
+            self.send_error(503)
+            return
+        if tune_id not in TUNES:
+            self.send_error(404)
+            return
+        body = json.dumps(TUNES[tune_id]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[str]:
+    TheSessionHandler.requests = []
+    TheSessionHandler.failures = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), TheSessionHandler)
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_tune_json_is_fetched_once(server: str, tmp_path: Path) -> None:
+    cache = TuneCache(tmp_path)
+
+    first = get_session_tune_data(1, cache=cache, offline=False, base_url=server)
+    second = get_session_tune_data(1, 1, cache=cache, offline=False, base_url=server)
+    reopened = get_session_tune_data(
+        1, cache=TuneCache(tmp_path), offline=False, base_url=server
+    )
+
+    assert TheSessionHandler.requests == ["/tunes/1?format=json"]
+    assert (first["setting"], second["setting"]) == (1, 2)
+    assert first == reopened
+    assert first["meter"] == "6/8"
+    assert first["abc"] == "|:GAG GAB|ABA ABd:|\r\n"
+
+
+def test_expired_entries_are_refetched(server: str, tmp_path: Path) -> None:
+    cache = TuneCache(tmp_path, ttl=0)
+    get_session_tune_data(1, cache=cache, offline=False, base_url=server)
+    get_session_tune_data(1, cache=cache, offline=False, base_url=server)
+    assert len(TheSessionHandler.requests) == 2
+
+
+def test_offline_mode_never_uses_network(server: str, tmp_path: Path) -> None:
+    cache = TuneCache(tmp_path, ttl=0)
+    with pytest.raises(TuneNotCached):
+        get_session_tune_data(1, cache=cache, offline=True, base_url=server)
+
+    get_session_tune_data(1, cache=cache, offline=False, base_url=server)
+    # stale entries are still served offline
+    tune_data = get_session_tune_data(1, cache=cache, offline=True, base_url=server)
+
+    assert tune_data["name"] == "The Kesh"
+    assert len(TheSessionHandler.requests) == 1
+
+
+def test_bulk_fetch_returns_every_setting(server: str, tmp_path: Path) -> None:
+    cache = TuneCache(tmp_path)
+    TheSessionHandler.failures = {2: 1}
+
+    tunes = get_session_tunes(
+        [1, 2, 1], cache=cache, offline=False, base_url=server, rate=100, backoff=0
+    )
+
+    assert [tune_data["setting"] for tune_data in tunes[1]] == [1, 2]
+    assert tunes[2][0]["name"] == "Out on the Ocean"
+    # one retry for tune 2, and every tune downloaded once
+    assert sorted(TheSessionHandler.requests) == [
+        "/tunes/1?format=json",
+        "/tunes/2?format=json",
+        "/tunes/2?format=json",
+    ]
+
+    get_session_tunes([1, 2], cache=cache, offline=True, base_url=server)
+    assert len(TheSessionHandler.requests) == 3
+
+
+def test_bulk_fetch_reports_failures(server: str, tmp_path: Path) -> None:
+    with pytest.raises(BulkFetchError) as excinfo:
+        fetch_tunes_json(
+            [1, 3], cache=TuneCache(tmp_path), offline=False, base_url=server, rate=100
+        )
+    assert list(excinfo.value.results) == [1]
+    assert list(excinfo.value.errors) == [3]
+
+
+def test_rate_limiter_spaces_calls() -> None:
+    rate_limiter = RateLimiter(50)
+    start = time.monotonic()
+    for _ in range(5):
+        rate_limiter.wait()
+    assert time.monotonic() - start >= 4 / 50
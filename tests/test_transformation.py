@@ -0,0 +1,51 @@
+import pytest
+
+from parsichord.core.chord import Chord, ChordType, Major, Minor, Triad
+from parsichord.core.constants import PitchClass
+from parsichord.core.transformation import (
+    L,
+    P,
+    R,
+    apply_word,
+    plr_group,
+    shortest_word,
+    tonnetz_distance,
+    triads,
+)
+
+C = Chord(PitchClass.C, Major)
+
+
+def test_plr() -> None:
+    assert P(C) == Chord(PitchClass.C, Minor)
+    assert L(C) == Chord(PitchClass.E, Minor)
+    assert R(C) == Chord(PitchClass.A, Minor)
+    for transformation in plr_group:
+        for chord in triads:
+            assert transformation(transformation(chord)) == chord
+            assert (chord.mask & transformation(chord).mask).bit_count() == 2
+
+
+def test_equal_chord_types() -> None:
+    major = ChordType(name="Major triad", base=Triad.MAJOR)
+    assert major is not Major
+    assert P(Chord(PitchClass.D, major)) == Chord(PitchClass.D, Minor)
+
+
+def test_apply_word() -> None:
+    assert apply_word("", C) == C
+    assert apply_word("PL", C) == Chord(PitchClass.Ab, Major)
+    assert apply_word("LR" * 12, C) == C
+    with pytest.raises(ValueError):
+        apply_word("PX", C)
+
+
+def test_shortest_word() -> None:
+    assert shortest_word(C, C) == ""
+    assert shortest_word(C, Chord(PitchClass.A, Minor)) == "R"
+    assert tonnetz_distance(C, Chord(PitchClass.Gb, Minor)) == 3
+    for a in triads:
+        for b in triads:
+            word = shortest_word(a, b)
+            assert apply_word(word, a) == b
+            assert len(word) == tonnetz_distance(a, b) == tonnetz_distance(b, a)
@@ -0,0 +1,158 @@
+import pickle
+
+import numpy as np
+import pytest
+from tunes import SimpleNote, SimpleTune
+
+from parsichord.core.chord import Chord, ChordVoicing, Major, Minor, Pitch
+from parsichord.core.constants import PitchClass
+from parsichord.core.tune import ChordTrack, Key, NoteArray
+
+D_MAJOR = ChordVoicing(Chord(PitchClass.D, Major), [Pitch(2), Pitch(6), Pitch(9)])
+B_MINOR = ChordVoicing(Chord(PitchClass.B, Minor), [Pitch(2), Pitch(6), Pitch(11)])
+
+
+class TestKey:
+    def test_scale(self) -> None:
+        key = Key(PitchClass.D, "Dorian")
+        assert key.scale == [
+            PitchClass.D,
+            PitchClass.E,
+            PitchClass.F,
+            PitchClass.G,
+            PitchClass.A,
+            PitchClass.B,
+            PitchClass.C,
+        ]
+
+    def test_triad(self) -> None:
+        key = Key(PitchClass.G, "major")
+        assert [str(key.triad(degree)) for degree in (0, 3, 4)] == [
+            "Gmaj",
+            "Cmaj",
+            "Dmaj",
+        ]
+
+
+class TestNoteArray:
+    def setup_method(self) -> None:
+        # | d2 c | B3 |
+        self.notes = NoteArray.from_bars(
+            [
+                [SimpleNote(Pitch(2, 1), 2), None, SimpleNote(Pitch(0, 1))],
+                [SimpleNote(Pitch(11), 3), None, None],
+            ]
+        )
+
+    def test_columns(self) -> None:
+        assert len(self.notes) == 3
+        assert self.notes.pitch.tolist() == [62, 60, 59]
+        assert self.notes.duration.tolist() == [2, 1, 3]
+        assert self.notes.onset.tolist() == [0, 2, 3]
+        assert self.notes.bar.tolist() == [0, 0, 1]
+        assert self.notes.bar_offsets.tolist() == [0, 3, 6]
+        assert self.notes.pitch_class.tolist() == [2, 0, 11]
+
+    def test_playhead_lookups(self) -> None:
+        assert self.notes.length == 6
+        assert [self.notes.note_at(playhead) for playhead in range(6)] == [
+            0,
+            0,
+            1,
+            2,
+            2,
+            2,
+        ]
+        assert [self.notes.bar_at(playhead) for playhead in range(6)] == [
+            0,
+            0,
+            0,
+            1,
+            1,
+            1,
+        ]
+
+
+def test_tune_chord_at() -> None:
+    tune = SimpleTune([2, 4, 6, 7])
+    tune.set_chord(1, D_MAJOR)
+    assert tune.chord_at(0) is None
+    assert tune.chord_at(3) is D_MAJOR and tune.get_chord(3) is None
+
+
+def test_tune_note_array_matches_notes() -> None:
+    tune = SimpleTune([2, 4, 6, 7, 9, 11, 1, 2])
+    note_array = tune.note_array
+    assert note_array is tune.note_array
+    assert note_array.length == len(tune.notes)
+    np.testing.assert_array_equal(
+        note_array.pitch,
+        [note.pitch.midi_value for note in tune.notes if note is not None],
+    )
+    assert note_array.bar_at(7) == 1
+
+
+class TestChordTrack:
+    def setup_method(self) -> None:
+        self.track = ChordTrack({6: B_MINOR, 0: D_MAJOR, 12: D_MAJOR})
+
+    def test_lookups(self) -> None:
+        assert self.track.playheads == [0, 6, 12]
+        assert self.track[6] is B_MINOR and self.track.get(7) is None
+        assert [self.track.at(p) for p in (0, 5, 6, 11, 40)] == [
+            D_MAJOR,
+            D_MAJOR,
+            B_MINOR,
+            B_MINOR,
+            D_MAJOR,
+        ]
+        assert ChordTrack().at(3) is None
+        with pytest.raises(KeyError):
+            self.track[3]
+
+    def test_edits(self) -> None:
+        self.track[3] = B_MINOR
+        self.track[6] = D_MAJOR
+        assert self.track.items() == [
+            (0, D_MAJOR),
+            (3, B_MINOR),
+            (6, D_MAJOR),
+            (12, D_MAJOR),
+        ]
+        assert self.track.pop(3) is B_MINOR and self.track.pop(3) is None
+        assert 3 not in self.track and 6 in self.track
+
+    def test_slice_and_replace(self) -> None:
+        assert self.track.slice(1, 12).items() == [(6, B_MINOR)]
+        assert self.track.slice(6).playheads == [6, 12]
+
+        self.track.replace(3, 12, {4: D_MAJOR, 8: B_MINOR})
+        assert self.track.items() == [
+            (0, D_MAJOR),
+            (4, D_MAJOR),
+            (8, B_MINOR),
+            (12, D_MAJOR),
+        ]
+        with pytest.raises(ValueError):
+            self.track.replace(3, 6, {6: D_MAJOR})
+
+    def test_pickle(self) -> None:
+        track = ChordTrack(
+            (playhead, (D_MAJOR, B_MINOR)[playhead // 6 % 2])
+            for playhead in range(0, 600, 6)
+        )
+        data = pickle.dumps(track)
+        assert pickle.loads(data) == track
+        assert len(data) < len(pickle.dumps(dict(track)))
+        assert pickle.loads(pickle.dumps(ChordTrack())) == ChordTrack()
+
+    def test_pickle_stores_equal_voicings_once(self) -> None:
+        separately = ChordVoicing(D_MAJOR.chord, [Pitch(2), Pitch(6), Pitch(9)])
+        track = ChordTrack({0: D_MAJOR, 6: B_MINOR, 12: separately})
+        _, voicings, indexes = track.__getstate__()
+        assert len(voicings) == 2 and indexes.tolist() == [0, 1, 0]
+        assert [pitches.tolist() for _, pitches in voicings] == [
+            [50, 54, 57],
+            [50, 54, 59],
+        ]
+        assert pickle.loads(pickle.dumps(track)) == track
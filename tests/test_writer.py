@@ -0,0 +1,79 @@
+import io
+
+from tunes import tune_data
+
+from parsichord.core.chord import Chord, ChordVoicing, Major, Minor, Pitch
+from parsichord.core.constants import PitchClass
+from parsichord.data.adapters.abc import ABCTune, parse_key
+from parsichord.data.writer import voicing_text, write_songbook, write_tune
+
+D_MAJOR = ChordVoicing(Chord(PitchClass.D, Major), [Pitch(2), Pitch(6), Pitch(9)])
+G_MAJOR = ChordVoicing(Chord(PitchClass.G, Major), [Pitch(2), Pitch(7), Pitch(11)])
+# F natural in D major, in the octave of the melody's F
+D_MINOR = ChordVoicing(Chord(PitchClass.D, Minor), [Pitch(17), Pitch(21), Pitch(26)])
+A_MAJOR = ChordVoicing(Chord(PitchClass.A, Major), [Pitch(13), Pitch(16), Pitch(21)])
+
+
+def round_trip(abc: str, chords: dict[int, ChordVoicing]) -> tuple[str, ABCTune]:
+    data = tune_data(1, abc)
+    stream = io.StringIO()
+    write_tune(stream, data, ABCTune(data).tokens, chords)
+    written = stream.getvalue()
+    body = written[written.index("K:Dmajor\n") + len("K:Dmajor\n") :].strip()
+    return written, ABCTune(tune_data(1, body))
+
+
+def test_voicing_text() -> None:
+    _, signature = parse_key("Dmajor")
+    assert voicing_text(D_MAJOR, "d2", signature=signature) == '"Dmaj"[d2D2F2A2]'
+    assert voicing_text(D_MAJOR, "=c/", signature=signature) == '"Dmaj"[=c/D/F/A/]'
+    assert voicing_text(D_MAJOR, "z3", signature=signature) == '"Dmaj"[D3F3A3]'
+    assert voicing_text(D_MAJOR, "d", in_chord=True) == "dD^FA"
+
+
+def test_write_tune() -> None:
+    data = tune_data(1, '"A"A|"D"d2B A2F|d3 c2B:|')
+    tune = ABCTune(data)
+    stream = io.StringIO()
+    # the chord at playhead 4 falls inside A2 and is written on F
+    write_tune(stream, data, tune.tokens, {0: D_MAJOR, 4: G_MAJOR, 6: D_MAJOR})
+    assert stream.getvalue() == (
+        "X:1\nT:Tune 1\nM:6/8\nL:1/8\nK:Dmajor\n"
+        'A|"Dmaj"[d2D2F2A2]B A2"Gmaj"[FDGB]|"Dmaj"[d3D3F3A3] c2B:|\n\n'
+    )
+
+
+def test_write_songbook() -> None:
+    datas = [tune_data(1, "d2B A2F|"), tune_data(2, "z3 A3|")]
+    tunes = ((data, ABCTune(data).tokens, {0: D_MAJOR}) for data in datas)
+    stream = io.StringIO()
+    assert write_songbook(stream, tunes) == 2
+    songbook = stream.getvalue()
+    assert "X:1\nT:Tune 1\n" in songbook
+    assert 'X:2\nT:Tune 2\nM:6/8\nL:1/8\nK:Dmajor\n"Dmaj"[D3F3A3] A3|\n\n' in songbook
+
+
+def test_chord_accidentals_do_not_change_melody() -> None:
+    abc = "f2d fed|f3 f3|"
+    melody = ABCTune(tune_data(1, abc)).note_array
+    written, tune = round_trip(abc, {0: D_MINOR, 6: D_MINOR})
+    assert "=f" in written
+    assert tune.note_array.pitch.tolist() == melody.pitch.tolist()
+
+
+def test_melody_accidentals_do_not_change_voices() -> None:
+    # the =c carries to the C# of the A major voicing in the same bar
+    written, tune = round_trip("=cBA cBA c|", {3: A_MAJOR})
+    assert '"Amaj"[c^cea]' in written
+    assert tune.note_array.pitch.tolist() == [60, 59, 57, 60, 59, 57, 60]
+
+
+def test_unit_note_length_round_trips() -> None:
+    data = tune_data(1, "L:1/16\nf4d2 f2e2d2|f6 f6|")
+    stream = io.StringIO()
+    write_tune(stream, data, ABCTune(data).tokens, {0: D_MAJOR})
+    # the written header fields are read as fields of the body
+    tune = ABCTune(tune_data(1, stream.getvalue()))
+    original = ABCTune(data).note_array
+    assert tune.note_array.onset.tolist() == original.onset.tolist()
+    assert tune.note_array.duration.tolist() == original.duration.tolist()
@@ -0,0 +1,62 @@
+from parsichord.core.chord import Pitch
+from parsichord.core.constants import PitchClass
+from parsichord.core.tune import Key, Note, Tune
+from parsichord.data.thesession import TuneData
+
+
+class SimpleNote(Note):
+    def __init__(self, pitch: Pitch, duration: float = 1):
+        self._pitch = pitch
+        self._duration = duration
+
+    @property
+    def pitch(self) -> Pitch:
+        return self._pitch
+
+    @property
+    def duration(self) -> float:
+        return self._duration
+
+
+class SimpleTune(Tune):
+    def __init__(self, pitch_values: list[int], bar_length: int = 6):
+        super().__init__()
+        self._notes: list[Note | None] = [
+            SimpleNote(Pitch(value, octave=1)) for value in pitch_values
+        ]
+        self._bar_length = bar_length
+
+    @property
+    def notes(self) -> list[Note | None]:
+        return self._notes
+
+    @property
+    def bars(self) -> list[list[Note | None]]:
+        return [
+            self._notes[i : i + self._bar_length]
+            for i in range(0, len(self._notes), self._bar_length)
+        ]
+
+    @property
+    def key(self) -> Key:
+        return Key(PitchClass.D, "major")
+
+
+# D major jig: | d2 A F2 A | d2 f e2 c | d2 A F2 A | B2 c d3 |
+JIG = [2, 2, 9, 6, 6, 9, 2, 2, 6, 4, 4, 1, 2, 2, 9, 6, 6, 9, 11, 11, 1, 2, 2, 2]
+
+
+def simple_tune(tune_data: TuneData) -> SimpleTune:
+    """Build a SimpleTune from TuneData whose abc is a list of pitch values."""
+    return SimpleTune([int(value) for value in tune_data["abc"].split()])
+
+
+def tune_data(tune_id: int, abc: str) -> TuneData:
+    return {
+        "tune": tune_id,
+        "setting": tune_id,
+        "name": f"Tune {tune_id}",
+        "meter": "6/8",
+        "mode": "Dmajor",
+        "abc": abc,
+    }